@@ -1,6 +1,24 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_migrate
 
 
 class CarAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'car_app'
+
+    def ready(self):
+        from .db import configure_sqlite, backfill_company_ids
+        from .search import ensure_notice_index
+        from .sync import get_sources, record_tombstone
+        from .odometer import mark_vehicle
+        from .instrumentation import install_query_recorder, is_enabled as query_instrumentation_enabled
+        connection_created.connect(configure_sqlite)  # SQLite 연결마다 WAL 등 PRAGMA 적용
+        post_migrate.connect(ensure_notice_index, sender=self)  # 마이그레이션 후 공지사항 전문 검색 색인 생성
+        post_migrate.connect(backfill_company_ids, sender=self)  # 마이그레이션 후 운행/정비/지출의 회사 컬럼 채우기
+        for key, model, _, _ in get_sources():
+            if key != 'deleted':
+                post_delete.connect(record_tombstone, sender=model)  # 동기화 대상 행 삭제 시 삭제 기록 남기기
+        post_delete.connect(mark_vehicle, sender=self.get_model('DrivingRecord'))  # 운행 기록 삭제 시 차량을 주행거리 점검 대상으로 표시
+        if query_instrumentation_enabled():
+            connection_created.connect(install_query_recorder)  # 요청별 쿼리 계측 (꺼져 있으면 연결하지 않음)
@@ -0,0 +1,121 @@
+import json
+import tempfile
+import uuid
+import zipfile
+from datetime import timedelta
+from functools import lru_cache
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.db import transaction
+from django.db.models.functions import TruncMonth
+from django.utils.module_loading import import_string
+
+
+
+# 오래된 운행 기록 좌표 보관 (월별 압축 파일로 옮기고 DB에는 파일 위치만 남김)
+DEFAULT_COORDINATE_ARCHIVE = {
+    'STORAGE': 'django.core.files.storage.FileSystemStorage',  # Django Storage 클래스 (S3 등으로 교체 가능)
+    'OPTIONS': {'location': str(settings.BASE_DIR / 'archive')},  # Storage 생성 인자
+    'RETENTION_DAYS': 180,  # 출발 시간이 이 기간보다 오래된 운행 기록의 좌표를 보관
+    'COMPRESS_LEVEL': 9,  # zip deflate 압축 수준 (1 ~ 9)
+    'CACHE_SECONDS': 3600,  # 보관 파일에서 읽은 좌표를 캐시에 두는 시간
+}
+
+
+def get_config():
+    return {**DEFAULT_COORDINATE_ARCHIVE, **getattr(settings, 'COORDINATE_ARCHIVE', {})}
+
+
+@lru_cache(maxsize=None)
+def get_storage():
+    """
+    settings.COORDINATE_ARCHIVE['STORAGE'] 에 지정된 Storage 인스턴스를 반환합니다. (프로세스당 하나)
+    """
+    config = get_config()
+    return import_string(config['STORAGE'])(**config['OPTIONS'])
+
+
+def member_name(record_id):
+    return f'{record_id}.json'
+
+
+def cache_key(record):
+    return f'coordinates:{record.pk}:{record.coordinates_archive}'
+
+
+def load_coordinates(record):
+    """
+    운행 기록의 좌표를 반환합니다. 보관된 좌표는 보관 파일에서 해당 운행 기록만 읽어 캐시에 저장합니다.
+    """
+    if not record.coordinates_archive:
+        return record.coordinates
+    key = cache_key(record)
+    coordinates = cache.get(key)
+    if coordinates is None:
+        with get_storage().open(record.coordinates_archive, 'rb') as archive, zipfile.ZipFile(archive) as zf:
+            coordinates = json.loads(zf.read(member_name(record.pk)))
+        cache.set(key, coordinates, get_config()['CACHE_SECONDS'])
+    return coordinates
+
+
+def rehydrate(record):
+    """
+    보관된 좌표를 운행 기록에 다시 채웁니다. (응답 직렬화용, 저장하지 않음)
+    """
+    if record.coordinates_archive:
+        record.coordinates = load_coordinates(record)
+    return record
+
+
+def archivable_months(queryset):
+    """
+    보관 대상 운행 기록의 (회사, 월) 목록을 반환합니다.
+    """
+    return list(
+        queryset.annotate(month=TruncMonth('departure_time')).values_list('company_id', 'month').distinct().order_by('company_id', 'month')
+    )
+
+
+def archive_month(queryset, company_id, month, batch_size=500):
+    """
+    회사의 한 달치 운행 기록 좌표를 zip 파일 하나(운행 기록마다 항목 하나)로 저장한 뒤,
+    DB의 좌표를 비우고 파일 위치를 기록합니다. 파일 저장이 끝난 후에 DB를 갱신하므로 중간에 실패해도 좌표가 사라지지 않습니다.
+    보관한 운행 기록 수와 파일 이름을 반환합니다. (파일에 쓰는 동안 수정된 운행 기록은 보관하지 않고 DB의 좌표를 유지)
+    """
+    config = get_config()
+    next_month = (month + timedelta(days=32)).replace(day=1)
+    records = queryset.filter(company_id=company_id, departure_time__gte=month, departure_time__lt=next_month)
+    archived = []  # (운행 기록 ID, 좌표를 읽을 때의 수정 일시)
+    with tempfile.TemporaryFile() as buffer:
+        with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=config['COMPRESS_LEVEL']) as zf:
+            for record_id, updated_at, coordinates in records.values_list('pk', 'updated_at', 'coordinates').iterator(chunk_size=batch_size):
+                zf.writestr(member_name(record_id), json.dumps(coordinates, separators=(',', ':')))
+                archived.append((record_id, updated_at))
+        if not archived:
+            return 0, None
+        buffer.seek(0)
+        name = get_storage().save(f'coordinates/{company_id or "none"}/{month:%Y-%m}-{uuid.uuid4().hex[:8]}.zip', File(buffer))
+
+    count = 0
+    with transaction.atomic():
+        for record_id, updated_at in archived:
+            # 다른 작업이 먼저 보관했거나, 파일을 쓰는 동안 좌표가 수정된 운행 기록(수정 일시가 바뀜)은 건너뜀
+            count += queryset.model.objects.filter(pk=record_id, updated_at=updated_at, coordinates_archive='').update(
+                coordinates=[], coordinates_archive=name
+            )
+    return count, name
+
+
+def restore_coordinates(queryset, batch_size=500):
+    """
+    보관된 좌표를 DB로 되돌립니다. 복원한 운행 기록 수를 반환합니다.
+    """
+    restored = 0
+    for record in queryset.exclude(coordinates_archive='').only('pk', 'coordinates_archive').iterator(chunk_size=batch_size):
+        record.coordinates = load_coordinates(record)
+        queryset.model.objects.filter(pk=record.pk, coordinates_archive=record.coordinates_archive).update(
+            coordinates=record.coordinates, coordinates_archive=''
+        )
+        restored += 1
+    return restored
@@ -0,0 +1,195 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from .renderers import FastJSONRenderer
+from .archive import rehydrate
+from .models import CustomUser, Notice, NoticeReadState, Vehicle, DrivingRecord
+from .serializers import CustomUserSerializer, NoticeSerializer, VehicleSerializer, DrivingRecordSerializer
+
+
+
+# 비동기 View에서 사용하는 JWT 인증
+class AsyncJWTAuthentication(JWTAuthentication):
+    """
+    토큰 검증은 JWTAuthentication과 같고, 사용자 조회만 비동기 ORM으로 처리합니다.
+    사용자의 회사 정보도 함께 조회하여 이후 request.user.company 접근 시 쿼리가 발생하지 않습니다.
+    """
+    async def aauthenticate(self, request, allow_query_token=False):
+        raw_token = request.GET.get('token') if allow_query_token else None
+        if not raw_token:
+            header = self.get_header(request)
+            if header is None:
+                return None
+            raw_token = self.get_raw_token(header)
+            if raw_token is None:
+                return None
+
+        validated_token = self.get_validated_token(raw_token)
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise AuthenticationFailed("Token contained no recognizable user identification")
+        try:
+            user = await CustomUser.objects.select_related('company').aget(**{jwt_settings.USER_ID_FIELD: user_id})
+        except CustomUser.DoesNotExist:
+            raise AuthenticationFailed("User not found", code='user_not_found')
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code='user_inactive')
+        return user
+
+
+
+# 비동기 API View 기본 클래스
+class AsyncAPIView(View):
+    """
+    DRF APIView는 비동기 핸들러를 지원하지 않으므로, 인증과 응답 렌더링만 DRF와 같게 맞춘 비동기 View입니다.
+    - 인증되지 않은 요청은 DRF와 같은 형식의 401 응답을 반환합니다.
+    - 응답은 동기 View와 같은 렌더러(FastJSONRenderer)로 렌더링하므로 같은 JSON을 반환합니다.
+    ASGI 서버에서 실행하면 DB 조회를 기다리는 동안 워커 스레드를 점유하지 않습니다.
+    """
+    authentication = AsyncJWTAuthentication()
+    renderer = FastJSONRenderer()
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True  # JWT 인증만 사용 (DRF APIView와 동일)
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            user = await self.authentication.aauthenticate(request)
+        except AuthenticationFailed as e:
+            data = e.detail if isinstance(e.detail, (list, dict)) else {"detail": e.detail}  # DRF 예외 처리기와 같은 형식
+            return self.respond(data, status.HTTP_401_UNAUTHORIZED)
+        if user is None:
+            return self.respond({"detail": "Authentication credentials were not provided."}, status.HTTP_401_UNAUTHORIZED)
+        request.user = user
+        return await super().dispatch(request, *args, **kwargs)
+
+    def respond(self, data, status_code=status.HTTP_200_OK):
+        return HttpResponse(self.renderer.render(data), status=status_code, content_type='application/json')
+
+
+
+# 차량 목록 전체 조회 (비동기)
+class AsyncVehicleListView(AsyncAPIView):
+    """
+    GET: 전체 차량 목록 조회 (VehicleListView와 같은 응답)
+    """
+    async def get(self, request):
+        vehicles = [
+            vehicle async for vehicle in
+            VehicleSerializer.prune(Vehicle.objects.filter(company=request.user.company), request)  # 회사명, 마지막 사용자 이름 등 필요한 컬럼만 한 번에 조회
+        ]
+        if not vehicles:
+            return self.respond({
+                "message": "차량이 존재하지 않습니다."
+            }, status.HTTP_404_NOT_FOUND)
+        return self.respond({
+            "message": "차량 목록 조회가 성공적으로 완료되었습니다.",
+            "vehicles": VehicleSerializer(vehicles, many=True, context={'request': request}).data  # 차량 목록 반환
+        })
+
+
+
+# 특정 차량 조회 (비동기)
+class AsyncVehicleDetailView(AsyncAPIView):
+    """
+    GET: 특정 차량 정보 조회 (VehicleDetailView.get과 같은 응답)
+    """
+    async def get(self, request, vehicle_id):
+        try:
+            vehicle = await VehicleSerializer.prune(Vehicle.objects.all(), request).aget(id=vehicle_id, company=request.user.company)
+        except Vehicle.DoesNotExist:
+            return self.respond({
+                "message": "차량 조회에 실패했습니다.",
+                "error": "No Vehicle matches the given query."
+            }, status.HTTP_404_NOT_FOUND)
+        return self.respond({
+            "vehicle": VehicleSerializer(vehicle, context={'request': request}).data
+        })
+
+
+
+# 전체 공지사항 목록 조회 (비동기)
+class AsyncNoticeListView(AsyncAPIView):
+    """
+    GET: 로그인한 사용자 회사의 공지사항 목록 조회 (NoticeListView와 같은 응답)
+    """
+    async def get(self, request):
+        data = [
+            notice async for notice in
+            Notice.objects.filter(company=request.user.company).values('id', 'title', 'created_at', 'created_by__name')
+        ]
+        read_state = await sync_to_async(NoticeReadState.for_user)(request.user, create=False)
+        for notice in data:
+            notice['is_read'] = read_state.is_read(notice['id'])  # 읽음 여부
+        return self.respond({
+            "message": "공지사항 목록 조회가 성공적으로 완료되었습니다.",
+            "unread_count": await sync_to_async(read_state.get_unread_count)(),  # 안 읽은 공지사항 수
+            "notices": data
+        })
+
+
+
+# 공지사항 상세 조회 (비동기)
+class AsyncNoticeDetailView(AsyncAPIView):
+    """
+    GET: 특정 공지사항 상세 조회 후 읽음 처리 (NoticeDetailView.get과 같은 응답)
+    """
+    async def get(self, request, pk):
+        try:
+            notice = await Notice.objects.select_related('company', 'created_by').aget(pk=pk, company=request.user.company)
+        except Notice.DoesNotExist:
+            return self.respond({
+                "message": "공지사항을 찾을 수 없습니다."
+            }, status.HTTP_404_NOT_FOUND)
+        data = NoticeSerializer(notice, context={'request': request}).data
+        read_state, created = await NoticeReadState.objects.aget_or_create(user=request.user)
+        read_state.user = request.user
+        await sync_to_async(read_state.mark_read)(notice)  # 상세 조회 시 읽음 처리
+        return self.respond({
+            "notice": data
+        })
+
+
+
+# 현재 로그인한 사용자 정보 조회 (비동기)
+class AsyncCurrentUserView(AsyncAPIView):
+    """
+    GET: 현재 로그인한 사용자의 정보 조회 (CurrentUserView.get과 같은 응답)
+    """
+    async def get(self, request):
+        return self.respond(CustomUserSerializer(request.user, context={'request': request}).data)  # 인증 시 회사 정보까지 조회됨
+
+
+
+# 특정 운행 기록 조회 (비동기)
+class AsyncDrivingRecordDetailView(AsyncAPIView):
+    """
+    GET: 특정 운행 기록 조회 (DrivingRecordDetailView.get과 같은 응답)
+    """
+    async def get(self, request, pk):
+        user_company = request.user.company
+        if not user_company:
+            return self.respond({
+                "message": "회사가 등록되지 않은 사용자입니다."
+            }, status.HTTP_400_BAD_REQUEST)
+        try:
+            record = await DrivingRecordSerializer.prune(DrivingRecord.objects.all(), request).aget(pk=pk, company=user_company)
+        except DrivingRecord.DoesNotExist:
+            return self.respond({
+                "message": "운행 기록 조회에 실패했습니다.",
+                "error": "No DrivingRecord matches the given query."
+            }, status.HTTP_404_NOT_FOUND)
+        await sync_to_async(rehydrate)(record)  # 보관된 좌표는 보관 파일에서 읽음
+        return self.respond({
+            "message": "운행 기록 조회가 성공적으로 완료되었습니다.",
+            "record": DrivingRecordSerializer(record, context={'request': request}).data
+        })
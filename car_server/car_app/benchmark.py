@@ -0,0 +1,106 @@
+import asyncio
+import statistics
+import time
+
+
+
+# ASGI 애플리케이션을 프로세스 안에서 직접 호출하는 부하 테스트 도구
+async def asgi_request(app, path, method='GET', headers=None, query_string=''):
+    """
+    ASGI 애플리케이션에 HTTP 요청 하나를 보내고 (상태 코드, 응답 본문, 응답 헤더)를 반환합니다.
+    """
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'root_path': '',
+        'query_string': query_string.encode(),
+        'headers': [(b'host', b'localhost')] + [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+        'client': ('127.0.0.1', 50000),
+        'server': ('localhost', 80),
+    }
+    request_sent = False
+    disconnected = asyncio.Event()
+    response = {'status': None, 'headers': [], 'body': []}
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+            response['headers'] = message.get('headers', [])
+        elif message['type'] == 'http.response.body':
+            response['body'].append(message.get('body', b''))
+            if not message.get('more_body'):
+                disconnected.set()
+
+    await app(scope, receive, send)
+    disconnected.set()
+    return response['status'], b''.join(response['body']), dict(response['headers'])
+
+
+async def run_load(app, path, headers=None, concurrency=10, requests=200, query_string=''):
+    """
+    동시 연결 수(concurrency)를 유지하면서 총 requests 번 요청을 보내고 지연 시간 통계를 반환합니다.
+    """
+    latencies, errors = [], 0
+    remaining = iter(range(requests))
+
+    async def client():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            status_code, body, response_headers = await asgi_request(app, path, headers=headers, query_string=query_string)
+            latencies.append(time.perf_counter() - started)
+            if status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return summarize(latencies, elapsed, errors)
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def summarize(latencies, elapsed, errors=0):
+    """
+    지연 시간 목록(초)을 밀리초 단위 통계로 요약합니다.
+    """
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'elapsed': round(elapsed, 3),
+        'throughput': round(len(latencies) / elapsed, 1) if elapsed else 0,  # 초당 요청 수
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 2) if latencies else 0,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def best_of(function, repeat):
+    """
+    함수를 repeat 번 실행하여 가장 빠른 실행 시간(밀리초)을 반환합니다.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
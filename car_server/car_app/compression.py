@@ -0,0 +1,183 @@
+import re
+import zlib
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:  # brotli가 설치되지 않은 경우 gzip만 사용
+        brotli = None
+
+
+
+# 응답 압축 (gzip / brotli)
+DEFAULT_RESPONSE_COMPRESSION = {
+    'ENABLED': True,
+    'MIN_SIZE': 1024,  # 이 크기(바이트)보다 작은 응답은 압축하지 않음 (스트리밍 응답은 크기와 관계없이 압축)
+    'GZIP_LEVEL': 6,  # 1(빠름) ~ 9(작음)
+    'BROTLI_QUALITY': 5,  # 0(빠름) ~ 11(작음)
+    'EXCLUDED_CONTENT_TYPES': (  # 이미 압축된 형식 (영수증, 차량 아이콘 등)
+        'image/', 'video/', 'audio/', 'font/woff',
+        'application/zip', 'application/gzip', 'application/x-gzip', 'application/x-7z-compressed',
+        'application/x-rar-compressed', 'application/pdf', 'application/octet-stream',
+    ),
+}
+
+accept_encoding_re = re.compile(r'\s*([a-z*]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*$')
+
+
+def get_config():
+    return {**DEFAULT_RESPONSE_COMPRESSION, **getattr(settings, 'RESPONSE_COMPRESSION', {})}
+
+
+def compress_exempt(view):
+    """
+    View(APIView 클래스 또는 함수)의 응답을 압축하지 않도록 표시합니다.
+    JWT 등 비밀 값이 요청으로 조작 가능한 값과 함께 담기는 응답에 사용합니다. (BREACH 공격 방지)
+    brotli는 gzip 파일 이름처럼 무작위 여백을 넣을 방법이 없으므로 압축 자체를 하지 않습니다.
+    """
+    view.compress_exempt = True
+    return view
+
+
+def is_compress_exempt(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return False
+    view_class = getattr(match.func, 'view_class', None)  # as_view()로 만든 함수는 원래 클래스를 view_class로 가짐
+    return getattr(match.func, 'compress_exempt', False) or getattr(view_class, 'compress_exempt', False)
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Accept-Encoding 헤더에서 사용할 압축 방식('br', 'gzip')을 선택합니다. 지원하지 않으면 None을 반환합니다.
+    q 값이 같으면 brotli를 우선합니다.
+    """
+    weights = {}
+    for item in accept_encoding.lower().split(','):
+        match = accept_encoding_re.match(item)
+        if match:
+            try:
+                weights[match[1]] = float(match[2]) if match[2] is not None else 1.0
+            except ValueError:
+                continue
+    wildcard = weights.get('*', 0)
+    candidates = [('br', weights.get('br', wildcard)), ('gzip', weights.get('gzip', wildcard))]
+    if brotli is None:
+        candidates = candidates[1:]
+    encoding, weight = max(candidates, key=lambda candidate: candidate[1])  # 같은 값이면 앞쪽(br) 선택
+    return encoding if weight > 0 else None
+
+
+
+class GzipCompressor:
+    def __init__(self, level):
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip 형식
+
+    def compress(self, data):
+        return self.compressor.compress(data)
+
+    def flush(self):
+        return self.compressor.flush(zlib.Z_SYNC_FLUSH)  # 지금까지의 데이터를 클라이언트가 바로 풀 수 있도록 전송
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, quality):
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self.compressor.process(data)
+
+    def flush(self):
+        return self.compressor.flush()
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Accept-Encoding에 따라 응답을 brotli 또는 gzip으로 압축합니다.
+    - 일반 응답: MIN_SIZE 이상이고 압축 결과가 원본보다 작은 경우에만 압축합니다.
+    - 스트리밍 응답(동기/비동기): 청크마다 압축하여 바로 전송합니다. (SSE 이벤트도 지연 없이 전달)
+    - 이미 압축된 형식(EXCLUDED_CONTENT_TYPES), Content-Encoding이 있는 응답, Cache-Control: no-transform 응답은 건너뜁니다.
+    - 로그인 등 토큰을 담는 응답(@compress_exempt 로 표시한 View)은 압축하지 않습니다. (BREACH)
+    """
+    def __init__(self, get_response):
+        self.config = get_config()
+        if not self.config['ENABLED']:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def get_compressor(self, encoding):
+        if encoding == 'br':
+            return BrotliCompressor(self.config['BROTLI_QUALITY'])
+        return GzipCompressor(self.config['GZIP_LEVEL'])
+
+    def is_compressible(self, request, response):
+        if response.has_header('Content-Encoding') or response.status_code < 200 or response.status_code in (204, 304):
+            return False
+        if is_compress_exempt(request):
+            return False
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return False
+        content_type = response.get('Content-Type', '').lower()
+        if content_type.startswith(tuple(self.config['EXCLUDED_CONTENT_TYPES'])):
+            return False
+        if not response.streaming and len(response.content) < self.config['MIN_SIZE']:
+            return False
+        return True
+
+    def process_response(self, request, response):
+        patch_vary_headers(response, ('Accept-Encoding',))  # 압축 여부가 요청 헤더에 따라 달라짐 (캐시 구분)
+        if not self.is_compressible(request, response):
+            return response
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = self.compress_async_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = self.compress_stream(response.streaming_content, encoding)
+            del response['Content-Length']  # 압축 후 크기를 미리 알 수 없음
+        else:
+            compressor = self.get_compressor(encoding)
+            compressed = compressor.compress(response.content) + compressor.finish()
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # 압축된 응답은 원본과 바이트가 다르므로 강한 ETag를 약한 ETag로 변경
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    def compress_stream(self, chunks, encoding):
+        compressor = self.get_compressor(encoding)
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+
+    async def compress_async_stream(self, chunks, encoding):
+        compressor = self.get_compressor(encoding)
+        async for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
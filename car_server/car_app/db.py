@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+
+
+# 허용하는 PRAGMA 이름 (설정 값이 SQL에 그대로 들어가므로 이름과 값 형식을 제한)
+ALLOWED_PRAGMAS = {'journal_mode', 'synchronous', 'busy_timeout', 'mmap_size', 'temp_store', 'cache_size', 'foreign_keys'}
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    새 SQLite 연결이 생성될 때 settings.SQLITE_PRAGMAS 의 PRAGMA를 적용합니다. (connection_created 시그널)
+    CONN_MAX_AGE로 연결을 재사용하므로 연결당 한 번만 실행됩니다.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            if name not in ALLOWED_PRAGMAS or value in (None, ''):
+                continue
+            value = str(value)
+            if not (value.isalnum() or value.lstrip('-').isdigit()):
+                raise ValueError(f"Invalid SQLite PRAGMA value: {name}={value}")
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+
+def backfill_company_ids(using=DEFAULT_DB_ALIAS, batch_size=5000, **kwargs):
+    """
+    운행 기록, 정비 기록, 지출 내역 중 회사(company)가 비어 있는 행을 차량의 회사로 채웁니다. (post_migrate 시 호출)
+    쓰기 잠금을 오래 잡지 않도록 batch_size 건씩 나누어 갱신하며, 모델별 갱신 건수를 반환합니다.
+    """
+    from .models import DrivingRecord, Expense, Maintenance, Vehicle
+
+    connection = connections[using]
+    table_names = connection.introspection.table_names()
+    vehicle_company = Subquery(Vehicle.objects.filter(pk=OuterRef('vehicle_id')).values('company_id')[:1])
+    updated = {}
+    for model in (DrivingRecord, Maintenance, Expense):
+        if not router.allow_migrate_model(using, model) or model._meta.db_table not in table_names:
+            continue
+        pending = model.objects.using(using).filter(company__isnull=True, vehicle__company__isnull=False)
+        updated[model.__name__] = 0
+        while True:
+            ids = list(pending.order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            updated[model.__name__] += model.objects.using(using).filter(pk__in=ids).update(company_id=vehicle_company, updated_at=timezone.now())
+    return updated
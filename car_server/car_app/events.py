@@ -0,0 +1,194 @@
+import asyncio
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from collections import defaultdict, deque
+from functools import lru_cache
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+
+# 회사 단위 이벤트 발행/구독 (SSE 푸시용)
+DEFAULT_EVENT_BROKER = {
+    'BACKEND': 'car_app.events.LocalBroker',  # 단일 프로세스용 메모리 브로커
+    'OPTIONS': {},  # 브로커 생성 인자
+}
+
+
+class Event:
+    __slots__ = ('id', 'company_id', 'type', 'data')
+
+    def __init__(self, id, company_id, type, data):
+        self.id = id
+        self.company_id = company_id
+        self.type = type
+        self.data = data
+
+    def encode(self):
+        """
+        text/event-stream 형식으로 변환합니다.
+        """
+        payload = json.dumps(self.data, cls=DjangoJSONEncoder, ensure_ascii=False)
+        return f'id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n'
+
+
+
+# 단일 프로세스용 브로커
+class LocalBroker:
+    """
+    같은 프로세스의 구독자에게만 이벤트를 전달합니다. (runserver 또는 ASGI 워커 하나)
+    구독자마다 크기가 제한된 asyncio.Queue 하나만 사용하므로 대기 중인 연결의 비용이 작습니다.
+    publish()는 어느 스레드에서 호출해도 됩니다. (동기 View의 스레드 포함)
+    """
+    def __init__(self, queue_size=100, replay_size=200):
+        self.queue_size = queue_size  # 구독자별 대기 이벤트 수 (넘치면 오래된 것부터 버림)
+        self.replay_size = replay_size  # 재접속(Last-Event-ID) 시 다시 보내줄 회사별 최근 이벤트 수
+        self._subscribers = defaultdict(set)  # company_id -> {(loop, queue)}
+        self._recent = defaultdict(lambda: deque(maxlen=self.replay_size))
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def publish(self, company_id, event_type, data):
+        with self._lock:
+            event = Event(next(self._ids), company_id, event_type, data)
+            self._recent[company_id].append(event)
+        self.dispatch(event)
+
+    def dispatch(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.company_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, event)
+            except RuntimeError:  # 이벤트 루프가 이미 종료된 구독자
+                pass
+
+    @staticmethod
+    def _deliver(queue, event):
+        if queue.full():
+            queue.get_nowait()  # 느린 구독자는 가장 오래된 이벤트를 버림
+        queue.put_nowait(event)
+
+    def subscribe(self, company_id):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers[company_id].add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, company_id, queue):
+        with self._lock:
+            subscribers = self._subscribers.get(company_id, set())
+            subscribers.difference_update({item for item in subscribers if item[1] is queue})
+            if not subscribers:
+                self._subscribers.pop(company_id, None)
+
+    async def replay(self, company_id, after_id):
+        """
+        재접속한 클라이언트가 놓친 이벤트(after_id 이후)를 반환합니다.
+        """
+        with self._lock:
+            return [event for event in self._recent.get(company_id, ()) if event.id > after_id]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+
+# 여러 워커 프로세스용 브로커 (외부 메시지 브로커 대신 로컬 SQLite 파일 사용)
+class SQLiteBroker(LocalBroker):
+    """
+    이벤트를 SQLite 파일에 기록하고, 각 워커 프로세스는 하나의 폴링 작업으로 새 이벤트를 읽어
+    자기 프로세스의 구독자에게 전달합니다. 한 서버에서 워커 여러 개를 띄울 때 Redis 등을 대신합니다.
+    """
+    PRUNE_INTERVAL = 500  # 이 횟수만큼 발행할 때마다 오래된 이벤트 정리
+
+    def __init__(self, path=None, poll_interval=0.5, retention_seconds=3600, **kwargs):
+        super().__init__(**kwargs)
+        self.path = str(path or settings.BASE_DIR / 'events.sqlite3')
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self._local = threading.local()
+        self._published = 0
+        self._poller = None
+        connection = self._connect()
+        connection.execute("CREATE TABLE IF NOT EXISTS events (id INTEGER PRIMARY KEY AUTOINCREMENT, company_id INTEGER NOT NULL, type TEXT NOT NULL, data TEXT NOT NULL, created REAL NOT NULL)")
+        connection.execute("CREATE INDEX IF NOT EXISTS events_company_id ON events (company_id, id)")
+        self._last_id = connection.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def publish(self, company_id, event_type, data):
+        connection = self._connect()
+        now = time.time()
+        connection.execute(
+            "INSERT INTO events (company_id, type, data, created) VALUES (?, ?, ?, ?)",
+            (company_id, event_type, json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False), now),
+        )
+        self._published += 1
+        if self._published % self.PRUNE_INTERVAL == 0:
+            connection.execute("DELETE FROM events WHERE created < ?", (now - self.retention_seconds,))
+
+    def _fetch(self, sql, params):
+        return [
+            Event(row[0], row[1], row[2], json.loads(row[3]))
+            for row in self._connect().execute(sql, params).fetchall()
+        ]
+
+    async def _poll(self):
+        while True:
+            try:
+                events = await asyncio.to_thread(
+                    self._fetch, "SELECT id, company_id, type, data FROM events WHERE id > ? ORDER BY id LIMIT 500", (self._last_id,)
+                )
+            except sqlite3.Error:
+                events = []
+            for event in events:
+                self._last_id = event.id
+                self.dispatch(event)
+            if not events:
+                await asyncio.sleep(self.poll_interval)
+
+    def subscribe(self, company_id):
+        queue = super().subscribe(company_id)
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.get_running_loop().create_task(self._poll())  # 프로세스당 하나의 폴링 작업
+        return queue
+
+    async def replay(self, company_id, after_id):
+        return await asyncio.to_thread(
+            self._fetch,
+            "SELECT id, company_id, type, data FROM events WHERE company_id = ? AND id > ? ORDER BY id LIMIT ?",
+            (company_id, after_id, self.replay_size),
+        )
+
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    """
+    settings.EVENT_BROKER['BACKEND'] 에 지정된 브로커 인스턴스를 반환합니다. (프로세스당 하나)
+    """
+    config = {**DEFAULT_EVENT_BROKER, **getattr(settings, 'EVENT_BROKER', {})}
+    return import_string(config['BACKEND'])(**config['OPTIONS'])
+
+
+def publish_event(company_id, event_type, data):
+    """
+    현재 트랜잭션이 커밋된 후 회사 구독자들에게 이벤트를 발행합니다.
+    """
+    if company_id is None:
+        return
+    transaction.on_commit(lambda: get_broker().publish(company_id, event_type, data))
@@ -0,0 +1,102 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+
+# 응답 필드 선택 (?fields=id,name / ?omit=coordinates)
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def parse_names(value):
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+
+def resolve(model, path):
+    """
+    'vehicle__company__name' 같은 경로를 (조회할 컬럼 경로, select_related 할 관계 경로 목록)으로 변환합니다.
+    모델 컬럼이 아닌 경우(프로퍼티, 메서드, 역참조, 다대다 관계) None을 반환합니다.
+    """
+    parts = path.split('__')
+    relations = []
+    for index, part in enumerate(parts):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.many_to_many:
+            return None
+        if index < len(parts) - 1:
+            if not field.is_relation:
+                return None
+            relations.append('__'.join(parts[:index + 1]))
+            model = field.related_model
+    parts[-1] = field.name  # 'user_id' → 'user'
+    return '__'.join(parts), relations
+
+
+def collect_paths(serializer, model, prefix=''):
+    """
+    직렬화할 필드에 필요한 (컬럼 경로 집합, 관계 경로 집합)을 반환합니다.
+    필요한 컬럼을 알 수 없는 필드(Meta.sparse_sources에 없는 SerializerMethodField 등)가 있으면 None을 반환합니다.
+    """
+    declared = getattr(getattr(serializer, 'Meta', None), 'sparse_sources', {})
+    columns, relations = set(), set()
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in declared:
+            sources = declared[name]
+        elif isinstance(field, serializers.ModelSerializer):  # 중첩 Serializer (예: 사용자의 회사 정보)
+            nested = collect_paths(field, model, prefix + '__'.join(field.source_attrs) + '__')
+            if nested is None:
+                return None
+            relations.add(prefix + '__'.join(field.source_attrs))
+            columns |= nested[0]
+            relations |= nested[1]
+            continue
+        elif field.source == '*' or isinstance(field, serializers.BaseSerializer):
+            return None
+        else:
+            sources = ['__'.join(field.source_attrs)]
+        for source in sources:
+            resolved = resolve(model, prefix + source)
+            if resolved is None:
+                return None
+            columns.add(resolved[0])
+            relations.update(resolved[1])
+    return columns, relations
+
+
+
+class SparseFieldsetMixin:
+    """
+    조회 요청(GET)의 ?fields= 에 지정한 필드만, ?omit= 에 지정한 필드를 제외하고 직렬화합니다.
+    prune()으로 QuerySet을 남은 필드에 필요한 컬럼(only)과 조인(select_related)만 조회하도록 줄일 수 있습니다.
+    SerializerMethodField처럼 필요한 컬럼을 알 수 없는 필드는 Meta.sparse_sources에 모델 필드 경로를 지정합니다.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return
+        params = getattr(request, 'query_params', request.GET)
+        fields, omit = parse_names(params.get(FIELDS_PARAM)), parse_names(params.get(OMIT_PARAM))
+        for name in list(self.fields):
+            if (fields and name not in fields) or name in omit:
+                self.fields.pop(name)
+
+    def prune_queryset(self, queryset):
+        """
+        직렬화할 필드에 필요한 컬럼과 조인만 조회하는 QuerySet을 반환합니다. 필요한 컬럼을 알 수 없으면 그대로 반환합니다.
+        """
+        paths = collect_paths(self, queryset.model)
+        if paths is None:
+            return queryset
+        columns, relations = paths
+        return queryset.select_related(None).select_related(*sorted(relations)).only(queryset.model._meta.pk.name, *sorted(columns))
+
+    @classmethod
+    def prune(cls, queryset, request):
+        return cls(context={'request': request}).prune_queryset(queryset)
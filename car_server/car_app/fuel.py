@@ -0,0 +1,105 @@
+from django.conf import settings
+from django.db.models import F, FloatField, Sum, Window
+from django.db.models.functions import Cast, PercentRank
+from django.utils import timezone
+
+
+
+# 유류비 연비 분석 (차량별 월간 유류비 통계 VehicleFuelStat에서 차량/차종/차량 카테고리별로 집계)
+DEFAULT_FUEL_EFFICIENCY = {
+    'MONTHS': 6,  # 기본 분석 기간 (이번 달 포함 최근 개월 수)
+    'MAX_MONTHS': 36,
+    'MIN_DISTANCE': 100,  # 기간 내 운행 거리가 이보다 짧은 대상은 순위에서 제외 (km당 유류비가 크게 튀지 않도록)
+}
+
+# 분석 단위: (구분 키, 응답에 포함할 차량 정보)
+GROUPS = {
+    'vehicle': ('vehicle_id', {
+        'license_plate_number': F('vehicle__license_plate_number'),
+        'vehicle_type': F('vehicle__vehicle_type'),
+        'vehicle_category': F('vehicle__vehicle_category'),
+    }),
+    'vehicle_type': ('vehicle_type', {'vehicle_type': F('vehicle__vehicle_type'), 'vehicle_category': F('vehicle__vehicle_category')}),
+    'vehicle_category': ('vehicle_category', {'vehicle_category': F('vehicle__vehicle_category')}),
+}
+
+
+def get_config():
+    return {**DEFAULT_FUEL_EFFICIENCY, **getattr(settings, 'FUEL_EFFICIENCY', {})}
+
+
+def month_range(months, today=None):
+    """
+    이번 달을 포함한 최근 months개월의 (첫 달, 마지막 달)을 반환합니다. (각 월의 1일)
+    """
+    end = (today or timezone.localdate()).replace(day=1)
+    index = end.year * 12 + end.month - 1 - (months - 1)
+    return end.replace(year=index // 12, month=index % 12 + 1), end
+
+
+def cost_per_km():
+    # 유류비 합계 / 운행 거리 합계 (SQLite는 정수로 저장된 금액끼리 정수 나눗셈을 하므로 실수로 변환)
+    return Cast(Sum('fuel_cost'), FloatField()) / Sum('driving_distance')
+
+
+def ranking(company, group, start, end, min_distance=None, min_percentile=None):
+    """
+    기간(start ~ end 월) 동안 분석 단위별 운행 거리, 유류비, km당 유류비와 백분위 순위를 반환합니다. (km당 유류비가 높은 순)
+    percentile은 회사 안에서 km당 유류비가 낮은 쪽부터의 백분위(0 ~ 1)이며, 차량 단위는 같은 차종 안의 백분위(type_percentile)도 함께 반환합니다.
+    원본 운행 기록 대신 차량별 월간 통계를 집계하므로 차량 수 × 개월 수 행만 읽습니다.
+    """
+    from .models import VehicleFuelStat
+    key, fields = GROUPS[group]
+    min_distance = get_config()['MIN_DISTANCE'] if min_distance is None else min_distance
+    percentiles = {'percentile': Window(PercentRank(), order_by=F('cost_per_km').asc())}
+    if group == 'vehicle':
+        percentiles['type_percentile'] = Window(PercentRank(), partition_by=[F('vehicle_type')], order_by=F('cost_per_km').asc())
+    rows = VehicleFuelStat.objects.filter(company=company, month__gte=start, month__lte=end).values(
+        *(['vehicle_id'] if group == 'vehicle' else []), **fields
+    ).annotate(
+        total_distance=Sum('driving_distance'),
+        total_fuel_cost=Sum('fuel_cost'),
+        trips=Sum('trip_count'),
+        cost_per_km=cost_per_km(),
+    ).filter(total_distance__gte=max(min_distance, 1)).annotate(**percentiles)
+    if min_percentile is not None:
+        rows = rows.filter(percentile__gte=min_percentile)
+    return rows.order_by('-cost_per_km', key)
+
+
+def slope(points):
+    """
+    (x, y) 목록의 최소제곱 기울기를 반환합니다. 점이 2개 미만이면 None을 반환합니다.
+    """
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+def trends(company, group, keys, start, end):
+    """
+    분석 단위별 월별 km당 유류비와 추세(월별 km당 유류비의 최소제곱 기울기, 원/km per 월)를 반환합니다.
+    반환 값: {구분 값: {"monthly": [{"month", "cost_per_km"}], "trend": 기울기 또는 None}}
+    """
+    from .models import VehicleFuelStat
+    key, fields = GROUPS[group]
+    lookup = 'vehicle_id' if group == 'vehicle' else fields[key].name
+    rows = VehicleFuelStat.objects.filter(
+        company=company, month__gte=start, month__lte=end, **{f'{lookup}__in': keys}
+    ).values('month', group_key=F(lookup)).annotate(distance=Sum('driving_distance'), cost_per_km=cost_per_km()).order_by('group_key', 'month')
+
+    series = {value: [] for value in keys}
+    for row in rows:
+        if row['distance'] > 0:
+            series[row['group_key']].append((row['month'], row['cost_per_km']))
+    result = {}
+    for value, points in series.items():
+        trend = slope([((month.year - start.year) * 12 + month.month - start.month, cost) for month, cost in points])
+        result[value] = {
+            "monthly": [{"month": month.strftime('%Y-%m'), "cost_per_km": round(cost, 2)} for month, cost in points],
+            "trend": round(trend, 3) if trend is not None else None,
+        }
+    return result
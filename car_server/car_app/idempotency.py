@@ -0,0 +1,160 @@
+import hashlib
+from datetime import timedelta
+from functools import wraps
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+
+
+# 생성 API의 Idempotency-Key 처리 (네트워크 오류로 재시도한 요청이 운행 기록 등을 중복 생성하지 않도록)
+DEFAULT_IDEMPOTENCY = {
+    'HEADER': 'Idempotency-Key',  # 클라이언트가 요청마다 새로 만들어 재시도 시 그대로 보내는 헤더
+    'TTL_SECONDS': 86400,  # 첫 응답을 저장해 두는 시간
+    'LOCK_SECONDS': 60,  # 처리 중인 키를 이 시간이 지나면 다른 요청이 이어받음 (처리 중 프로세스가 종료된 경우)
+    'MAX_KEY_LENGTH': 255,
+}
+
+REPLAYED_HEADER = 'Idempotent-Replayed'
+
+
+def get_config():
+    return {**DEFAULT_IDEMPOTENCY, **getattr(settings, 'IDEMPOTENCY', {})}
+
+
+def fingerprint(request):
+    """
+    요청 메서드, 경로, 본문의 SHA-256을 반환합니다.
+    파일 업로드(multipart)는 본문 전체를 메모리에 읽지 않도록 파싱된 값과 파일 내용으로 계산합니다.
+    """
+    digest = hashlib.sha256(f'{request.method} {request.path}\n'.encode())
+    if request.content_type.startswith('multipart/'):
+        for name, values in sorted(request.data.lists()):
+            for value in values:
+                digest.update(f'{name}='.encode())
+                if hasattr(value, 'chunks'):
+                    for chunk in value.chunks():
+                        digest.update(chunk)
+                    value.seek(0)
+                else:
+                    digest.update(str(value).encode())
+                digest.update(b'\n')
+    else:
+        digest.update(request.body)
+    return digest.hexdigest()
+
+
+def replay(record):
+    return Response(record.response, status=record.status_code, headers={REPLAYED_HEADER: 'true'})
+
+
+def conflict():
+    return Response({
+        "message": "같은 Idempotency-Key의 요청을 처리 중입니다. 잠시 후 다시 시도해 주세요."
+    }, status=status.HTTP_409_CONFLICT, headers={'Retry-After': '1'})
+
+
+def claim(user, key, digest, config):
+    """
+    키를 처리 중 상태로 등록합니다. 반환 값: (등록한 IdempotencyKey, None) 또는 (None, 바로 보낼 응답)
+    - 처음 보는 키: 등록 (사용자, 키) 고유 제약으로 동시에 같은 키로 들어온 요청 중 하나만 등록됨
+    - 응답이 저장된 키: 저장된 응답을 다시 보냄
+    - 다른 요청(본문, 경로)에 사용된 키: 422
+    - 처리 중인 키: 409 (LOCK_SECONDS가 지났거나 만료된 키는 조건부 갱신으로 하나의 요청만 이어받음)
+    """
+    from .models import IdempotencyKey
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=config['TTL_SECONDS'])
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(user=user, key=key, fingerprint=digest, locked_at=now, expires_at=expires_at), None
+    except IntegrityError:
+        pass
+
+    existing = IdempotencyKey.objects.filter(user=user, key=key).first()
+    if existing is None:  # 그 사이 만료되어 삭제된 경우
+        return None, conflict()
+    if existing.expires_at <= now:
+        # 만료된 키는 새 요청으로 처리
+        taken = IdempotencyKey.objects.filter(pk=existing.pk, expires_at=existing.expires_at).update(
+            fingerprint=digest, status_code=None, response=None, locked_at=now, expires_at=expires_at
+        )
+    elif existing.fingerprint != digest:
+        return None, Response({
+            "message": "이미 다른 요청에 사용된 Idempotency-Key입니다."
+        }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    elif existing.status_code is not None:
+        return None, replay(existing)
+    elif existing.locked_at > now - timedelta(seconds=config['LOCK_SECONDS']):
+        return None, conflict()
+    else:
+        taken = IdempotencyKey.objects.filter(pk=existing.pk, locked_at=existing.locked_at, status_code__isnull=True).update(locked_at=now)
+    if not taken:
+        return None, conflict()
+    existing.fingerprint, existing.locked_at = digest, now
+    return existing, None
+
+
+def release(record):
+    """
+    처리 중 상태를 풀어 같은 키로 다시 요청할 수 있게 합니다. (실패 응답 또는 예외)
+    """
+    from .models import IdempotencyKey
+    IdempotencyKey.objects.filter(pk=record.pk, locked_at=record.locked_at, status_code__isnull=True).delete()
+
+
+def idempotent(handler):
+    """
+    APIView의 생성(POST) 메서드에 Idempotency-Key 헤더 지원을 추가합니다.
+    성공(2xx) 응답은 쓰기와 같은 트랜잭션에서 키와 함께 저장되고, 같은 키로 재시도하면 쓰기를 다시 실행하지 않고 저장된 응답을 보냅니다.
+    실패 응답은 저장하지 않으며 그 사이의 쓰기도 되돌리므로, 같은 키로 다시 요청할 수 있습니다.
+    헤더가 없는 요청은 기존과 같이 처리합니다.
+    """
+    @wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        from .models import IdempotencyKey
+        config = get_config()
+        key = request.headers.get(config['HEADER'])
+        if key is None:
+            return handler(self, request, *args, **kwargs)
+        if not key.strip() or len(key) > config['MAX_KEY_LENGTH']:
+            return Response({
+                "message": f"{config['HEADER']} 헤더는 1 ~ {config['MAX_KEY_LENGTH']}자여야 합니다."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        record, response = claim(request.user, key, fingerprint(request), config)
+        if response is not None:
+            return response
+        try:
+            with transaction.atomic():
+                response = handler(self, request, *args, **kwargs)
+                if not status.is_success(response.status_code):
+                    transaction.set_rollback(True)
+                elif not IdempotencyKey.objects.filter(pk=record.pk, locked_at=record.locked_at).update(
+                    status_code=response.status_code, response=response.data
+                ):
+                    # 처리가 LOCK_SECONDS를 넘겨 다른 요청이 키를 이어받은 경우 이 요청의 쓰기를 되돌림
+                    transaction.set_rollback(True)
+                    return conflict()
+        except Exception:
+            release(record)
+            raise
+        if not status.is_success(response.status_code):
+            release(record)
+        return response
+    return wrapper
+
+
+def purge_expired(batch_size=5000):
+    """
+    만료된 키를 batch_size 건씩 삭제하고 삭제한 건수를 반환합니다. (expires_at 색인 사용)
+    """
+    from .models import IdempotencyKey
+    deleted = 0
+    while True:
+        ids = list(IdempotencyKey.objects.filter(expires_at__lt=timezone.now()).values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(pk__in=ids).delete()[0]
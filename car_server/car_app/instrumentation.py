@@ -0,0 +1,215 @@
+import logging
+import random
+import time
+from collections import Counter
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+
+
+# 요청별 쿼리 계측 (쿼리 수, DB 시간, 시리얼라이저 시간, 느린 쿼리, 중복 쿼리)
+logger = logging.getLogger('car_app.queries')
+
+DEFAULT_QUERY_INSTRUMENTATION = {
+    'ENABLED': False,
+    'SAMPLE_RATE': 1.0,  # 계측할 요청 비율 (0~1)
+    'SERVER_TIMING': True,  # Server-Timing 응답 헤더 추가 여부
+    'SLOW_REQUEST_MS': 500,  # 이 시간보다 오래 걸린 요청은 로그 기록
+    'SLOW_QUERY_MS': 100,  # 이 시간보다 오래 걸린 쿼리가 있으면 로그 기록
+    'MAX_QUERIES': 50,  # 쿼리 수가 이보다 많으면 로그 기록
+    'DUPLICATE_QUERIES': 5,  # 같은 SQL이 이 횟수 이상 실행되면 로그 기록 (N+1 의심)
+    'TOP_QUERIES': 5,  # 로그에 남길 가장 느린 쿼리 수
+}
+
+
+def get_config():
+    return {**DEFAULT_QUERY_INSTRUMENTATION, **getattr(settings, 'QUERY_INSTRUMENTATION', {})}
+
+
+def is_enabled():
+    return bool(get_config()['ENABLED'])
+
+
+_recorder = ContextVar('query_recorder', default=None)
+
+
+class QueryRecorder:
+    """
+    요청 하나에서 실행된 쿼리를 기록합니다.
+    SQL 문장별 실행 횟수와 시간만 모으고, 파라미터는 저장하지 않습니다. (개인정보가 로그에 남지 않도록)
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_queries = 0  # 시리얼라이저 실행 중 발생한 쿼리 수 (SerializerMethodField 등의 지연 조회)
+        self.serializer_depth = 0
+        self.statements = Counter()  # SQL -> 실행 횟수
+        self.statement_time = Counter()  # SQL -> 누적 시간
+        self.slowest = []  # [(시간, alias, SQL)]
+
+    def record(self, alias, sql, duration):
+        self.query_count += 1
+        self.db_time += duration
+        if self.serializer_depth:
+            self.serializer_queries += 1
+        self.statements[sql] += 1
+        self.statement_time[sql] += duration
+        self.slowest.append((duration, alias, sql))
+        if len(self.slowest) > 50:  # 느린 쿼리 후보만 유지
+            self.slowest.sort(reverse=True)
+            del self.slowest[20:]
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+    def duplicates(self, threshold):
+        return [
+            (count, self.statement_time[sql], sql)
+            for sql, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+    def top_queries(self, limit):
+        return sorted(self.slowest, reverse=True)[:limit]
+
+    def server_timing(self):
+        return ', '.join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.query_count} queries"',
+            f'serializer;dur={self.serializer_time * 1000:.1f};desc="{self.serializer_queries} queries"',
+            f'total;dur={self.total_time * 1000:.1f}',
+        ])
+
+
+
+def record_queries(execute, sql, params, many, context):
+    """
+    DB 연결의 execute_wrapper. 계측 중인 요청에서만 실행 시간을 기록합니다.
+    """
+    recorder = _recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        recorder.record(context['connection'].alias, sql, time.perf_counter() - started)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    새 DB 연결에 record_queries를 등록합니다. (connection_created 시그널, 계측이 켜진 경우에만 연결)
+    ASGI에서 동기 View가 다른 스레드의 연결을 사용해도 요청 단위로 기록되도록 연결마다 등록합니다.
+    """
+    if record_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_queries)
+
+
+
+# 시리얼라이저 실행 시간 계측
+class SerializerTimingMixin:
+    """
+    to_representation 실행 시간과 그 사이에 발생한 쿼리 수를 기록합니다.
+    중첩 시리얼라이저는 가장 바깥쪽 시리얼라이저의 시간에 포함됩니다.
+    """
+    def to_representation(self, instance):
+        recorder = _recorder.get()
+        if recorder is None:
+            return super().to_representation(instance)
+        recorder.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            recorder.serializer_depth -= 1
+            if not recorder.serializer_depth:
+                recorder.serializer_time += time.perf_counter() - started
+
+
+
+class QueryInstrumentationMiddleware:
+    """
+    요청별 쿼리 수, DB 시간, 시리얼라이저 시간을 Server-Timing 헤더로 반환하고,
+    기준(QUERY_INSTRUMENTATION)을 넘은 요청은 가장 느린 쿼리와 중복 쿼리 목록을 로그로 남깁니다.
+    계측이 꺼져 있으면 미들웨어 자체가 제외되어 요청 처리에 비용이 없습니다.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.config = get_config()
+        if not self.config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def should_record(self):
+        rate = self.config['SAMPLE_RATE']
+        return rate >= 1 or random.random() < rate
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.should_record():
+            return self.get_response(request)
+        recorder = QueryRecorder()
+        token = _recorder.set(recorder)
+        try:
+            response = self.get_response(request)
+        finally:
+            _recorder.reset(token)
+        return self.process_recorder(request, response, recorder)
+
+    async def __acall__(self, request):
+        if not self.should_record():
+            return await self.get_response(request)
+        recorder = QueryRecorder()
+        token = _recorder.set(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _recorder.reset(token)
+        return self.process_recorder(request, response, recorder)
+
+    def process_recorder(self, request, response, recorder):
+        config = self.config
+        if config['SERVER_TIMING']:
+            timing = recorder.server_timing()
+            if response.has_header('Server-Timing'):
+                timing = f"{response['Server-Timing']}, {timing}"
+            response['Server-Timing'] = timing
+
+        total_ms = recorder.total_time * 1000
+        top_queries = recorder.top_queries(config['TOP_QUERIES'])
+        duplicates = recorder.duplicates(config['DUPLICATE_QUERIES'])
+        reasons = []
+        if total_ms >= config['SLOW_REQUEST_MS']:
+            reasons.append(f"slow request ({total_ms:.0f}ms)")
+        if recorder.query_count > config['MAX_QUERIES']:
+            reasons.append(f"too many queries ({recorder.query_count})")
+        if top_queries and top_queries[0][0] * 1000 >= config['SLOW_QUERY_MS']:
+            reasons.append(f"slow query ({top_queries[0][0] * 1000:.0f}ms)")
+        if duplicates:
+            reasons.append(f"duplicate queries ({len(duplicates)} statements)")
+        if reasons:
+            self.log(request, response, recorder, reasons, top_queries, duplicates)
+        return response
+
+    def log(self, request, response, recorder, reasons, top_queries, duplicates):
+        lines = [
+            f"{request.method} {request.path} {response.status_code} - {', '.join(reasons)}",
+            f"  total {recorder.total_time * 1000:.1f}ms, db {recorder.db_time * 1000:.1f}ms / {recorder.query_count} queries, "
+            f"serializer {recorder.serializer_time * 1000:.1f}ms / {recorder.serializer_queries} queries",
+        ]
+        if duplicates:
+            lines.append("  duplicate queries:")
+            lines.extend(f"    {count}x {duration * 1000:.1f}ms  {sql}" for count, duration, sql in duplicates)
+        if top_queries:
+            lines.append("  slowest queries:")
+            lines.extend(f"    {duration * 1000:.1f}ms [{alias}]  {sql}" for duration, alias, sql in top_queries)
+        logger.warning('\n'.join(lines))
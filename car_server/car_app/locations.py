@@ -0,0 +1,145 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from django.conf import settings
+
+
+
+# 장소 자동 완성 (회사별 장소 사전을 프로세스 메모리의 접두어 색인으로 검색)
+DEFAULT_LOCATION_AUTOCOMPLETE = {
+    'LIMIT': 10,  # 기본 응답 건수
+    'MAX_LIMIT': 50,
+    'REFRESH_SECONDS': 5,  # 다른 프로세스에서 새로 등록된 장소를 가져오는 주기
+    'REBUILD_SECONDS': 600,  # 사용 횟수까지 DB에서 다시 읽어 색인을 새로 만드는 주기
+}
+
+
+CACHE_MIN_MATCHES = 500  # 일치하는 장소가 이보다 많은 접두어는 검색 결과를 캐시
+
+
+def get_config():
+    return {**DEFAULT_LOCATION_AUTOCOMPLETE, **getattr(settings, 'LOCATION_AUTOCOMPLETE', {})}
+
+
+def normalize(name):
+    # 검색용 키: 공백 제거, 대소문자 구분 없음
+    return ''.join((name or '').split()).casefold()
+
+
+
+class PrefixIndex:
+    """
+    회사 하나의 장소 이름 접두어 색인.
+    (정규화한 이름, 장소 ID)의 정렬 배열에서 bisect로 접두어 범위를 찾고, 그 범위에서 사용 횟수가 많은 순으로 반환합니다.
+    같은 프로세스의 운행 기록 저장은 note()로 바로 반영하고, 다른 프로세스의 변경은 refresh()/build()로 가져옵니다.
+    """
+    def __init__(self, company_id):
+        self.company_id = company_id
+        self.lock = threading.Lock()
+        self.keys = []  # (정규화한 이름, 장소 ID) 정렬 배열
+        self.entries = {}  # 장소 ID → [이름, 사용 횟수]
+        self.max_id = 0
+        self.results = {}  # 넓은 범위(짧은 접두어) 검색 결과 캐시 (색인이 바뀌면 비움)
+        self.built_at = self.refreshed_at = 0.0
+
+    def build(self):
+        from .models import Location
+        rows = Location.objects.filter(company_id=self.company_id).values_list('pk', 'name', 'usage_count')
+        entries = {pk: [name, count] for pk, name, count in rows}
+        keys = sorted((normalize(name), pk) for pk, (name, _) in entries.items())
+        with self.lock:
+            self.keys, self.entries, self.results = keys, entries, {}
+            self.max_id = max(entries, default=0)
+            self.built_at = self.refreshed_at = time.monotonic()
+
+    def refresh(self):
+        """
+        마지막으로 읽은 장소 ID 이후에 등록된 장소만 가져옵니다. (장소 ID 범위 조회)
+        """
+        from .models import Location
+        rows = list(Location.objects.filter(company_id=self.company_id, pk__gt=self.max_id).order_by('pk').values_list('pk', 'name', 'usage_count'))
+        with self.lock:
+            for pk, name, count in rows:
+                self.add(pk, name, count)
+            if rows:
+                self.max_id = max(self.max_id, rows[-1][0])
+            self.refreshed_at = time.monotonic()
+
+    def add(self, pk, name, count):
+        # max_id는 DB에서 읽은 장소로만 갱신 (다른 프로세스가 먼저 등록한 더 작은 ID를 refresh()에서 놓치지 않도록)
+        if pk in self.entries:
+            return
+        self.entries[pk] = [name, count]
+        insort(self.keys, (normalize(name), pk))
+        self.results.clear()
+
+    def note(self, pk, name, delta):
+        """
+        운행 기록 저장으로 바뀐 사용 횟수를 반영합니다. 처음 보는 장소는 색인에 추가합니다.
+        """
+        with self.lock:
+            entry = self.entries.get(pk)
+            if entry is not None:
+                entry[1] = max(entry[1] + delta, 0)
+                self.results.clear()
+            elif name is not None and delta > 0:
+                self.add(pk, name, delta)
+
+    def search(self, prefix, limit):
+        """
+        이름이 prefix로 시작하는 장소를 사용 횟수가 많은 순(같으면 이름 순)으로 최대 limit 건 반환합니다.
+        """
+        key = normalize(prefix)
+        with self.lock:
+            cached = self.results.get((key, limit))
+            if cached is not None:
+                return cached
+            lo = bisect_left(self.keys, (key,))
+            hi = bisect_left(self.keys, (key + '\U0010ffff',)) if key else len(self.keys)
+            entries = [(pk, *self.entries[pk]) for _, pk in self.keys[lo:hi]]
+            best = heapq.nsmallest(limit, entries, key=lambda entry: (-entry[2], entry[1]))
+            result = [{"id": pk, "name": name, "usage_count": count} for pk, name, count in best]
+            if hi - lo > CACHE_MIN_MATCHES:
+                self.results[(key, limit)] = result
+        return result
+
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(company_id):
+    """
+    회사의 접두어 색인을 반환합니다. 처음 요청될 때 만들고, REFRESH_SECONDS/REBUILD_SECONDS가 지나면 DB의 변경을 반영합니다.
+    """
+    config = get_config()
+    with _indexes_lock:
+        index = _indexes.get(company_id)
+        if index is None:
+            index = _indexes[company_id] = PrefixIndex(company_id)
+    now = time.monotonic()
+    if now - index.built_at > config['REBUILD_SECONDS']:
+        index.build()
+    elif now - index.refreshed_at > config['REFRESH_SECONDS']:
+        index.refresh()
+    return index
+
+
+def note_usage(company_id, location_id, name, delta):
+    """
+    장소 사용 횟수 변경을 이미 만들어진 색인에 반영합니다. (운행 기록 저장 트랜잭션 커밋 후 호출, 색인이 없으면 무시)
+    """
+    index = _indexes.get(company_id)
+    if index is not None:
+        index.note(location_id, name, delta)
+
+
+def clear_indexes():
+    with _indexes_lock:
+        _indexes.clear()
+
+
+def autocomplete(company_id, prefix, limit):
+    return get_index(company_id).search(prefix, limit)
@@ -0,0 +1,51 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from car_app.archive import archivable_months, archive_month, get_config, restore_coordinates
+from car_app.models import Company, DrivingRecord
+
+
+
+class Command(BaseCommand):
+    help = "출발 시간이 보관 기간보다 오래된 운행 기록의 좌표를 회사/월별 압축 파일로 옮기고 DB에는 파일 이름만 남깁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help="보관 기간(일). 기본값은 settings.COORDINATE_ARCHIVE['RETENTION_DAYS']")
+        parser.add_argument('--company', help="특정 회사(사업자 등록 번호)의 운행 기록만 처리")
+        parser.add_argument('--batch-size', type=int, default=500, help="한 번에 읽고 갱신할 운행 기록 수")
+        parser.add_argument('--dry-run', action='store_true', help="보관 대상 건수만 출력합니다.")
+        parser.add_argument('--restore', action='store_true', help="보관된 좌표를 DB로 되돌립니다. (--days, --company 조건 적용)")
+        parser.add_argument('--vacuum', action='store_true', help="처리 후 SQLite VACUUM으로 DB 파일 크기를 줄입니다.")
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else get_config()['RETENTION_DAYS']
+        records = DrivingRecord.objects.filter(departure_time__lt=timezone.now() - timedelta(days=days))
+        if options['company']:
+            try:
+                company = Company.objects.get(business_registration_number=options['company'])
+            except Company.DoesNotExist:
+                raise CommandError(f"사업자 등록 번호 {options['company']}에 해당하는 회사가 없습니다.")
+            records = records.filter(company=company)
+
+        if options['restore']:
+            restored = restore_coordinates(records, batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f"운행 기록 {restored}건의 좌표를 DB로 되돌렸습니다."))
+        else:
+            pending = records.filter(coordinates_archive='')
+            months = archivable_months(pending)
+            if options['dry_run']:
+                self.stdout.write(f"보관 대상: 운행 기록 {pending.count()}건 (회사/월 {len(months)}개)")
+                return
+            total = 0
+            for company_id, month in months:
+                count, name = archive_month(pending, company_id, month, batch_size=options['batch_size'])
+                total += count
+                if name:
+                    self.stdout.write(f"{month:%Y-%m} 회사 {company_id}: {count}건 → {name}")
+            self.stdout.write(self.style.SUCCESS(f"운행 기록 {total}건의 좌표를 보관했습니다."))
+
+        if options['vacuum'] and connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('VACUUM')
+            self.stdout.write("VACUUM으로 DB 파일 크기를 줄였습니다.")
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from car_app.db import backfill_company_ids
+
+
+
+class Command(BaseCommand):
+    help = "운행 기록, 정비 기록, 지출 내역의 회사(company) 컬럼이 비어 있는 행을 차량의 회사로 채웁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help="갱신할 DB alias")
+        parser.add_argument('--batch-size', type=int, default=5000, help="한 번에 갱신할 행 수")
+
+    def handle(self, *args, **options):
+        updated = backfill_company_ids(using=options['database'], batch_size=options['batch_size'])
+        for name, count in updated.items():
+            self.stdout.write(f"{name}: {count}건 갱신")
+        self.stdout.write(self.style.SUCCESS("회사 컬럼 채우기가 완료되었습니다."))
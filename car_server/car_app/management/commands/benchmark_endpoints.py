@@ -0,0 +1,272 @@
+import io
+import json
+import os
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from car_app import urls as car_app_urls
+from car_app.benchmark import summarize
+from car_app.models import CustomUser, Notice, Vehicle, DrivingRecord, Maintenance, Expense
+from car_app.throttling import get_backend as get_login_throttle_backend
+
+
+
+# 측정에서 제외하는 API (URL 이름 -> 사유)
+SKIPPED_ENDPOINTS = {
+    'event-stream': "연결이 끊길 때까지 응답이 끝나지 않는 SSE 스트림",
+}
+
+# 쓰기 API는 매 요청을 트랜잭션 안에서 실행한 뒤 롤백하므로 데이터가 바뀌지 않음
+WRITE_METHODS = {'post', 'put', 'patch', 'delete'}
+
+
+
+@contextmanager
+def private_login_throttle():
+    """
+    측정 중에는 이 프로세스 전용 메모리 백엔드로 로그인 시도를 제한합니다.
+    반복 로그인을 위해 버킷을 초기화해도 운영 중인 공유 백엔드(SQLiteBucketBackend 등)의 사용자별 상태는 지우지 않습니다.
+    """
+    config = {**getattr(settings, 'LOGIN_THROTTLE', {}), 'BACKEND': 'car_app.throttling.LocMemBucketBackend', 'OPTIONS': {}}
+    with override_settings(LOGIN_THROTTLE=config):
+        get_login_throttle_backend.cache_clear()  # 프로세스당 하나인 백엔드 인스턴스를 새 설정으로 다시 생성
+        try:
+            yield
+        finally:
+            get_login_throttle_backend.cache_clear()
+
+
+
+class Command(BaseCommand):
+    help = "car_app/urls.py의 모든 API에 대해 응답 시간과 쿼리 수를 측정하고 결과를 JSON 파일로 저장합니다. (--compare로 이전 결과와 비교)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--email', help="요청에 사용할 관리자 이메일 (기본값: 운행 기록이 가장 많은 회사의 관리자)")
+        parser.add_argument('--password', default='fleet-pass-1234', help="로그인 API 측정에 사용할 비밀번호 (generate_fleet_data 기본값)")
+        parser.add_argument('--iterations', type=int, default=20, help="API별 측정 횟수")
+        parser.add_argument('--warmup', type=int, default=2, help="측정 전에 버리는 요청 수")
+        parser.add_argument('--read-only', action='store_true', help="GET 요청만 측정")
+        parser.add_argument('--filter', help="URL 이름에 이 문자열이 포함된 API만 측정")
+        parser.add_argument('--label', default='', help="결과 파일에 함께 저장할 설명 (예: 브랜치 이름)")
+        parser.add_argument('--output', help="결과 파일 경로 (기본값: benchmarks/endpoints-<시각>.json)")
+        parser.add_argument('--compare', help="비교할 이전 결과 파일 경로")
+
+    def handle(self, *args, **options):
+        self.user = self.get_user(options['email'])
+        self.password = options['password']
+        self.objects = self.get_sample_objects(self.user)
+        self.client = APIClient(SERVER_NAME='localhost', raise_request_exception=False)  # 서버 오류도 상태 코드로 기록
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+        results = []
+        self.stdout.write(f"사용자 {self.user.email}, API별 {options['iterations']}회 측정")
+        self.stdout.write(f"{'API':<36}{'메서드':<8}{'상태':>6}{'p50(ms)':>10}{'p95(ms)':>10}{'쿼리':>7}")
+        with private_login_throttle():
+            for name, method in self.get_endpoints(options):
+                if name in SKIPPED_ENDPOINTS:
+                    self.stdout.write(f"{name:<36}{method.upper():<8}{'건너뜀':>6}  {SKIPPED_ENDPOINTS[name]}")
+                    continue
+                result = self.measure(name, method, options['iterations'], options['warmup'])
+                results.append(result)
+                self.stdout.write(
+                    f"{name:<36}{method.upper():<8}{result['status']:>6}{result['p50_ms']:>10}{result['p95_ms']:>10}{result['queries']:>7}"
+                )
+
+        report = {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'label': options['label'],
+            'user': self.user.email,
+            'iterations': options['iterations'],
+            'data': self.get_data_volume(),  # 측정 당시 데이터 규모
+            'endpoints': results,
+        }
+        path = options['output'] or os.path.join(settings.BASE_DIR, 'benchmarks', f"endpoints-{datetime.now():%Y%m%d-%H%M%S}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"결과를 저장했습니다: {path}"))
+
+        if options['compare']:
+            self.compare(options['compare'], report)
+
+    def get_user(self, email):
+        if email:
+            user = CustomUser.objects.select_related('company').filter(email=email).first()
+            if user is None:
+                raise CommandError(f"{email} 사용자가 없습니다.")
+            return user
+        admins = CustomUser.objects.select_related('company').filter(is_admin=True, company__isnull=False)
+        user = max(admins, key=lambda admin: DrivingRecord.objects.filter(company_id=admin.company_id).count(), default=None)
+        if user is None:
+            raise CommandError("측정에 사용할 관리자가 없습니다. generate_fleet_data로 데이터를 먼저 생성해 주세요.")
+        return user
+
+    def get_sample_objects(self, user):
+        company = user.company
+        member = CustomUser.objects.filter(company=company, is_admin=False).order_by('id').first() or user
+        return {
+            'user': member,
+            'notice': Notice.objects.filter(company=company).order_by('-id').first(),
+            'vehicle': Vehicle.objects.filter(company=company).order_by('id').first(),
+            'record': DrivingRecord.objects.filter(company=company).order_by('-id').first(),
+            'maintenance': Maintenance.objects.filter(company=company).order_by('-id').first(),
+            'expense': Expense.objects.filter(company=company).order_by('-id').first(),
+        }
+
+    def get_data_volume(self):
+        return {
+            model.__name__: model.objects.count()
+            for model in (CustomUser, Vehicle, DrivingRecord, Maintenance, Expense, Notice)
+        }
+
+    def get_endpoints(self, options):
+        """
+        car_app/urls.py 의 URL 패턴에서 (URL 이름, HTTP 메서드) 목록을 만듭니다.
+        """
+        for pattern in car_app_urls.urlpatterns:
+            if not isinstance(pattern, URLPattern) or not pattern.name:
+                continue
+            if options['filter'] and options['filter'] not in pattern.name:
+                continue
+            view_class = getattr(pattern.callback, 'view_class', None) or getattr(pattern.callback, 'cls', None)
+            methods = [method for method in ('get', 'post', 'put', 'patch', 'delete') if view_class and hasattr(view_class, method)]
+            for method in methods:
+                if options['read_only'] and method in WRITE_METHODS:
+                    continue
+                yield pattern.name, method
+
+    def build_request(self, name, method):
+        """
+        API별 요청 경로와 본문을 만듭니다. 반환값: (경로, 본문, 형식)
+        """
+        objects, user = self.objects, self.user
+        unique = f"{time.perf_counter_ns()}"[-9:]  # 생성 API의 고유값 중복 방지
+        kwargs = {}
+        if name in ('user-detail', 'user-driving-stats'):
+            kwargs = {'pk': objects['user'].pk}
+        elif name in ('notice-detail', 'async-notice-detail'):
+            kwargs = {'pk': objects['notice'].pk}
+        elif name in ('vehicle-detail', 'async-vehicle-detail'):
+            kwargs = {'vehicle_id': objects['vehicle'].pk}
+        elif name in ('driving-record-detail', 'async-driving-record-detail', 'driving-record-segments'):
+            kwargs = {'pk': objects['record'].pk}
+        elif name == 'maintenance-detail':
+            kwargs = {'pk': objects['maintenance'].pk}
+        elif name == 'expense-detail':
+            kwargs = {'pk': objects['expense'].pk}
+        path = reverse(name, kwargs=kwargs)
+
+        vehicle = objects['vehicle']
+        bodies = {
+            ('admin-register', 'post'): {
+                'email': f'bench-{unique}@example.com', 'phone_number': f'bench-{unique}', 'password': 'Bench-pass-1234', 'password2': 'Bench-pass-1234',
+                'business_registration_number': f'bench-{unique}', 'company_name': '벤치마크', 'department': '총무팀', 'position': '부장', 'name': '측정',
+            },
+            ('admin-login', 'post'): {'email_or_phone': user.email, 'password': self.password},
+            ('login', 'post'): {'email_or_phone': user.email, 'password': self.password},
+            ('register-user', 'post'): {
+                'email': f'bench-{unique}@example.com', 'phone_number': f'bench-{unique}', 'password': 'Bench-pass-1234', 'password2': 'Bench-pass-1234',
+                'department': '총무팀', 'position': '사원', 'name': '측정',
+            },
+            ('import-users', 'post'): {'file': io.BytesIO(
+                f"email,phone_number,name,password\nbench-{unique}@example.com,bench-{unique},측정,Bench-pass-1234\n".encode()
+            )},
+            ('logout', 'post'): {'refresh': str(RefreshToken.for_user(user))},
+            ('user-detail', 'patch'): {'department': '기술지원팀'},
+            ('current-user', 'patch'): {'department': '기술지원팀'},
+            ('notice-list-create', 'post'): {'title': '벤치마크 공지', 'content': '측정용 공지사항입니다.'},
+            ('notice-detail', 'put'): {'title': '벤치마크 공지 수정'},
+            ('vehicle-create', 'post'): {
+                'vehicle_category': '내연기관', 'vehicle_type': 'K5', 'car_registration_number': f'B{unique}', 'license_plate_number': f'B{unique}',
+                'purchase_date': '2024-01-01', 'purchase_price': '30000000.00', 'total_mileage': 0,
+            },
+            ('vehicle-detail', 'patch'): {'current_status': vehicle.current_status},
+            ('maintenance-list-create', 'post'): {
+                'vehicle': vehicle.pk, 'maintenance_date': '2024-01-01', 'maintenance_type': Maintenance.ENGINE_OIL_CHANGE, 'maintenance_cost': '80000.00',
+            },
+            ('maintenance-detail', 'put'): {'maintenance_description': '벤치마크'},
+            ('expense-detail', 'patch'): {'details': '벤치마크'},
+            ('driving-record-list-create', 'post'): {
+                'vehicle': vehicle.pk, 'departure_location': '서울', 'arrival_location': '수원',
+                'departure_mileage': vehicle.total_mileage, 'arrival_mileage': vehicle.total_mileage + 40,
+                'departure_time': '2024-05-01T09:00:00Z', 'arrival_time': '2024-05-01T10:00:00Z',
+                'coordinates': [[37.5665, 126.978], [37.2636, 127.0286]], 'fuel_cost': '6000.00',
+            },
+            ('driving-record-detail', 'put'): {
+                'departure_mileage': objects['record'].departure_mileage, 'arrival_mileage': objects['record'].arrival_mileage,
+                'driving_purpose': DrivingRecord.BUSINESS,
+            },
+        }
+        if name == 'notice-search':
+            path += '?q=안내'
+        body = bodies.get((name, method))
+        return path, body, 'multipart' if name == 'import-users' else 'json'
+
+    def request(self, name, method):
+        path, body, format = self.build_request(name, method)
+        if name in ('admin-login', 'login'):
+            get_login_throttle_backend().reset()  # 반복 로그인이 시도 제한에 걸리지 않도록 초기화 (측정 전용 백엔드, private_login_throttle)
+        return getattr(self.client, method)(path, body, format=format) if body is not None else getattr(self.client, method)(path)
+
+    def measure(self, name, method, iterations, warmup):
+        latencies, statuses, queries = [], {}, []
+        for iteration in range(warmup + iterations):
+            with ExitStack() as stack:
+                if method in WRITE_METHODS:
+                    stack.enter_context(transaction.atomic())
+                    stack.callback(transaction.set_rollback, True)  # 쓰기 결과를 되돌림
+                for connection in connections.all():
+                    connection.queries_log.clear()  # 기록 가능한 쿼리 수(9000개) 제한에 걸리지 않도록 매번 비움
+                captures = [stack.enter_context(CaptureQueriesContext(connection)) for connection in connections.all()]
+                started = time.perf_counter()
+                response = self.request(name, method)
+                elapsed = time.perf_counter() - started
+            if iteration < warmup:
+                continue
+            latencies.append(elapsed)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            queries.append(sum(len(capture.captured_queries) for capture in captures))
+
+        summary = summarize(latencies, sum(latencies))
+        return {
+            'name': name,
+            'method': method.upper(),
+            'status': max(statuses, key=statuses.get),  # 가장 많이 나온 상태 코드
+            'statuses': {str(code): count for code, count in statuses.items()},
+            'mean_ms': summary['mean_ms'],
+            'p50_ms': summary['p50_ms'],
+            'p95_ms': summary['p95_ms'],
+            'p99_ms': summary['p99_ms'],
+            'queries': max(queries) if queries else 0,  # 요청당 최대 쿼리 수
+        }
+
+    def compare(self, path, report):
+        try:
+            with open(path, encoding='utf-8') as file:
+                baseline = json.load(file)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"비교할 결과 파일을 읽을 수 없습니다: {e}")
+
+        previous = {(row['name'], row['method']): row for row in baseline.get('endpoints', [])}
+        self.stdout.write(f"\n이전 결과와 비교: {path} ({baseline.get('created_at')}, {baseline.get('label') or '설명 없음'})")
+        self.stdout.write(f"{'API':<36}{'메서드':<8}{'p50(ms)':>18}{'변화':>9}{'쿼리':>12}")
+        for row in report['endpoints']:
+            before = previous.get((row['name'], row['method']))
+            if before is None:
+                self.stdout.write(f"{row['name']:<36}{row['method']:<8}{'(새 API)':>18}")
+                continue
+            change = (row['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0
+            line = (
+                f"{row['name']:<36}{row['method']:<8}{before['p50_ms']:>8} → {row['p50_ms']:<7}{change:>+8.1f}%"
+                f"{before['queries']:>5} → {row['queries']:<5}"
+            )
+            if row['queries'] > before['queries'] or change > 20:
+                line = self.style.WARNING(line)  # 쿼리 수 증가 또는 20% 이상 느려진 API
+            self.stdout.write(line)
@@ -0,0 +1,61 @@
+import io
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from car_app.benchmark import best_of
+from car_app.models import DrivingRecord, Vehicle
+from car_app.renderers import FastJSONRenderer, FastJSONParser, is_available
+from car_app.serializers import DrivingRecordSerializer
+
+
+
+class Command(BaseCommand):
+    help = "운행 기록 목록/상세 응답처럼 큰 JSON을 DRF 기본 렌더러/파서와 FastJSONRenderer/FastJSONParser로 처리하는 시간을 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--records', type=int, default=2000, help="목록 응답에 포함할 운행 기록 수")
+        parser.add_argument('--repeat', type=int, default=10, help="측정 반복 횟수 (가장 빠른 값 사용)")
+
+    def get_payloads(self, limit):
+        # 운행 기록이 가장 많은 회사의 목록 응답과 좌표가 가장 많은 운행 기록의 상세 응답
+        vehicle = Vehicle.objects.annotate(records=Count('drivingrecord')).order_by('-records').first()
+        if vehicle is None or not vehicle.records:
+            raise CommandError("운행 기록이 없습니다. generate_fleet_data로 데이터를 먼저 생성해 주세요.")
+        records = list(
+            DrivingRecord.objects.filter(company_id=vehicle.company_id).select_related('user', 'vehicle').order_by('-id')[:limit]
+        )
+        largest = max(records, key=lambda record: len(record.coordinates or []))
+        return [
+            (f"운행 기록 목록 ({len(records)}건)", {
+                "message": "운행 기록 목록 조회가 성공적으로 완료되었습니다.",
+                "records": DrivingRecordSerializer(records, many=True).data
+            }),
+            (f"운행 기록 상세 (좌표 {len(largest.coordinates or [])}개)", {
+                "message": "운행 기록 조회가 성공적으로 완료되었습니다.",
+                "record": DrivingRecordSerializer(largest).data
+            }),
+        ]
+
+    def handle(self, *args, **options):
+        if not is_available():
+            self.stdout.write(self.style.WARNING("orjson이 설치되지 않아 FastJSONRenderer/FastJSONParser는 DRF 기본 처리로 동작합니다. (pip install orjson)"))
+        repeat = options['repeat']
+        default_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        default_parser, fast_parser = JSONParser(), FastJSONParser()
+
+        for name, data in self.get_payloads(options['records']):
+            default_body = default_renderer.render(data)
+            fast_body = fast_renderer.render(data)
+            if json.loads(default_body) != json.loads(fast_body):
+                raise CommandError(f"{name}: 두 렌더러의 결과가 다릅니다.")
+
+            render_default = best_of(lambda: default_renderer.render(data), repeat)
+            render_fast = best_of(lambda: fast_renderer.render(data), repeat)
+            parse_default = best_of(lambda: default_parser.parse(io.BytesIO(default_body)), repeat)
+            parse_fast = best_of(lambda: fast_parser.parse(io.BytesIO(default_body)), repeat)
+
+            self.stdout.write(f"{name}: {len(default_body) / 1024:,.0f}KB (결과 동일: {'예' if default_body == fast_body else '값 동일, 표기 차이 있음'})")
+            self.stdout.write(f"  렌더링  기본 {render_default:8.2f}ms  빠른 렌더러 {render_fast:8.2f}ms  ({render_default / render_fast:.1f}배)")
+            self.stdout.write(f"  파싱    기본 {parse_default:8.2f}ms  빠른 파서   {parse_fast:8.2f}ms  ({parse_default / parse_fast:.1f}배)")
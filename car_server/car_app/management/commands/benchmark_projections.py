@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from rest_framework.test import APIRequestFactory
+from car_app.benchmark import best_of
+from car_app.models import Company, DrivingRecord, Expense, Maintenance
+from car_app.projections import project
+from car_app.renderers import FastJSONRenderer
+from car_app.serializers import DrivingRecordSerializer, ExpenseSerializer, MaintenanceSerializer
+
+
+
+# (이름, 모델, Serializer, 비교할 쿼리 파라미터 목록)
+LISTS = [
+    ('운행 기록 목록', DrivingRecord, DrivingRecordSerializer, [{}, {'omit': 'coordinates'}, {'fields': 'id,user_name,coordinates_archived'}]),
+    ('정비 기록 목록', Maintenance, MaintenanceSerializer, [{}, {'fields': 'id,vehicle_info,maintenance_type_display'}]),
+    ('지출 내역 목록', Expense, ExpenseSerializer, [{}, {'fields': 'id,user_info,vehicle_info,receipt_detail'}]),
+]
+
+
+class Command(BaseCommand):
+    help = "운행/정비/지출 목록 응답을 Serializer(모델 인스턴스)와 .values() 읽기 모델로 만드는 시간을 비교하고, 두 응답이 바이트 단위로 같은지 확인합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company', help="측정할 회사(사업자 등록 번호). 기본값은 운행 기록이 가장 많은 회사")
+        parser.add_argument('--limit', type=int, default=2000, help="목록 응답에 포함할 최대 행 수")
+        parser.add_argument('--repeat', type=int, default=5, help="측정 반복 횟수 (가장 빠른 값 사용)")
+
+    def get_company(self, brn):
+        companies = Company.objects.all()
+        if brn:
+            companies = companies.filter(business_registration_number=brn)
+        company = companies.annotate(records=Count('drivingrecord')).order_by('-records').first()
+        if company is None:
+            raise CommandError("회사가 없습니다. generate_fleet_data로 데이터를 먼저 생성해 주세요.")
+        return company
+
+    def handle(self, *args, **options):
+        company = self.get_company(options['company'])
+        factory, renderer = APIRequestFactory(SERVER_NAME='localhost'), FastJSONRenderer()
+        failed = False
+        for name, model, serializer_class, variants in LISTS:
+            pks = list(model.objects.filter(company=company).order_by('-id').values_list('pk', flat=True)[:options['limit']])
+            for params in variants:
+                request = factory.get('/', params)
+                queryset = serializer_class.prune(model.objects.filter(pk__in=pks).order_by('-id'), request)
+
+                def serialize():
+                    return serializer_class(queryset.all(), many=True, context={'request': request}).data
+
+                def projected():
+                    return project(serializer_class(queryset.all(), many=True, context={'request': request}))
+
+                expected, actual = renderer.render(serialize()), renderer.render(projected())
+                label = f"{name} {'?' + '&'.join(f'{key}={value}' for key, value in params.items()) if params else '(전체 필드)'}"
+                if expected != actual:
+                    failed = True
+                    self.stdout.write(self.style.ERROR(f"{label}: Serializer와 읽기 모델의 응답이 다릅니다."))
+                    continue
+                serializer_ms = best_of(serialize, options['repeat'])
+                projection_ms = best_of(projected, options['repeat'])
+                per_row = 1000 / max(len(pks), 1)  # 밀리초 → 행당 마이크로초
+                self.stdout.write(
+                    f"{label}: {len(pks)}행 {len(expected) / 1024:,.0f}KB 응답 동일  "
+                    f"Serializer {serializer_ms:8.2f}ms ({serializer_ms * per_row:6.1f}µs/행)  "
+                    f"읽기 모델 {projection_ms:8.2f}ms ({projection_ms * per_row:6.1f}µs/행)  {serializer_ms / projection_ms:.1f}배"
+                )
+        if failed:
+            raise CommandError("응답이 다른 목록이 있습니다.")
@@ -0,0 +1,90 @@
+import os
+import sqlite3
+import tempfile
+import time
+from multiprocessing import Pool
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+
+# 비교할 연결 설정 (기존 기본 설정 vs settings.SQLITE_PRAGMAS 적용 설정)
+def get_profiles():
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    options = settings.DATABASES['default'].get('OPTIONS', {})
+    return {
+        'default': {
+            'pragmas': {'journal_mode': 'DELETE', 'synchronous': 'FULL'},
+            'timeout': 5,  # Django/sqlite3 기본값
+            'begin': 'BEGIN',  # DEFERRED
+        },
+        'tuned': {
+            'pragmas': {name: pragmas[name] for name in ('journal_mode', 'synchronous', 'busy_timeout', 'mmap_size', 'temp_store') if name in pragmas},
+            'timeout': options.get('timeout', 20),
+            'begin': f"BEGIN {options.get('transaction_mode', 'IMMEDIATE')}",
+        },
+    }
+
+
+def run_writer(args):
+    """
+    워커 프로세스 하나가 운행 기록 저장과 비슷한 트랜잭션(조회 → 삽입 → 차량 갱신)을 반복합니다.
+    반환값: (성공한 트랜잭션 수, 잠금 오류 수)
+    """
+    path, profile, worker, transactions = args
+    connection = sqlite3.connect(path, timeout=profile['timeout'], isolation_level=None)
+    for name, value in profile['pragmas'].items():
+        connection.execute(f'PRAGMA {name} = {value}')
+    committed = locked = 0
+    for i in range(transactions):
+        try:
+            connection.execute(profile['begin'])
+            mileage = connection.execute("SELECT total_mileage FROM vehicle WHERE id = ?", (worker % 10,)).fetchone()[0]
+            connection.execute(
+                "INSERT INTO trip (vehicle_id, departure_mileage, arrival_mileage, coordinates) VALUES (?, ?, ?, ?)",
+                (worker % 10, mileage, mileage + 10, '[[37.5, 127.0]]' * 20),
+            )
+            connection.execute("UPDATE vehicle SET total_mileage = ? WHERE id = ?", (mileage + 10, worker % 10))
+            connection.execute("COMMIT")
+            committed += 1
+        except sqlite3.OperationalError as e:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            if 'locked' not in str(e):
+                raise
+            locked += 1
+    connection.close()
+    return committed, locked
+
+
+class Command(BaseCommand):
+    help = "동시에 여러 프로세스가 운행 기록을 저장하는 상황에서 기본 SQLite 설정과 튜닝된 설정의 처리량을 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8, help="동시에 쓰는 프로세스 수")
+        parser.add_argument('--transactions', type=int, default=200, help="프로세스당 트랜잭션 수")
+
+    def handle(self, *args, **options):
+        writers, transactions = options['writers'], options['transactions']
+        self.stdout.write(f"프로세스 {writers}개 × 트랜잭션 {transactions}개")
+
+        for name, profile in get_profiles().items():
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'bench.sqlite3')
+                connection = sqlite3.connect(path)
+                connection.execute("CREATE TABLE vehicle (id INTEGER PRIMARY KEY, total_mileage INTEGER NOT NULL)")
+                connection.execute("CREATE TABLE trip (id INTEGER PRIMARY KEY, vehicle_id INTEGER, departure_mileage INTEGER, arrival_mileage INTEGER, coordinates TEXT)")
+                connection.executemany("INSERT INTO vehicle VALUES (?, 0)", [(i,) for i in range(10)])
+                connection.commit()
+                connection.close()
+
+                started = time.perf_counter()
+                with Pool(writers) as pool:
+                    results = pool.map(run_writer, [(path, profile, worker, transactions) for worker in range(writers)])
+                elapsed = time.perf_counter() - started
+
+            committed = sum(result[0] for result in results)
+            locked = sum(result[1] for result in results)
+            self.stdout.write(
+                f"{name:>8}: 커밋 {committed}건, 잠금 오류 {locked}건, {elapsed:.2f}초, {committed / elapsed:,.0f} 트랜잭션/초"
+            )
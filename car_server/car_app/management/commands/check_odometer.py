@@ -0,0 +1,25 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from car_app.odometer import run
+
+
+
+class Command(BaseCommand):
+    help = (
+        "차량별 운행 기록 사이의 주행거리 누락/역행과 운행 시간 겹침을 점검해 이상 목록을 갱신합니다. "
+        "이전 점검 이후 운행 기록이 생성/수정/삭제된 차량만 다시 점검합니다. (cron 등으로 주기적으로 실행)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="전체 차량을 다시 점검")
+        parser.add_argument('--batch-size', type=int, help="이상 저장 및 차량 ID 조건을 나누는 단위. 기본값은 settings.ODOMETER_CHECK['BATCH_SIZE']")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] is not None and options['batch_size'] < 1:
+            raise CommandError("--batch-size는 1 이상이어야 합니다.")
+        started = time.perf_counter()
+        result = run(full=options['full'], batch_size=options['batch_size'])
+        scope = "전체 차량" if result.full else f"변경된 차량 {result.vehicles}대"
+        self.stdout.write(self.style.SUCCESS(
+            f"주행거리 점검을 완료했습니다. (점검 대상: {scope}, 이상: {result.anomalies}건, {time.perf_counter() - started:.2f}초)"
+        ))
@@ -0,0 +1,291 @@
+import io
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F, Max
+from car_app.models import Company, CustomUser, Notice, Vehicle, DrivingRecord, Maintenance, Expense
+
+
+
+# 가상 데이터 생성에 사용하는 값
+CITIES = [  # (지명, 위도, 경도)
+    ('서울', 37.5665, 126.9780), ('인천', 37.4563, 126.7052), ('수원', 37.2636, 127.0286), ('성남', 37.4201, 127.1262),
+    ('대전', 36.3504, 127.3845), ('세종', 36.4800, 127.2890), ('청주', 36.6424, 127.4890), ('천안', 36.8151, 127.1139),
+    ('대구', 35.8714, 128.6014), ('부산', 35.1796, 129.0756), ('울산', 35.5384, 129.3114), ('광주', 35.1595, 126.8526),
+    ('전주', 35.8242, 127.1480), ('강릉', 37.7519, 128.8761), ('춘천', 37.8813, 127.7298), ('포항', 36.0190, 129.3435),
+]
+VEHICLE_TYPES = {  # 차량 카테고리 -> 차종 목록
+    '내연기관': ['K3', 'K5', 'K8', '아반떼', '소나타', '그랜저', '스타리아', '포터', '봉고'],
+    '전기차': ['아이오닉5', '아이오닉6', 'EV6', '코나EV', '니로EV'],
+    '수소차': ['넥쏘'],
+}
+SURNAMES = '김이박최정강조윤장임한오서신권황안송전홍'
+GIVEN_NAME_SYLLABLES = '민서준지현우예도하은수연윤재영진성호유경'
+DEPARTMENTS = ['영업팀', '물류팀', '총무팀', '기술지원팀', '마케팅팀', '구매팀']
+POSITIONS = ['사원', '주임', '대리', '과장', '차장', '부장']
+PLATE_SYLLABLES = '가나다라마거너더러머버서어저고노도로모보소오조구누두루무부수우주'
+MAINTENANCE_INTERVALS = {  # 부품 -> (교체 주기 km, 정비 유형, 비용 범위)
+    'engine_oil_filter': (10000, Maintenance.ENGINE_OIL_CHANGE, (60000, 120000)),
+    'aircon_filter': (15000, Maintenance.AIR_FILTER_CHANGE, (20000, 40000)),
+    'brake_pad': (40000, Maintenance.BRAKE_PAD_CHANGE, (150000, 300000)),
+    'tire': (50000, Maintenance.TIRE_CHANGE, (400000, 800000)),
+}
+NOTICE_TOPICS = [
+    ('차량 정기 점검 안내', '이번 달 정기 점검 일정입니다. 엔진 오일과 타이어 상태를 확인해 주세요.'),
+    ('운행 기록 작성 안내', '운행 종료 후 도착 주행거리와 유류비를 반드시 입력해 주세요.'),
+    ('법인카드 사용 안내', '유류비와 통행료는 법인카드로 결제하고 영수증을 첨부해 주세요.'),
+    ('안전 운전 캠페인', '졸음 운전 예방을 위해 2시간마다 휴식을 취해 주세요.'),
+    ('전기차 충전 안내', '사옥 지하 2층 충전기 사용 시간을 확인해 주세요.'),
+    ('과태료 납부 안내', '미납 과태료가 있는 경우 이번 주 안에 납부해 주세요.'),
+]
+
+
+
+class Command(BaseCommand):
+    help = "성능 측정용 가상 데이터(회사, 사용자, 차량, GPS 좌표가 포함된 다년간 운행 기록, 정비 기록, 지출 내역, 공지사항)를 생성합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, default=3, help="생성할 회사 수")
+        parser.add_argument('--users', type=int, default=50, help="회사별 사용자 수 (관리자 1명 포함)")
+        parser.add_argument('--vehicles', type=int, default=20, help="회사별 차량 수")
+        parser.add_argument('--years', type=float, default=2, help="운행 기록 기간 (년, 오늘 기준 과거)")
+        parser.add_argument('--trips-per-day', type=float, default=1.5, help="차량별 평일 하루 평균 운행 횟수")
+        parser.add_argument('--points', type=int, default=30, help="운행 기록별 GPS 좌표 수")
+        parser.add_argument('--notices', type=int, default=30, help="회사별 공지사항 수")
+        parser.add_argument('--password', default='fleet-pass-1234', help="생성된 모든 사용자의 비밀번호")
+        parser.add_argument('--batch-size', type=int, default=5000, help="bulk_create 한 번에 모아서 저장할 행 수")
+        parser.add_argument('--seed', type=int, default=None, help="난수 시드 (같은 값이면 같은 데이터 생성)")
+
+    def handle(self, *args, **options):
+        if options['companies'] < 1 or options['users'] < 1 or options['vehicles'] < 1:
+            raise CommandError("회사, 사용자, 차량 수는 1 이상이어야 합니다.")
+        self.random = random.Random(options['seed'])
+        self.options = options
+        self.batch_size = options['batch_size']
+        self.password_hash = make_password(options['password'])  # 모든 사용자가 같은 해시를 사용 (해싱 비용 절약)
+        self.run_id = uuid.uuid4().hex[:6]  # 여러 번 실행해도 이메일 등 고유값이 겹치지 않도록 실행마다 다른 값 사용
+        self.end = datetime.now(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+        self.start = self.end - timedelta(days=int(options['years'] * 365))
+
+        # 고유값(이메일, 전화번호, 차량 번호)이 기존 데이터와 겹치지 않도록 현재 최대 ID 다음부터 번호 부여
+        self.next_user_number = (CustomUser.objects.aggregate(value=Max('id'))['value'] or 0) + 1
+        self.next_vehicle_number = (Vehicle.objects.aggregate(value=Max('id'))['value'] or 0) + 1
+
+        started = time.perf_counter()
+        totals = {'users': 0, 'vehicles': 0, 'records': 0, 'maintenances': 0, 'expenses': 0, 'notices': 0}
+        for index in range(options['companies']):
+            company_started = time.perf_counter()
+            with transaction.atomic():
+                counts = self.generate_company(index)
+            business_registration_number = counts.pop('business_registration_number')
+            call_command('rebuild_driving_stats', company=business_registration_number, stdout=io.StringIO())  # 사용자 누적/월간 운행 통계 계산
+            call_command('rebuild_fuel_stats', company=business_registration_number, stdout=io.StringIO())  # 차량별 월간 유류비 통계 계산
+            call_command('rebuild_locations', company=business_registration_number, stdout=io.StringIO())  # 출발지/도착지 장소 사전과 운행 기록의 장소 ID 계산
+            for key, value in counts.items():
+                totals[key] += value
+            self.stdout.write(
+                f"회사 {index + 1}/{options['companies']}: 운행 기록 {counts['records']:,}건, 정비 기록 {counts['maintenances']:,}건, "
+                f"지출 내역 {counts['expenses']:,}건 ({time.perf_counter() - company_started:.1f}초)"
+            )
+
+        elapsed = time.perf_counter() - started
+        rows = sum(totals.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"사용자 {totals['users']:,}명, 차량 {totals['vehicles']:,}대, 운행 기록 {totals['records']:,}건, "
+            f"정비 기록 {totals['maintenances']:,}건, 지출 내역 {totals['expenses']:,}건, 공지사항 {totals['notices']:,}건을 "
+            f"{elapsed:.1f}초 동안 생성했습니다. ({rows / elapsed:,.0f}행/초)"
+        ))
+        self.stdout.write(f"관리자 계정: fleet-admin-{self.run_id}-1@example.com / 비밀번호: {options['password']}")
+
+    def generate_company(self, index):
+        rng, options = self.random, self.options
+        company = Company.objects.create(
+            name=f"가상운수{index + 1}-{self.run_id}"[:30],
+            business_registration_number=f"SYN-{self.run_id}-{index + 1}",
+            address=f"{rng.choice(CITIES)[0]}시 가상로 {rng.randint(1, 300)}",
+        )
+        users = CustomUser.objects.bulk_create([self.make_user(company, index, number) for number in range(options['users'])], batch_size=self.batch_size)
+        admin, drivers = users[0], users[1:] or users
+        vehicles = Vehicle.objects.bulk_create([self.make_vehicle(company) for _ in range(options['vehicles'])], batch_size=self.batch_size)
+
+        notices = Notice.objects.bulk_create([
+            Notice(company=company, created_by=admin, title=f"{title} ({number + 1})", content=content)
+            for number, (title, content) in enumerate(rng.choice(NOTICE_TOPICS) for _ in range(options['notices']))
+        ], batch_size=self.batch_size)
+
+        counts = {'business_registration_number': company.business_registration_number, 'users': len(users), 'vehicles': len(vehicles),
+                  'records': 0, 'maintenances': 0, 'expenses': 0, 'notices': len(notices)}
+        records, maintenances, expenses = [], [], []
+        for vehicle in vehicles:
+            main_driver = rng.choice(drivers)  # 차량마다 주로 운행하는 사용자
+            for record, maintenance, expense in self.make_trips(vehicle, main_driver, drivers):
+                records.append(record)
+                if maintenance:
+                    maintenances.extend(maintenance)
+                if expense:
+                    expenses.append(expense)
+            if len(records) >= self.batch_size:
+                counts['records'] += self.flush(DrivingRecord, records)
+            if len(maintenances) >= self.batch_size:
+                counts['maintenances'] += self.flush(Maintenance, maintenances)
+            if len(expenses) >= self.batch_size:
+                counts['expenses'] += self.flush(Expense, expenses)
+        counts['records'] += self.flush(DrivingRecord, records)
+        counts['maintenances'] += self.flush(Maintenance, maintenances)
+        counts['expenses'] += self.flush(Expense, expenses)
+
+        # bulk_create는 auto_now_add로 현재 시각을 저장하므로 생성 일시를 실제 도착 시간으로 맞춤
+        DrivingRecord.objects.filter(company=company).update(created_at=F('arrival_time'))
+        Vehicle.objects.bulk_update(vehicles, [
+            'total_mileage', 'last_user', 'last_used_date', 'engine_oil_filter', 'aircon_filter', 'brake_pad', 'tire'
+        ], batch_size=self.batch_size)
+        return counts
+
+    def flush(self, model, rows):
+        model.objects.bulk_create(rows, batch_size=self.batch_size)
+        count = len(rows)
+        rows.clear()
+        return count
+
+    def make_user(self, company, company_index, number):
+        rng = self.random
+        serial = self.next_user_number
+        self.next_user_number += 1
+        is_admin = number == 0
+        email = f"fleet-admin-{self.run_id}-{company_index + 1}@example.com" if is_admin else f"driver{serial}-{self.run_id}@example.com"
+        return CustomUser(
+            email=email,
+            phone_number=f"010-{self.run_id}-{serial:08d}",
+            password=self.password_hash,
+            name=rng.choice(SURNAMES) + ''.join(rng.choices(GIVEN_NAME_SYLLABLES, k=2)),
+            department=rng.choice(DEPARTMENTS),
+            position='부장' if is_admin else rng.choice(POSITIONS),
+            company=company,
+            is_admin=is_admin,
+            is_banned=not is_admin and rng.random() < 0.02,
+        )
+
+    def make_vehicle(self, company):
+        rng = self.random
+        serial = self.next_vehicle_number
+        self.next_vehicle_number += 1
+        category = rng.choices(list(VEHICLE_TYPES), weights=[80, 18, 2])[0]
+        purchase_date = (self.start - timedelta(days=rng.randint(0, 1500))).date()
+        purchase_type = rng.choices(['매매', '리스', '렌트'], weights=[60, 30, 10])[0]
+        return Vehicle(
+            vehicle_category=category,
+            vehicle_type=rng.choice(VEHICLE_TYPES[category]),
+            car_registration_number=f"R{serial:09d}",
+            license_plate_number=f"{serial // 10000 % 1000:03d}{PLATE_SYLLABLES[serial // 10000000 % len(PLATE_SYLLABLES)]}{serial % 10000:04d}",
+            purchase_date=purchase_date,
+            purchase_price=Decimal(rng.randrange(20000000, 60000000, 10000)),
+            total_mileage=rng.randint(0, 30000),  # 구매 후 운행 기록 기간 이전의 주행 거리
+            company=company,
+            purchase_type=purchase_type,
+            down_payment=Decimal(rng.randrange(1000000, 5000000, 10000)) if purchase_type != '매매' else None,
+            deposit=Decimal(rng.randrange(1000000, 10000000, 10000)) if purchase_type != '매매' else None,
+            expiration_date=purchase_date + timedelta(days=365 * 4) if purchase_type != '매매' else None,
+        )
+
+    def make_trips(self, vehicle, main_driver, drivers):
+        """
+        차량 하나의 운행 기록을 날짜 순서대로 생성합니다. 누적 주행거리는 운행마다 이어지고,
+        부품 교체 주기를 넘으면 정비 기록을 함께 생성합니다. (운행 기록, 정비 기록 목록, 지출 내역)을 반환합니다.
+        """
+        rng, options = self.random, self.options
+        mileage = vehicle.total_mileage
+        usage = {component: rng.randint(0, interval) for component, (interval, _, _) in MAINTENANCE_INTERVALS.items()}
+        location = rng.choice(CITIES)
+        day = self.start
+        while day < self.end:
+            weekday_rate = options['trips_per_day'] if day.weekday() < 5 else options['trips_per_day'] * 0.2
+            trips = int(weekday_rate) + (rng.random() < weekday_rate % 1)
+            departure = day + timedelta(hours=rng.randint(6, 9), minutes=rng.randint(0, 59))
+            for _ in range(trips):
+                user = main_driver if rng.random() < 0.7 else rng.choice(drivers)
+                destination = rng.choice(CITIES) if rng.random() < 0.3 else location  # 대부분 시내 운행
+                distance = rng.randint(5, 60) if destination is location else rng.randint(60, 400)
+                driving_time = timedelta(minutes=int(distance / rng.uniform(30, 80) * 60) + rng.randint(5, 20))
+                arrival = departure + driving_time
+                fuel_cost = Decimal(distance * rng.randint(120, 180)) if rng.random() < 0.3 else None
+                toll_fee = Decimal(rng.randrange(1000, 20000, 100)) if destination is not location else None
+                total_cost = (fuel_cost or 0) + (toll_fee or 0)
+                record = DrivingRecord(
+                    vehicle=vehicle,
+                    company_id=vehicle.company_id,  # bulk_create는 save()를 거치지 않으므로 직접 설정
+                    user=user,
+                    departure_location=location[0],
+                    arrival_location=destination[0],
+                    departure_mileage=mileage,
+                    arrival_mileage=mileage + distance,
+                    driving_distance=distance,
+                    departure_time=departure,
+                    arrival_time=arrival,
+                    driving_time=driving_time,
+                    coordinates=self.make_route(location, destination, options['points']),
+                    fuel_cost=fuel_cost,
+                    toll_fee=toll_fee,
+                    total_cost=total_cost,
+                    driving_purpose=rng.choices(
+                        [DrivingRecord.BUSINESS, DrivingRecord.COMMUTING, DrivingRecord.NON_BUSINESS], weights=[70, 25, 5]
+                    )[0],
+                )
+                mileage += distance
+
+                maintenance = []
+                for component, (interval, maintenance_type, (low, high)) in MAINTENANCE_INTERVALS.items():
+                    usage[component] += distance
+                    if usage[component] >= interval:
+                        usage[component] = 0
+                        maintenance.append(Maintenance(
+                            vehicle=vehicle,
+                            company_id=vehicle.company_id,
+                            maintenance_date=(arrival + timedelta(days=rng.randint(0, 3))).date(),
+                            maintenance_type=maintenance_type,
+                            maintenance_cost=Decimal(rng.randrange(low, high, 1000)),
+                            maintenance_description=f"{mileage:,}km 주기 정비",
+                        ))
+
+                expense = None
+                if fuel_cost:
+                    age = (self.end - arrival).days
+                    expense = Expense(
+                        expense_type=Expense.EXPENSE,
+                        expense_date=arrival.date(),
+                        status=Expense.PENDING if age < 14 else rng.choices([Expense.APPROVED, Expense.REJECTED], weights=[95, 5])[0],
+                        user=user,
+                        vehicle=vehicle,
+                        company_id=vehicle.company_id,
+                        details='유류비',
+                        amount=fuel_cost,
+                    )
+                yield record, maintenance, expense
+
+                vehicle.last_user, vehicle.last_used_date = user, arrival.date()
+                location = destination
+                departure = arrival + timedelta(minutes=rng.randint(10, 180))
+            day += timedelta(days=1)
+
+        vehicle.total_mileage = mileage
+        for component, value in usage.items():
+            setattr(vehicle, component, value)
+
+    def make_route(self, origin, destination, points):
+        """
+        출발지에서 도착지까지 이동하는 GPS 좌표 목록을 생성합니다. (시내 운행은 출발지 주변을 이동)
+        """
+        rng = self.random
+        lat, lng = origin[1] + rng.uniform(-0.05, 0.05), origin[2] + rng.uniform(-0.05, 0.05)
+        end_lat, end_lng = destination[1] + rng.uniform(-0.05, 0.05), destination[2] + rng.uniform(-0.05, 0.05)
+        noise = rng.random
+        step_lat, step_lng = (end_lat - lat) / max(points - 1, 1), (end_lng - lng) / max(points - 1, 1)
+        return [
+            [round(lat + step_lat * step + (noise() - 0.5) * 0.004, 6), round(lng + step_lng * step + (noise() - 0.5) * 0.004, 6)]
+            for step in range(points)
+        ]
@@ -0,0 +1,40 @@
+import os
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from car_app.models import Company
+from car_app.user_import import read_user_csv, import_users
+
+
+
+class Command(BaseCommand):
+    help = "CSV 파일로 회사의 일반 사용자를 일괄 등록합니다. (컬럼: email, phone_number, name, password, department, position)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', help="사용자 목록 CSV 파일 경로")
+        parser.add_argument('--company', required=True, help="사용자를 등록할 회사의 사업자 등록 번호")
+        parser.add_argument('--workers', type=int, default=None, help="비밀번호 해싱에 사용할 프로세스 수 (기본값: CPU 코어 수)")
+        parser.add_argument('--dry-run', action='store_true', help="저장하지 않고 검증 결과만 출력")
+
+    def handle(self, *args, **options):
+        try:
+            company = Company.objects.get(business_registration_number=options['company'])
+        except Company.DoesNotExist:
+            raise CommandError(f"사업자 등록 번호 {options['company']}에 해당하는 회사가 없습니다.")
+
+        try:
+            with open(options['csv_path'], 'rb') as file:
+                rows = read_user_csv(file)
+        except OSError as e:
+            raise CommandError(f"CSV 파일을 열 수 없습니다: {e}")
+        except ValidationError as e:
+            raise CommandError(' '.join(e.messages))
+
+        result = import_users(company, rows, workers=options['workers'] or os.cpu_count() or 1, dry_run=options['dry_run'])
+
+        for error in result['errors']:
+            messages = '; '.join(f"{field}: {' '.join(errors)}" for field, errors in error['errors'].items())
+            self.stderr.write(f"{error['row']}행 ({error['email']}): {messages}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"전체 {len(rows)}행 중 {len(result['created'])}명 등록, {len(result['errors'])}행 실패"
+        ))
@@ -0,0 +1,53 @@
+import asyncio
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import RefreshToken
+from car_app.benchmark import run_load
+from car_app.models import CustomUser, Vehicle, Notice, DrivingRecord
+
+
+
+class Command(BaseCommand):
+    help = "ASGI 애플리케이션에 동시 요청을 보내 동기 조회 API와 비동기 조회 API(/api/async/...)의 처리량과 지연 시간을 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--email', help="요청에 사용할 사용자 이메일 (기본값: 첫 번째 관리자)")
+        parser.add_argument('--concurrency', type=int, default=50, help="동시 연결 수")
+        parser.add_argument('--requests', type=int, default=500, help="API별 총 요청 수")
+
+    def get_paths(self, user):
+        # (이름, 동기 API 경로, 비동기 API 경로)
+        paths = [
+            ('current-user', '/api/users/me/', '/api/async/users/me/'),
+            ('vehicle-list', '/api/vehicles/', '/api/async/vehicles/'),
+            ('notice-list', '/api/notices/all/', '/api/async/notices/all/'),
+        ]
+        vehicle = Vehicle.objects.filter(company=user.company).first()
+        if vehicle:
+            paths.append(('vehicle-detail', f'/api/vehicles/{vehicle.id}/', f'/api/async/vehicles/{vehicle.id}/'))
+        notice = Notice.objects.filter(company=user.company).first()
+        if notice:
+            paths.append(('notice-detail', f'/api/notices/{notice.id}/', f'/api/async/notices/{notice.id}/'))
+        record = DrivingRecord.objects.filter(company=user.company).first()
+        if record:
+            paths.append(('driving-record-detail', f'/api/driving-records/{record.id}/', f'/api/async/driving-records/{record.id}/'))
+        return paths
+
+    def handle(self, *args, **options):
+        users = CustomUser.objects.filter(email=options['email']) if options['email'] else CustomUser.objects.filter(is_admin=True)
+        user = users.select_related('company').order_by('id').first()
+        if user is None:
+            raise CommandError("요청에 사용할 사용자가 없습니다. 데이터를 먼저 등록해 주세요.")
+
+        headers = {'Authorization': f'Bearer {RefreshToken.for_user(user).access_token}'}
+        app = get_asgi_application()
+        concurrency, requests = options['concurrency'], options['requests']
+        self.stdout.write(f"사용자 {user.email}, 동시 연결 {concurrency}개, API별 요청 {requests}개")
+        self.stdout.write(f"{'API':<24}{'종류':<6}{'요청/초':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'오류':>6}")
+
+        for name, sync_path, async_path in self.get_paths(user):
+            for kind, path in (('sync', sync_path), ('async', async_path)):
+                result = asyncio.run(run_load(app, path, headers=headers, concurrency=concurrency, requests=requests))
+                self.stdout.write(
+                    f"{name:<24}{kind:<6}{result['throughput']:>10}{result['p50_ms']:>10}{result['p95_ms']:>10}{result['p99_ms']:>10}{result['errors']:>6}"
+                )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+from car_app.idempotency import purge_expired
+
+
+
+class Command(BaseCommand):
+    help = "만료된 Idempotency-Key와 저장된 응답을 삭제합니다. (cron 등으로 주기적으로 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help="한 번에 삭제할 행 수")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size는 1 이상이어야 합니다.")
+        count = purge_expired(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"만료된 Idempotency-Key {count}건을 삭제했습니다."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+from car_app.sync import purge_tombstones
+
+
+
+class Command(BaseCommand):
+    help = "동기화 API의 삭제 기록(Tombstone) 중 보관 기간이 지난 기록을 삭제합니다. (cron 등으로 주기적으로 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help="보관 기간(일). 기본값은 settings.SYNC['TOMBSTONE_RETENTION_DAYS']")
+
+    def handle(self, *args, **options):
+        if options['days'] is not None and options['days'] < 1:
+            raise CommandError("--days는 1 이상이어야 합니다.")
+        count = purge_tombstones(options['days'])
+        self.stdout.write(self.style.SUCCESS(f"삭제 기록 {count}건을 삭제했습니다."))
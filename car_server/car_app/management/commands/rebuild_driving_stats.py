@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+from car_app.models import Company, CustomUser, DrivingRecord, UserDrivingStat
+
+
+
+class Command(BaseCommand):
+    help = "운행 기록(DrivingRecord)으로부터 사용자별 누적/월간 운행 통계를 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company', help="특정 회사(사업자 등록 번호)의 사용자만 다시 계산")
+
+    def handle(self, *args, **options):
+        users = CustomUser.objects.all()
+        records = DrivingRecord.objects.all()
+        if options['company']:
+            try:
+                company = Company.objects.get(business_registration_number=options['company'])
+            except Company.DoesNotExist:
+                raise CommandError(f"사업자 등록 번호 {options['company']}에 해당하는 회사가 없습니다.")
+            users = users.filter(company=company)
+            records = records.filter(user__company=company)
+
+        # 사용자별 누적 통계
+        totals = {
+            row['user_id']: row
+            for row in records.values('user_id').annotate(
+                distance=Sum('driving_distance'), trips=Count('id'), cost=Sum('total_cost')
+            )
+        }
+        # 사용자별 월간 통계 (출발 시간 기준)
+        monthly = records.annotate(month=TruncMonth('departure_time')).values('user_id', 'month').annotate(
+            distance=Sum('driving_distance'), trips=Count('id'), cost=Sum('total_cost')
+        )
+
+        with transaction.atomic():
+            user_list = list(users.only('id', 'usage_distance', 'trip_count', 'total_driving_cost', 'updated_at'))
+            now = timezone.now()
+            for user in user_list:
+                row = totals.get(user.id, {})
+                rebuilt = (row.get('distance') or 0, row.get('trips') or 0, row.get('cost') or 0)
+                if rebuilt != (user.usage_distance, user.trip_count, user.total_driving_cost):
+                    user.usage_distance, user.trip_count, user.total_driving_cost = rebuilt
+                    user.updated_at = now  # 값이 바뀐 사용자만 동기화 대상으로 표시 (bulk_update는 auto_now를 적용하지 않음)
+            CustomUser.objects.bulk_update(user_list, ['usage_distance', 'trip_count', 'total_driving_cost', 'updated_at'], batch_size=500)
+
+            UserDrivingStat.objects.filter(user__in=users).delete()
+            stats = UserDrivingStat.objects.bulk_create([
+                UserDrivingStat(
+                    user_id=row['user_id'],
+                    month=row['month'].date(),
+                    driving_distance=row['distance'] or 0,
+                    trip_count=row['trips'],
+                    total_cost=row['cost'] or 0,
+                )
+                for row in monthly
+            ], batch_size=500)
+
+        self.stdout.write(self.style.SUCCESS(f"사용자 {len(user_list)}명, 월간 통계 {len(stats)}건을 다시 계산했습니다."))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+from car_app.models import Company, DrivingRecord, VehicleFuelStat
+
+
+
+class Command(BaseCommand):
+    help = "운행 기록(DrivingRecord)으로부터 차량별 월간 유류비 통계(연비 분석)를 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company', help="특정 회사(사업자 등록 번호)의 차량만 다시 계산")
+
+    def handle(self, *args, **options):
+        records = DrivingRecord.objects.all()
+        stats = VehicleFuelStat.objects.all()
+        if options['company']:
+            try:
+                company = Company.objects.get(business_registration_number=options['company'])
+            except Company.DoesNotExist:
+                raise CommandError(f"사업자 등록 번호 {options['company']}에 해당하는 회사가 없습니다.")
+            records = records.filter(company=company)
+            stats = stats.filter(company=company)
+
+        # 차량별 월간 통계 (출발 시간 기준)
+        monthly = records.annotate(month=TruncMonth('departure_time')).values('vehicle_id', 'company_id', 'month').annotate(
+            distance=Sum('driving_distance'), fuel=Sum('fuel_cost'), trips=Count('id')
+        ).order_by()
+
+        with transaction.atomic():
+            stats.delete()
+            created = VehicleFuelStat.objects.bulk_create([
+                VehicleFuelStat(
+                    vehicle_id=row['vehicle_id'],
+                    company_id=row['company_id'],
+                    month=row['month'].date(),
+                    driving_distance=row['distance'] or 0,
+                    fuel_cost=row['fuel'] or 0,
+                    trip_count=row['trips'],
+                )
+                for row in monthly
+            ], batch_size=500)
+
+        self.stdout.write(self.style.SUCCESS(f"차량별 월간 유류비 통계 {len(created)}건을 다시 계산했습니다."))
@@ -0,0 +1,57 @@
+from collections import Counter, defaultdict
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+from car_app.models import Company, DrivingRecord, Location
+
+
+
+class Command(BaseCommand):
+    help = "운행 기록의 출발지/도착지로 회사별 장소 사전을 다시 만들고, 운행 기록의 장소 ID와 장소별 사용 횟수를 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company', help="특정 회사(사업자 등록 번호)의 장소 사전만 다시 생성")
+        parser.add_argument('--batch-size', type=int, default=1000, help="bulk_create 한 번에 저장할 장소 수")
+
+    def handle(self, *args, **options):
+        companies = Company.objects.all()
+        if options['company']:
+            companies = companies.filter(business_registration_number=options['company'])
+            if not companies.exists():
+                raise CommandError(f"사업자 등록 번호 {options['company']}에 해당하는 회사가 없습니다.")
+        for company in companies:
+            locations, records = self.rebuild(company, options['batch_size'])
+            self.stdout.write(f"{company.name}: 장소 {locations}개, 운행 기록 {records}건 갱신")
+        self.stdout.write(self.style.SUCCESS("장소 사전을 다시 만들었습니다."))
+
+    def rebuild(self, company, batch_size):
+        records = DrivingRecord.objects.filter(company=company)
+        counts = Counter()
+        raw_names = {'departure': defaultdict(list), 'arrival': defaultdict(list)}  # 정리한 이름 → 운행 기록에 입력된 이름 목록
+        for field in raw_names:
+            for row in records.values(f'{field}_location').annotate(count=Count('id')).order_by():
+                name = Location.clean_name(row[f'{field}_location'])
+                if Location.is_internable(name):  # 빈 이름, 운행 기록 나누기로 생성된 좌표 이름 제외
+                    counts[name] += row['count']
+                    raw_names[field][name].append(row[f'{field}_location'])
+
+        updated = 0
+        with transaction.atomic():
+            # 이전에 등록된 좌표 이름 삭제 (운행 기록의 장소 ID는 SET_NULL)
+            Location.objects.filter(company=company, pk__in=[
+                pk for pk, name in Location.objects.filter(company=company).values_list('pk', 'name') if not Location.is_internable(name)
+            ]).delete()
+            # 사용 횟수는 운행 기록에서 다시 계산 (삭제된 운행 기록의 사용 횟수 제거)
+            Location.objects.filter(company=company).update(usage_count=0)
+            Location.objects.bulk_create(
+                [Location(company=company, name=name, usage_count=count) for name, count in counts.items()],
+                batch_size=batch_size, update_conflicts=True, unique_fields=['company', 'name'], update_fields=['usage_count'],
+            )
+            ids = dict(Location.objects.filter(company=company).values_list('name', 'pk'))
+            for field, groups in raw_names.items():
+                for name, raws in groups.items():
+                    # 장소 ID는 응답에 포함되지 않으므로 동기화용 updated_at은 갱신하지 않음
+                    updated += records.filter(**{f'{field}_location__in': raws}).exclude(**{f'{field}_place_id': ids[name]}).update(
+                        **{f'{field}_place_id': ids[name]}
+                    )
+        return len(counts), updated
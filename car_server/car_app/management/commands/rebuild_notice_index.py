@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from car_app.search import ensure_notice_index
+
+
+
+class Command(BaseCommand):
+    help = "공지사항 전문 검색(FTS5) 색인을 다시 구축합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help="색인을 구축할 DB alias")
+
+    def handle(self, *args, **options):
+        if ensure_notice_index(using=options['database'], rebuild=True):
+            self.stdout.write(self.style.SUCCESS("공지사항 전문 검색 색인을 다시 구축했습니다."))
+        else:
+            self.stdout.write("FTS5를 사용할 수 없는 DB입니다. 공지사항 검색은 LIKE 검색으로 동작합니다.")
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from car_app.models import Task
+from car_app.tasks import Worker, get_config
+
+
+
+class Command(BaseCommand):
+    help = "백그라운드 작업 큐의 작업을 처리하는 워커를 실행합니다. (여러 프로세스를 함께 실행할 수 있음)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--burst', action='store_true', help="대기 중인 작업을 모두 처리하면 종료합니다.")
+        parser.add_argument('--worker-id', help="워커 이름 (기본값: 호스트명:PID)")
+        parser.add_argument('--retry-failed', action='store_true', help="실패한 작업을 다시 대기 상태로 돌린 뒤 실행합니다.")
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            count = Task.objects.filter(status=Task.FAILED).update(
+                status=Task.PENDING, attempts=0, run_at=timezone.now(), finished_at=None
+            )
+            self.stdout.write(f"실패한 작업 {count}건을 다시 대기 상태로 돌렸습니다.")
+
+        if get_config()['ALWAYS_EAGER']:
+            self.stderr.write(self.style.WARNING(
+                "TASK_QUEUE['ALWAYS_EAGER']가 켜져 있어 새 작업은 요청 처리 중에 바로 실행되고, 이 워커는 실패한 작업의 재시도만 처리합니다. "
+                "운영 환경에서는 API 서버를 TASK_QUEUE_EAGER=false로 실행하세요."
+            ))
+        worker = Worker(worker_id=options['worker_id'])
+        self.stdout.write(f"작업 워커를 시작합니다. ({worker.worker_id})")
+        try:
+            worker.run(burst=options['burst'])
+        except KeyboardInterrupt:
+            self.stdout.write("작업 워커를 종료합니다.")
+            return
+        self.stdout.write(self.style.SUCCESS("대기 중인 작업을 모두 처리했습니다."))
@@ -0,0 +1,64 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from car_app.archive import load_coordinates
+from car_app.models import Company, DrivingRecord
+from car_app.segmentation import apply_suggestions, suggest
+
+
+
+class Command(BaseCommand):
+    help = "운행 시간이 긴 운행 기록을 GPS 좌표의 정차 지점으로 나눈 제안을 출력하고, --apply를 지정하면 운행 기록을 나눕니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company', help="특정 회사(사업자 등록 번호)의 운행 기록만 처리")
+        parser.add_argument('--record', type=int, help="특정 운행 기록 ID만 처리 (--min-hours 무시)")
+        parser.add_argument('--min-hours', type=float, default=4, help="운행 시간이 이 시간 이상인 운행 기록만 처리")
+        parser.add_argument('--radius', type=float, help="정차 반경(미터). 기본값은 settings.TRIP_SEGMENTATION['STOP_RADIUS_METERS']")
+        parser.add_argument('--dwell', type=float, help="정차로 판단할 체류 시간(초). 기본값은 settings.TRIP_SEGMENTATION['DWELL_SECONDS']")
+        parser.add_argument('--min-trip', type=float, help="운행으로 나눌 최소 이동 거리(미터). 기본값은 settings.TRIP_SEGMENTATION['MIN_TRIP_METERS']")
+        parser.add_argument('--batch-size', type=int, default=200, help="한 번에 읽을 운행 기록 수")
+        parser.add_argument('--apply', action='store_true', help="제안대로 운행 기록을 나눕니다. (지정하지 않으면 출력만)")
+
+    def handle(self, *args, **options):
+        records = DrivingRecord.objects.all()
+        if options['record'] is not None:
+            records = records.filter(pk=options['record'])
+        else:
+            records = records.filter(driving_time__gte=timedelta(hours=options['min_hours']))
+        if options['company']:
+            try:
+                company = Company.objects.get(business_registration_number=options['company'])
+            except Company.DoesNotExist:
+                raise CommandError(f"사업자 등록 번호 {options['company']}에 해당하는 회사가 없습니다.")
+            records = records.filter(company=company)
+        thresholds = {name: options[name] for name in ('radius', 'dwell', 'min_trip') if options[name] is not None}
+
+        # 나누면서 새로 생성되는 운행 기록은 처리하지 않도록 대상 ID를 먼저 읽음
+        ids = list(records.order_by('pk').values_list('pk', flat=True))
+        checked = split = created = 0
+        for start in range(0, len(ids), options['batch_size']):
+            for record in DrivingRecord.objects.filter(pk__in=ids[start:start + options['batch_size']]).select_related('vehicle', 'user').order_by('pk'):
+                checked += 1
+                coordinates = load_coordinates(record)
+                try:
+                    suggestions = suggest(record, coordinates, **thresholds)
+                except (ValueError, TypeError, IndexError) as e:
+                    self.stdout.write(self.style.WARNING(f"운행 기록 {record.pk}: 좌표를 읽을 수 없습니다. ({e})"))
+                    continue
+                if len(suggestions) < 2:
+                    continue
+                split += 1
+                self.stdout.write(f"운행 기록 {record.pk} ({record.departure_time:%Y-%m-%d %H:%M} ~ {record.arrival_time:%H:%M}): {len(suggestions)}개 운행")
+                for suggestion in suggestions:
+                    self.stdout.write(
+                        f"  {suggestion['departure_time']:%H:%M} ~ {suggestion['arrival_time']:%H:%M}  "
+                        f"{suggestion['departure_location']} → {suggestion['arrival_location']}  "
+                        f"{suggestion['departure_mileage']} → {suggestion['arrival_mileage']}km (GPS {suggestion['distance_m'] / 1000:.1f}km)"
+                    )
+                if options['apply']:
+                    created += len(apply_suggestions(record, coordinates, suggestions)) - 1
+
+        message = f"운행 기록 {checked}건 중 {split}건을 나눌 수 있습니다."
+        if options['apply']:
+            message = f"운행 기록 {checked}건 중 {split}건을 나누어 운행 기록 {created}건을 새로 생성했습니다."
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,34 @@
+import sqlite3
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from car_app.routers import PRIMARY_ALIAS, REPLICA_ALIAS, replica_configured
+
+
+
+class Command(BaseCommand):
+    help = "원본 SQLite DB를 읽기 전용 복제본(DB_REPLICA_NAME) 파일로 복사합니다. (로컬 복제본 테스트용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0, help="지정하면 해당 간격(초)마다 계속 복사합니다.")
+
+    def handle(self, *args, **options):
+        if not replica_configured():
+            raise CommandError("복제본이 설정되지 않았습니다. 환경 변수 DB_REPLICA_NAME 에 복제본 파일 경로를 지정하세요.")
+        primary, replica = connections[PRIMARY_ALIAS], connections[REPLICA_ALIAS]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError("SQLite DB끼리만 복사할 수 있습니다. 운영 DB는 DB 서버의 복제 기능을 사용하세요.")
+
+        while True:
+            started = time.perf_counter()
+            source = sqlite3.connect(primary.settings_dict['NAME'])
+            target = sqlite3.connect(replica.settings_dict['NAME'])
+            try:
+                source.backup(target)  # 원본 DB를 읽는 중에도 일관된 스냅샷을 복사 (온라인 백업)
+            finally:
+                target.close()
+                source.close()
+            self.stdout.write(f"복제본을 갱신했습니다. ({(time.perf_counter() - started) * 1000:.0f}ms)")
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
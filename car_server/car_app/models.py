@@ -1,7 +1,13 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.db.models import F, Count, Sum, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest, TruncMonth
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
 from datetime import datetime
-import uuid, math
+from .events import publish_event
+from .tasks import enqueue
+import uuid, math, re
 
 
 
@@ -25,11 +31,14 @@ class CustomUser(AbstractUser):
     position = models.CharField(max_length=30, blank=True)  # 직급
     name = models.CharField(max_length=30)  # 이름
     company = models.ForeignKey(Company, on_delete=models.SET_NULL, null=True, blank=True)  # 회사 모델과의 관계 (선택적)
-    usage_distance = models.IntegerField(default=0)  # 사용 거리
+    usage_distance = models.IntegerField(default=0)  # 사용 거리 (운행 기록 저장 시 누적)
+    trip_count = models.PositiveIntegerField(default=0)  # 운행 횟수 (운행 기록 저장 시 누적)
+    total_driving_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)  # 운행 비용 합계 (운행 기록 저장 시 누적)
     unpaid_penalties = models.IntegerField(default=0)  # 미납 과태료
     is_admin = models.BooleanField(default=False)  # 관리자 여부
     is_banned = models.BooleanField(default=False)  # 사용 제한 여부 (ban 유저 여부)
     created_at = models.DateTimeField(auto_now_add=True)  # 생성 일시
+    updated_at = models.DateTimeField(auto_now=True)  # 업데이트 일시 (동기화 API에서 변경 감지)
 
 
 
@@ -37,6 +46,15 @@ class CustomUser(AbstractUser):
     EMAIL_FIELD = 'email'
     USERNAME_FIELD = 'email'  # 기본 로그인 필드를 이메일로 설정
     REQUIRED_FIELDS = ['phone_number', 'name']  # 필수 필드를 지정 (전화번호와 이름)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['company', 'name'], name='user_company_name_idx'),  # 회사별 이름 검색 및 정렬
+            models.Index(fields=['company', 'department'], name='user_company_department_idx'),  # 회사별 부서 필터
+            models.Index(fields=['company', 'position'], name='user_company_position_idx'),  # 회사별 직급 필터
+            models.Index(fields=['company', 'usage_distance'], name='user_company_dist_idx'),  # 회사별 운행 거리 순위
+            models.Index(fields=['company', 'updated_at'], name='user_company_updated_idx'),  # 회사별 변경 내역 동기화
+        ]
     
     def save(self, *args, **kwargs): #django username의 무결성 제약 조건 때문에 만든것. 실제로 사용하지 않음
         if not self.username:
@@ -57,11 +75,143 @@ class Notice(models.Model):
     updated_at = models.DateTimeField(auto_now=True)  # 업데이트 일시
     created_by = models.ForeignKey(CustomUser, on_delete=models.CASCADE)  # 공지사항 작성자 (관리자만)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['company', 'updated_at'], name='notice_company_updated_idx'),  # 회사별 변경 내역 동기화
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        새 공지사항 저장 시 회사 사용자들의 안 읽은 공지사항 수를 늘립니다.
+        """
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                NoticeReadState.notice_created(self)
+                publish_event(self.company_id, 'notice.created', {
+                    "id": self.id,
+                    "title": self.title,
+                    "created_at": self.created_at,
+                    "created_by__name": self.created_by.name,
+                })
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            NoticeReadState.notice_deleted(self)
+            return super().delete(*args, **kwargs)
+
     def __str__(self):
         return self.title
 
 
 
+# 사용자별 공지사항 읽음 상태 모델
+class NoticeReadState(models.Model):
+    """
+    (사용자, 공지사항) 쌍을 모두 저장하지 않고 사용자당 한 행으로 읽음 상태를 표현합니다.
+    - watermark: 회사 공지사항 중 ID가 이 값 이하인 것은 모두 읽음
+    - read_ids: watermark보다 큰 ID 중 먼저 읽은 공지사항 ID 목록 (예외 집합)
+    - unread_count: 안 읽은 공지사항 수 (None이면 다음 조회 시 다시 계산)
+    """
+    user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, primary_key=True, related_name='notice_read_state')  # 사용자 참조
+    watermark = models.BigIntegerField(default=0)  # 이 ID 이하의 공지사항은 모두 읽음
+    read_ids = models.JSONField(default=list)  # watermark 이후에 읽은 공지사항 ID 목록
+    unread_count = models.IntegerField(null=True, blank=True)  # 안 읽은 공지사항 수 (캐시)
+
+    @classmethod
+    def for_user(cls, user, create=True):
+        """
+        사용자의 읽음 상태를 가져오거나, 없으면 새로 만듭니다. (처음에는 회사의 모든 공지사항이 안 읽음)
+        create=False이면 없을 때 저장하지 않은 기본 상태를 반환합니다. (행은 get_unread_count에서 처음 개수를 계산할 때 생성)
+        """
+        if create:
+            state, created = cls.objects.get_or_create(user=user)
+        else:
+            state = cls.objects.filter(user=user).first() or cls(user=user)
+        state.user = user  # 회사 정보 재조회 방지
+        return state
+
+    def notices(self):
+        return Notice.objects.filter(company_id=self.user.company_id)
+
+    def is_read(self, notice_id):
+        return notice_id <= self.watermark or notice_id in self.read_ids
+
+    def get_unread_count(self):
+        """
+        안 읽은 공지사항 수를 반환합니다. 캐시된 값이 있으면 쿼리 없이 반환합니다.
+        읽음 상태 행이 없는 사용자(공지사항을 한 번도 열지 않은 사용자)는 이때 행을 만들어, 다음 조회부터 캐시된 값을 사용합니다.
+        """
+        if self._state.adding:
+            state, _ = NoticeReadState.objects.get_or_create(user_id=self.user_id)  # 동시에 만든 행이 있으면 그 행을 사용
+            self.watermark, self.read_ids, self.unread_count = state.watermark, state.read_ids, state.unread_count
+            self._state.adding = False
+        if self.unread_count is None:
+            self.unread_count = self.notices().filter(id__gt=self.watermark).exclude(id__in=self.read_ids).count()
+            # 그 사이 다른 요청이 계산해 notice_created가 증가시키기 시작한 값은 덮어쓰지 않음
+            NoticeReadState.objects.filter(pk=self.pk, unread_count__isnull=True).update(unread_count=self.unread_count)
+        return self.unread_count
+
+    def mark_read(self, notice):
+        """
+        공지사항을 읽음 처리합니다. 앞쪽 공지사항이 모두 읽힌 경우 watermark를 앞으로 옮겨 예외 집합을 줄입니다.
+        """
+        if self.is_read(notice.id):
+            return False
+        with transaction.atomic():
+            # 다른 요청에서 동시에 읽음 처리한 내용을 덮어쓰지 않도록 잠근 뒤 최신 상태를 다시 읽음
+            current = NoticeReadState.objects.select_for_update().only('watermark', 'read_ids').get(pk=self.pk)
+            self.watermark, self.read_ids = current.watermark, current.read_ids
+            if self.is_read(notice.id):
+                return False
+            read_ids = set(self.read_ids)
+            read_ids.add(notice.id)
+            first_unread = self.notices().filter(id__gt=self.watermark).exclude(id__in=read_ids).order_by('id').values_list('id', flat=True).first()
+            if first_unread is None:
+                self.watermark = max(read_ids)  # watermark 이후 공지사항을 모두 읽음
+            else:
+                self.watermark = max(self.watermark, first_unread - 1)
+            self.read_ids = sorted(notice_id for notice_id in read_ids if notice_id > self.watermark)
+            NoticeReadState.objects.filter(pk=self.pk).update(
+                watermark=self.watermark,
+                read_ids=self.read_ids,
+                unread_count=Greatest(F('unread_count') - 1, 0),
+            )
+        if self.unread_count is not None:
+            self.unread_count = max(self.unread_count - 1, 0)
+        return True
+
+    def mark_all_read(self):
+        """
+        회사의 모든 공지사항을 읽음 처리합니다.
+        watermark(회사의 마지막 공지사항 ID)와 안 읽은 공지사항 수(새 watermark 이후의 공지사항 수)를 한 번의 UPDATE 안에서 서브쿼리로 계산하므로,
+        동시에 생성된 공지사항을 읽음으로 처리하거나 notice_created의 증가를 덮어쓰지 않습니다.
+        """
+        latest = Coalesce(Subquery(self.notices().order_by('-id').values('id')[:1]), 0)
+        unread = self.notices().filter(id__gt=Greatest(OuterRef('watermark'), latest)).order_by().values('company_id').annotate(count=Count('id')).values('count')
+        NoticeReadState.objects.filter(pk=self.pk).update(
+            watermark=Greatest(F('watermark'), latest),
+            read_ids=[],
+            unread_count=Coalesce(Subquery(unread), 0),
+        )
+        self.refresh_from_db(fields=['watermark', 'read_ids', 'unread_count'])
+
+    @classmethod
+    def notice_created(cls, notice):
+        # 같은 회사 사용자들의 안 읽은 공지사항 수를 한 번의 UPDATE로 증가
+        cls.objects.filter(user__company_id=notice.company_id, unread_count__isnull=False).update(unread_count=F('unread_count') + 1)
+
+    @classmethod
+    def notice_deleted(cls, notice):
+        # 삭제된 공지사항을 읽지 않았을 수 있는 사용자는 다음 조회 시 다시 계산
+        cls.objects.filter(user__company_id=notice.company_id, watermark__lt=notice.id).update(unread_count=None)
+
+    def __str__(self):
+        return f'{self.user.email} - 공지사항 읽음 상태'
+
+
+
 # 차량 정보 모델
 class Vehicle(models.Model):
     vehicle_category = models.CharField(max_length=10)  # 차량 카테고리 예: 내연기관, 전기차, 수소차 등
@@ -93,6 +243,41 @@ class Vehicle(models.Model):
     last_used_date = models.DateField(null=True, blank=True)  # 마지막 사용일
     last_user = models.ForeignKey('CustomUser', on_delete=models.SET_NULL, null=True, blank=True, related_name='last_vehicle_user')  # 마지막 사용자
     car_icon = models.FileField(upload_to='car_icon/', null=True, blank=True)  # 영수증 상세 (첨부파일)
+    updated_at = models.DateTimeField(auto_now=True)  # 업데이트 일시 (동기화 API에서 변경 감지)
+    record_deleted_at = models.DateTimeField(null=True, blank=True, editable=False)  # 마지막으로 운행 기록이 삭제된 일시 (주행거리 점검 대상 판단)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['company', 'updated_at'], name='vehicle_company_updated_idx'),  # 회사별 변경 내역 동기화
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('current_status')  # 상태 변경 감지용
+        instance._loaded_company_id = instance.__dict__.get('company_id')  # 회사 변경 감지용
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        차량 현재 상황이 바뀐 경우 회사 구독자들에게 이벤트를 발행합니다.
+        차량의 회사가 바뀐 경우 운행 기록, 정비 기록, 지출 내역, 유류비 통계의 회사도 함께 변경합니다.
+        """
+        super().save(*args, **kwargs)
+        if hasattr(self, '_loaded_company_id') and self._loaded_company_id != self.company_id:
+            for model in (DrivingRecord, Maintenance, Expense):
+                model.objects.filter(vehicle=self).update(company_id=self.company_id, updated_at=timezone.now())
+            VehicleFuelStat.objects.filter(vehicle=self).update(company_id=self.company_id)
+            self._loaded_company_id = self.company_id
+        loaded_status = getattr(self, '_loaded_status', None)
+        if loaded_status is not None and loaded_status != self.current_status:
+            publish_event(self.company_id, 'vehicle.status_changed', {
+                "id": self.id,
+                "license_plate_number": self.license_plate_number,
+                "previous_status": loaded_status,
+                "current_status": self.current_status,
+            })
+        self._loaded_status = self.current_status
 
     def update_total_mileage(self):
         """
@@ -103,6 +288,30 @@ class Vehicle(models.Model):
             self.total_mileage = last_record.arrival_mileage
             self.save()
 
+    @classmethod
+    def add_usage(cls, driving_record):
+        """
+        운행 기록의 주행 거리를 차량 부품 사용량에 더하고, 마지막 사용자와 사용일을 갱신합니다. (백그라운드 작업)
+        F() 표현식으로 갱신하므로 같은 차량의 운행 기록이 동시에 처리되어도 값을 덮어쓰지 않으며,
+        마지막 사용일은 더 최근 운행 기록이 이미 반영된 경우 바꾸지 않습니다.
+        운행 기록 이후에 정비로 초기화된 부품은 더하지 않습니다. (작업이 정비보다 늦게 실행되어도 정비 전 주행 거리가 더해지지 않음)
+        """
+        distance = driving_record.driving_distance
+        vehicle = cls.objects.filter(pk=driving_record.vehicle_id)
+        reset_after = set(Maintenance.objects.filter(
+            vehicle_id=driving_record.vehicle_id,
+            maintenance_type__in=Maintenance.COMPONENT_FIELDS,
+            created_at__gt=driving_record.created_at,
+        ).values_list('maintenance_type', flat=True).distinct())
+        vehicle.update(
+            **{field: F(field) + distance for maintenance_type, field in Maintenance.COMPONENT_FIELDS.items() if maintenance_type not in reset_after},
+            updated_at=timezone.now(),  # update()는 auto_now를 적용하지 않으므로 직접 갱신
+        )
+        used_date = driving_record.created_at.date()
+        vehicle.filter(models.Q(last_used_date__isnull=True) | models.Q(last_used_date__lte=used_date)).update(
+            last_user_id=driving_record.user_id, last_used_date=used_date, updated_at=timezone.now()
+        )
+
     def update_components_usage(self, driving_record):
         """
         운행 기록에서 추가된 주행 거리만큼 각 부품의 사용량을 업데이트합니다.
@@ -118,17 +327,11 @@ class Vehicle(models.Model):
         """
         특정 부품의 사용량을 0으로 초기화합니다. 정비 완료 후 호출할 수 있습니다.
         """
-        if component_type == 'engine_oil_filter':
-            self.engine_oil_filter = 0
-        elif component_type == 'aircon_filter':
-            self.aircon_filter = 0
-        elif component_type == 'brake_pad':
-            self.brake_pad = 0
-        elif component_type == 'tire':
-            self.tire = 0
-        else:
+        if component_type not in Maintenance.COMPONENT_FIELDS.values():
             raise ValueError(f"Invalid component type: {component_type}")
-        self.save()
+        # save()는 그 사이 add_usage가 F()로 더한 다른 부품의 사용량을 덮어쓰므로 해당 부품만 갱신
+        Vehicle.objects.filter(pk=self.pk).update(**{component_type: 0}, updated_at=timezone.now())
+        setattr(self, component_type, 0)
 
     def update_last_user_and_date(self, driving_record):
         """
@@ -146,6 +349,7 @@ class Vehicle(models.Model):
 # 정비 기록 모델
 class Maintenance(models.Model):
     vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE)  # 차량 참조 (Vehicle 모델 참조)
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, null=True, blank=True, editable=False, db_index=False)  # 차량의 회사 (저장 시 자동 설정, 회사별 조회 시 차량 조인 제거)
     maintenance_date = models.DateField()  # 정비 일자
     
     # 정비 유형 Choices 설정
@@ -161,6 +365,14 @@ class Maintenance(models.Model):
         (TIRE_CHANGE, '타이어 교체'),
         (OTHER, '기타')
     ]
+
+    # 정비 유형별로 사용량을 초기화하는 차량 부품 필드
+    COMPONENT_FIELDS = {
+        ENGINE_OIL_CHANGE: 'engine_oil_filter',
+        AIR_FILTER_CHANGE: 'aircon_filter',
+        BRAKE_PAD_CHANGE: 'brake_pad',
+        TIRE_CHANGE: 'tire',
+    }
     
     maintenance_type = models.CharField(
         max_length=20,
@@ -170,30 +382,39 @@ class Maintenance(models.Model):
     maintenance_cost = models.DecimalField(max_digits=10, decimal_places=2)  # 정비 비용
     maintenance_description = models.TextField(null=True, blank=True)  # 정비 내용
     created_at = models.DateTimeField(auto_now_add=True)  # 생성 일시
+    updated_at = models.DateTimeField(auto_now=True)  # 업데이트 일시 (동기화 API에서 변경 감지)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['company', 'maintenance_date'], name='maint_company_date_idx'),  # 회사별 정비 기록 조회
+            models.Index(fields=['company', 'updated_at'], name='maint_company_updated_idx'),  # 회사별 변경 내역 동기화
+        ]
     
     def reset_component_usage(self):
         """
         특정 부품의 사용량을 0으로 초기화합니다.
+        요청에서 읽은 차량 전체를 save()하면 그 사이 add_usage가 F()로 더한 사용량을 덮어쓰므로 해당 부품 컬럼만 UPDATE합니다.
         """
-        if self.maintenance_type == self.ENGINE_OIL_CHANGE:
-            self.vehicle.engine_oil_filter = 0
-        elif self.maintenance_type == self.AIR_FILTER_CHANGE:
-            self.vehicle.aircon_filter = 0
-        elif self.maintenance_type == self.BRAKE_PAD_CHANGE:
-            self.vehicle.brake_pad = 0
-        elif self.maintenance_type == self.TIRE_CHANGE:
-            self.vehicle.tire = 0
-        self.vehicle.save()
+        field = self.COMPONENT_FIELDS.get(self.maintenance_type)
+        if field is not None:
+            self.vehicle.reset_component_usage(field)
 
     def save(self, *args, **kwargs):
         """
         정비 기록 저장 시 부품 사용량 초기화 기능을 호출합니다.
         """
+        self.company_id = self.vehicle.company_id  # 차량의 회사로 설정
         super().save(*args, **kwargs)
         # 정비 완료 후 해당 부품의 사용량 초기화
         self.reset_component_usage()
-    
-        # 지출 내역 자동 생성 로직
+
+        # 지출 내역 자동 생성은 백그라운드 작업으로 처리
+        enqueue('maintenance.create_expense', company_id=self.company_id, maintenance_id=self.pk)
+
+    def create_expense(self):
+        """
+        정비 비용을 지출 내역으로 생성합니다. 같은 날 같은 정비 유형의 지출 내역이 있으면 생성하지 않습니다.
+        """
         # 중복 지출 내역 방지를 위해 기존 지출 내역이 있는지 확인
         if not Expense.objects.filter(
             expense_type='정비',
@@ -217,12 +438,91 @@ class Maintenance(models.Model):
 
 
 
+# 회사별 장소 사전 모델 (운행 기록의 출발지/도착지를 한 번만 저장하고 자동 완성에 사용, car_app.locations 참고)
+class Location(models.Model):
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, db_index=False)  # 장소를 사용하는 회사
+    name = models.CharField(max_length=30)  # 장소 이름 (앞뒤 공백 제거, 연속 공백은 하나로)
+    usage_count = models.PositiveIntegerField(default=0)  # 출발지/도착지로 사용된 횟수 (자동 완성 순위)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['company', 'name'], name='unique_location_company_name'),
+        ]
+
+    # 운행 기록 나누기(segmentation.place_name)에서 중간 정차 지점에 붙이는 좌표 이름 (장소 사전에 등록하지 않음)
+    COORDINATE_NAME_RE = re.compile(r'-?\d{1,3}\.\d+,-?\d{1,3}\.\d+')
+
+    @staticmethod
+    def clean_name(name):
+        return ' '.join((name or '').split())
+
+    @classmethod
+    def is_internable(cls, name):
+        name = cls.clean_name(name)
+        return bool(name) and not cls.COORDINATE_NAME_RE.fullmatch(name)
+
+    @classmethod
+    def intern(cls, company_id, name):
+        """
+        회사의 장소 사전에서 이름에 해당하는 장소 ID를 반환하고 사용 횟수를 1 늘립니다. 없으면 새로 등록합니다.
+        """
+        from .locations import note_usage
+        name = cls.clean_name(name)
+        location_id = cls.objects.filter(company_id=company_id, name=name).values_list('pk', flat=True).first()
+        if location_id is None:
+            try:
+                with transaction.atomic():  # 동시에 같은 장소가 등록된 경우를 대비한 savepoint
+                    location_id = cls.objects.create(company_id=company_id, name=name, usage_count=1).pk
+                    transaction.on_commit(lambda: note_usage(company_id, location_id, name, 1))
+                    return location_id
+            except IntegrityError:
+                location_id = cls.objects.get(company_id=company_id, name=name).pk
+        cls.objects.filter(pk=location_id).update(usage_count=F('usage_count') + 1)
+        transaction.on_commit(lambda: note_usage(company_id, location_id, name, 1))
+        return location_id
+
+    @classmethod
+    def release(cls, company_id, location_id):
+        """
+        운행 기록의 출발지/도착지가 바뀌거나 운행 기록이 삭제된 경우 이전 장소의 사용 횟수를 1 줄입니다.
+        """
+        from .locations import note_usage
+        cls.objects.filter(pk=location_id, usage_count__gt=0).update(usage_count=F('usage_count') - 1)
+        transaction.on_commit(lambda: note_usage(company_id, location_id, None, -1))
+
+    @classmethod
+    def release_records(cls, records):
+        """
+        삭제되는 운행 기록들의 출발지/도착지 사용 횟수를 한 번에 줄입니다. (차량/사용자 삭제로 운행 기록이 함께 삭제되는 경우)
+        장소별 사용 건수를 집계해 같은 건수의 장소끼리 한 번에 UPDATE합니다. 호출하는 쪽에서 트랜잭션을 열어야 합니다.
+        """
+        from .locations import note_usage
+        released = {}
+        for field in ('departure_place_id', 'arrival_place_id'):
+            for place_id, count in records.filter(**{f'{field}__isnull': False}).values_list(field).annotate(count=Count('id')).order_by():
+                released[place_id] = released.get(place_id, 0) + count
+        by_count = {}
+        for place_id, count in released.items():
+            by_count.setdefault(count, []).append(place_id)
+        for count, place_ids in by_count.items():
+            cls.objects.filter(pk__in=place_ids).update(usage_count=Greatest(F('usage_count') - count, 0))
+        companies = dict(cls.objects.filter(pk__in=released).values_list('pk', 'company_id'))
+        transaction.on_commit(lambda: [note_usage(companies[place_id], place_id, None, -count) for place_id, count in released.items() if place_id in companies])
+
+    def __str__(self):
+        return self.name
+
+
+
 # 운행 기록 모델
 class DrivingRecord(models.Model):
     vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE)  # 차량 참조 (Vehicle 모델 참조)
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, null=True, blank=True, editable=False, db_index=False)  # 차량의 회사 (저장 시 자동 설정, 회사별 조회 시 차량 조인 제거)
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)  # 사용자 참조 (CustomUser 모델 참조)
     departure_location = models.CharField(max_length=30)  # 출발지
     arrival_location = models.CharField(max_length=30)  # 도착지
+    departure_place = models.ForeignKey(Location, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='+')  # 출발지의 장소 사전 항목 (저장 시 자동 설정)
+    arrival_place = models.ForeignKey(Location, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='+')  # 도착지의 장소 사전 항목 (저장 시 자동 설정)
     departure_mileage = models.PositiveIntegerField()  # 출발 전 누적 주행거리 차량 정보에서 가져 옴
     arrival_mileage = models.PositiveIntegerField()  # 도착 후 누적 주행거리 차량 정보에 저장 함
     driving_distance = models.PositiveIntegerField(editable=False)  # 운행거리 (도착 후 주행거리 - 출발 전 주행거리)
@@ -230,7 +530,9 @@ class DrivingRecord(models.Model):
     arrival_time = models.DateTimeField()  # 도착 시간
     driving_time = models.DurationField(editable=False)  # 운행 시간 (도착 시간 - 출발 시간)
     coordinates = models.JSONField()  # 차량 이동 중 주기적으로 저장된 좌표 정보
+    coordinates_archive = models.CharField(max_length=255, blank=True, default='', editable=False)  # 좌표를 보관한 파일 이름 (보관된 경우 coordinates는 비어 있음)
     created_at = models.DateTimeField(auto_now_add=True)  # 생성 일시
+    updated_at = models.DateTimeField(auto_now=True)  # 업데이트 일시 (동기화 API에서 변경 감지)
 
     # 추가 비용 필드
     fuel_cost = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)  # 유류비
@@ -255,12 +557,57 @@ class DrivingRecord(models.Model):
         default=COMMUTING
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['company', 'departure_time'], name='drivingrec_company_dep_idx'),  # 회사별 운행 기록 조회 (기간)
+            models.Index(fields=['company', 'user'], name='drivingrec_company_user_idx'),  # 회사별 사용자 운행 기록 조회
+            models.Index(fields=['company', 'updated_at'], name='drivingrec_company_upd_idx'),  # 회사별 변경 내역 동기화
+            models.Index(fields=['vehicle', 'departure_time'], name='drivingrec_vehicle_dep_idx'),  # 차량별 연속 운행 주행거리 점검 (LAG 윈도우 정렬)
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_places = {  # 출발지/도착지 변경 감지용 (이름, 회사)
+            field: (instance.__dict__.get(f'{field}_location'), instance.__dict__.get('company_id')) for field in ('departure', 'arrival')
+        }
+        return instance
+
     def save(self, *args, **kwargs):
         # 합계 비용 계산 (유류비, 통행료, 기타 비용의 합)
         self.total_cost = (self.fuel_cost or 0) + (self.toll_fee or 0) + (self.other_costs or 0)
-        super().save(*args, **kwargs)
-        
-        # 지출 내역 자동 생성 로직
+        self.company_id = self.vehicle.company_id  # 차량의 회사로 설정
+        with transaction.atomic():
+            self.intern_locations()
+            super().save(*args, **kwargs)
+        self._loaded_places = {field: (getattr(self, f'{field}_location'), self.company_id) for field in ('departure', 'arrival')}
+
+        # 지출 내역 자동 생성은 백그라운드 작업으로 처리
+        enqueue('driving_record.create_expenses', company_id=self.company_id, record_id=self.pk)
+
+    def intern_locations(self):
+        """
+        출발지/도착지를 회사의 장소 사전에 등록하고 장소 ID를 설정합니다. 이름이나 회사가 바뀐 경우에만 사용 횟수를 갱신합니다.
+        """
+        loaded = getattr(self, '_loaded_places', {})
+        for field in ('departure', 'arrival'):
+            name, place_id = getattr(self, f'{field}_location'), getattr(self, f'{field}_place_id')
+            if place_id is not None and loaded.get(field) == (name, self.company_id):
+                continue
+            if place_id is not None:
+                Location.release(loaded.get(field, (None, self.company_id))[1], place_id)
+            place_id = Location.intern(self.company_id, name) if self.company_id and Location.is_internable(name) else None
+            setattr(self, f'{field}_place_id', place_id)
+
+    @property
+    def coordinates_archived(self):
+        # 좌표가 보관 파일로 옮겨졌는지 여부 (car_app.archive.load_coordinates로 읽음)
+        return bool(self.coordinates_archive)
+
+    def create_expenses(self):
+        """
+        유류비, 통행료, 기타 비용을 지출 내역으로 생성합니다. 같은 날 같은 항목의 지출 내역이 있으면 생성하지 않습니다.
+        """
         expense_items = [
             ('유류비', self.fuel_cost),
             ('통행료', self.toll_fee),
@@ -292,6 +639,152 @@ class DrivingRecord(models.Model):
 
 
 
+# 사용자별 월간 운행 통계 모델 (운행 기록 저장 시 누적)
+class UserDrivingStat(models.Model):
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='driving_stats')  # 사용자 참조
+    month = models.DateField()  # 집계 월 (해당 월의 1일)
+    driving_distance = models.IntegerField(default=0)  # 월간 운행 거리
+    trip_count = models.IntegerField(default=0)  # 월간 운행 횟수
+    total_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)  # 월간 운행 비용 합계
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'month'], name='unique_user_driving_stat_month'),
+        ]
+        indexes = [
+            models.Index(fields=['month', 'driving_distance'], name='drivingstat_month_dist_idx'),  # 월간 순위 조회
+        ]
+
+    @staticmethod
+    def month_of(driving_record):
+        """
+        운행 기록이 집계될 월(출발 시간 기준, 해당 월의 1일)을 반환합니다.
+        """
+        return timezone.localdate(driving_record.departure_time).replace(day=1)
+
+    @classmethod
+    def apply(cls, user_id, month, distance, cost, trips=1):
+        """
+        사용자의 누적 통계와 월간 통계에 운행 거리, 비용, 횟수를 더합니다. (음수를 넘기면 차감)
+        F() 표현식으로 갱신하므로 동시에 저장되는 운행 기록끼리 값을 덮어쓰지 않습니다.
+        호출하는 쪽에서 트랜잭션을 열어야 합니다.
+        """
+        cost = cost or 0
+        CustomUser.objects.filter(pk=user_id).update(
+            usage_distance=F('usage_distance') + distance,
+            trip_count=F('trip_count') + trips,
+            total_driving_cost=F('total_driving_cost') + cost,
+            updated_at=timezone.now(),
+        )
+        updated = cls.objects.filter(user_id=user_id, month=month).update(
+            driving_distance=F('driving_distance') + distance,
+            trip_count=F('trip_count') + trips,
+            total_cost=F('total_cost') + cost,
+        )
+        if not updated:
+            try:
+                with transaction.atomic():  # 동시에 같은 월 통계가 생성된 경우를 대비한 savepoint
+                    cls.objects.create(user_id=user_id, month=month, driving_distance=distance, trip_count=trips, total_cost=cost)
+            except IntegrityError:
+                cls.objects.filter(user_id=user_id, month=month).update(
+                    driving_distance=F('driving_distance') + distance,
+                    trip_count=F('trip_count') + trips,
+                    total_cost=F('total_cost') + cost,
+                )
+
+    @classmethod
+    def add_record(cls, driving_record):
+        # 운행 기록 생성 시 통계에 반영
+        cls.apply(driving_record.user_id, cls.month_of(driving_record), driving_record.driving_distance, driving_record.total_cost)
+
+    @classmethod
+    def remove_record(cls, driving_record):
+        # 운행 기록 삭제 시 통계에서 차감
+        cls.apply(driving_record.user_id, cls.month_of(driving_record), -driving_record.driving_distance, -(driving_record.total_cost or 0), trips=-1)
+
+    @classmethod
+    def remove_records(cls, records):
+        """
+        여러 운행 기록을 통계에서 한 번에 차감합니다. (차량/사용자 삭제로 운행 기록이 함께 삭제되는 경우)
+        사용자·월별 합계로 차감하므로 운행 기록 수와 관계없이 (사용자 수 × 월 수)번만 갱신합니다.
+        호출하는 쪽에서 트랜잭션을 열어야 합니다.
+        """
+        rows = records.annotate(month=TruncMonth('departure_time')).values('user_id', 'month').annotate(
+            distance=Sum('driving_distance'), cost=Sum('total_cost'), trips=Count('id')
+        ).order_by()
+        for row in rows:
+            cls.apply(row['user_id'], row['month'].date(), -row['distance'], -(row['cost'] or 0), trips=-row['trips'])
+
+    def __str__(self):
+        return f'{self.user.name} - {self.month:%Y-%m} 운행 통계'
+
+
+
+# 차량별 월간 유류비 통계 (운행 기록 저장/삭제 시 갱신, 차종/차량 카테고리별 연비 분석은 이 테이블에서 집계)
+class VehicleFuelStat(models.Model):
+    vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='fuel_stats')  # 차량 참조
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, null=True, blank=True, db_index=False)  # 차량의 회사 (회사별 조회 시 차량 조인 제거)
+    month = models.DateField()  # 집계 월 (해당 월의 1일)
+    driving_distance = models.IntegerField(default=0)  # 월간 운행 거리
+    fuel_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)  # 월간 유류비 합계
+    trip_count = models.IntegerField(default=0)  # 월간 운행 횟수
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['vehicle', 'month'], name='unique_vehicle_fuel_stat_month'),
+        ]
+        indexes = [
+            models.Index(fields=['company', 'month'], name='fuelstat_company_month_idx'),  # 회사별 기간 연비 분석
+        ]
+
+    @classmethod
+    def apply(cls, vehicle_id, company_id, month, distance, fuel_cost, trips=1):
+        """
+        차량의 월간 통계에 운행 거리, 유류비, 횟수를 더합니다. (음수를 넘기면 차감)
+        F() 표현식으로 갱신하므로 동시에 저장되는 운행 기록끼리 값을 덮어쓰지 않습니다.
+        호출하는 쪽에서 트랜잭션을 열어야 합니다.
+        """
+        fuel_cost = fuel_cost or 0
+        changes = {
+            'driving_distance': F('driving_distance') + distance,
+            'fuel_cost': F('fuel_cost') + fuel_cost,
+            'trip_count': F('trip_count') + trips,
+        }
+        if cls.objects.filter(vehicle_id=vehicle_id, month=month).update(**changes):
+            return
+        try:
+            with transaction.atomic():  # 동시에 같은 월 통계가 생성된 경우를 대비한 savepoint
+                cls.objects.create(vehicle_id=vehicle_id, company_id=company_id, month=month, driving_distance=distance, fuel_cost=fuel_cost, trip_count=trips)
+        except IntegrityError:
+            cls.objects.filter(vehicle_id=vehicle_id, month=month).update(**changes)
+
+    @classmethod
+    def add_record(cls, driving_record):
+        # 운행 기록 생성 시 통계에 반영
+        cls.apply(driving_record.vehicle_id, driving_record.company_id, UserDrivingStat.month_of(driving_record), driving_record.driving_distance, driving_record.fuel_cost)
+
+    @classmethod
+    def remove_record(cls, driving_record):
+        # 운행 기록 삭제 시 통계에서 차감
+        cls.apply(driving_record.vehicle_id, driving_record.company_id, UserDrivingStat.month_of(driving_record), -driving_record.driving_distance, -(driving_record.fuel_cost or 0), trips=-1)
+
+    @classmethod
+    def remove_records(cls, records):
+        """
+        여러 운행 기록을 통계에서 한 번에 차감합니다. (사용자 삭제로 운행 기록이 함께 삭제되는 경우, 차량 삭제 시에는 통계도 함께 삭제됨)
+        호출하는 쪽에서 트랜잭션을 열어야 합니다.
+        """
+        rows = records.annotate(month=TruncMonth('departure_time')).values('vehicle_id', 'company_id', 'month').annotate(
+            distance=Sum('driving_distance'), fuel=Sum('fuel_cost'), trips=Count('id')
+        ).order_by()
+        for row in rows:
+            cls.apply(row['vehicle_id'], row['company_id'], row['month'].date(), -row['distance'], -(row['fuel'] or 0), trips=-row['trips'])
+
+    def __str__(self):
+        return f'{self.vehicle_id} - {self.month:%Y-%m} 유류비 통계'
+
+
+
 # 지출 관리 모델
 class Expense(models.Model):
     EXPENSE = 'expense'
@@ -323,11 +816,44 @@ class Expense(models.Model):
     )  # 상태
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)  # 사용자 (커스텀 유저 참조)
     vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE)  # 차량 참조 (Vehicle 모델 참조)
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, null=True, blank=True, editable=False, db_index=False)  # 차량의 회사 (저장 시 자동 설정, 회사별 조회 시 차량 조인 제거)
     details = models.TextField()  # 지출 및 정비 상세 내용
     payment_method = models.CharField(max_length=50, default='법인카드')  # 결제수단
     amount = models.DecimalField(max_digits=10, decimal_places=2)  # 금액
     receipt_detail = models.FileField(upload_to='receipts/', null=True, blank=True)  # 영수증 상세 (첨부파일)
     created_at = models.DateTimeField(auto_now_add=True)  # 생성 일시
+    updated_at = models.DateTimeField(auto_now=True)  # 업데이트 일시 (동기화 API에서 변경 감지)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['company', 'expense_date'], name='expense_company_date_idx'),  # 회사별 지출 내역 조회 (기간)
+            models.Index(fields=['company', 'status'], name='expense_company_status_idx'),  # 회사별 승인 대기/반려 내역 조회
+            models.Index(fields=['company', 'updated_at'], name='expense_company_updated_idx'),  # 회사별 변경 내역 동기화
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status')  # 상태 변경 감지용
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        지출 상태(승인/반려 등)가 바뀐 경우 회사 구독자들에게 이벤트를 발행합니다.
+        """
+        self.company_id = self.vehicle.company_id  # 차량의 회사로 설정
+        super().save(*args, **kwargs)
+        loaded_status = getattr(self, '_loaded_status', None)
+        if loaded_status is not None and loaded_status != self.status:
+            publish_event(self.vehicle.company_id, 'expense.status_changed', {
+                "id": self.id,
+                "user_id": self.user_id,
+                "vehicle_id": self.vehicle_id,
+                "amount": self.amount,
+                "previous_status": loaded_status,
+                "status": self.status,
+            })
+        self._loaded_status = self.status
 
     @classmethod
     def create_from_driving_record(cls, driving_record):
@@ -358,4 +884,132 @@ class Expense(models.Model):
         )
 
     def __str__(self):
-        return f'{self.get_expense_type_display()} - {self.amount}원 지출 내역'
\ No newline at end of file
+        return f'{self.get_expense_type_display()} - {self.amount}원 지출 내역'
+
+
+
+# 백그라운드 작업 모델 (car_app.tasks.enqueue로 추가, run_tasks 워커가 실행)
+class Task(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, '대기'),
+        (RUNNING, '실행 중'),
+        (DONE, '완료'),
+        (FAILED, '실패')
+    ]
+
+    name = models.CharField(max_length=100)  # 작업 이름 (등록된 핸들러)
+    kwargs = models.JSONField(default=dict)  # 핸들러 인자
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, null=True, blank=True)  # 작업 대상 회사 (상태 조회용)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)  # 작업 상태
+    attempts = models.PositiveIntegerField(default=0)  # 실행 횟수
+    max_attempts = models.PositiveIntegerField(default=5)  # 최대 실행 횟수
+    run_at = models.DateTimeField(default=timezone.now)  # 실행 예정 시각 (재시도 시 뒤로 미뤄짐)
+    locked_by = models.CharField(max_length=100, blank=True)  # 실행 중인 워커
+    locked_at = models.DateTimeField(null=True, blank=True)  # 워커가 작업을 가져간 시각
+    last_error = models.TextField(blank=True)  # 마지막 실패 내용
+    created_at = models.DateTimeField(auto_now_add=True)  # 생성 일시
+    finished_at = models.DateTimeField(null=True, blank=True)  # 완료/실패 일시
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='task_status_run_at_idx'),  # 워커의 대기 작업 조회
+            models.Index(fields=['company', 'status'], name='task_company_status_idx'),  # 회사별 작업 상태 조회
+        ]
+
+    def __str__(self):
+        return f'{self.name} ({self.get_status_display()})'
+
+
+
+# 삭제 기록 모델 (동기화 API에서 클라이언트에 삭제된 행을 알리기 위해 사용, car_app.sync 참고)
+class Tombstone(models.Model):
+    # 회사가 삭제되면서 함께 삭제되는 행의 기록도 남을 수 있도록 DB 외래 키 제약을 두지 않음
+    company = models.ForeignKey(Company, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name='+')  # 삭제된 행의 회사
+    model = models.CharField(max_length=30)  # 삭제된 행의 종류 (동기화 응답의 키, 예: vehicles, driving_records)
+    object_id = models.BigIntegerField()  # 삭제된 행의 ID
+    deleted_at = models.DateTimeField(auto_now_add=True)  # 삭제 일시
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['company', 'deleted_at'], name='tombstone_company_deleted_idx'),  # 회사별 삭제 내역 동기화
+        ]
+
+    def __str__(self):
+        return f'{self.model} {self.object_id} 삭제'
+
+
+
+# 생성 요청의 Idempotency-Key와 첫 응답 (재시도 시 같은 응답을 다시 보냄, car_app.idempotency 참고)
+class IdempotencyKey(models.Model):
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, db_index=False)  # 요청한 사용자 (키는 사용자별로 구분)
+    key = models.CharField(max_length=255)  # 클라이언트가 보낸 Idempotency-Key 헤더 값
+    fingerprint = models.CharField(max_length=64)  # 요청 메서드, 경로, 본문의 SHA-256 (같은 키로 다른 요청을 보낸 경우 거절)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)  # 저장된 응답 상태 코드 (처리 중이면 비어 있음)
+    response = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)  # 저장된 응답 본문
+    locked_at = models.DateTimeField(default=timezone.now)  # 처리를 시작한 시각 (오래된 처리 중 상태는 다른 요청이 이어받음)
+    created_at = models.DateTimeField(auto_now_add=True)  # 생성 일시
+    expires_at = models.DateTimeField()  # 만료 일시 (이후에는 같은 키로 새 요청 처리)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='unique_idempotency_user_key'),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at'], name='idempotency_expires_idx'),  # 만료된 키 일괄 삭제
+        ]
+
+    def __str__(self):
+        return f'{self.user_id}:{self.key}'
+
+
+
+# 연속된 운행 기록 사이의 주행거리/시간 이상 (car_app.odometer 점검 결과)
+class OdometerAnomaly(models.Model):
+    GAP = 'gap'
+    ROLLBACK = 'rollback'
+    OVERLAP = 'overlap'
+    KIND_CHOICES = [
+        (GAP, '주행거리 누락'),  # 출발 주행거리가 이전 운행의 도착 주행거리보다 큼 (기록되지 않은 운행)
+        (ROLLBACK, '주행거리 역행'),  # 출발 주행거리가 이전 운행의 도착 주행거리보다 작음
+        (OVERLAP, '운행 시간 겹침'),  # 출발 시간이 이전 운행의 도착 시간보다 이름
+    ]
+
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, null=True, blank=True, db_index=False)  # 차량의 회사
+    vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE)  # 차량
+    record = models.ForeignKey('DrivingRecord', on_delete=models.CASCADE, related_name='+')  # 이상이 발견된 운행 기록
+    previous_record = models.ForeignKey('DrivingRecord', on_delete=models.CASCADE, related_name='+')  # 같은 차량의 직전 운행 기록
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)  # 이상 유형
+    previous_arrival_mileage = models.PositiveIntegerField()  # 직전 운행의 도착 주행거리
+    departure_mileage = models.PositiveIntegerField()  # 이 운행의 출발 주행거리
+    previous_arrival_time = models.DateTimeField()  # 직전 운행의 도착 시간
+    departure_time = models.DateTimeField()  # 이 운행의 출발 시간
+    detected_at = models.DateTimeField(auto_now_add=True)  # 발견 일시
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['company', 'kind'], name='odometer_company_kind_idx'),  # 회사별 이상 목록 조회
+        ]
+
+    @property
+    def mileage_difference(self):
+        return self.departure_mileage - self.previous_arrival_mileage
+
+    def __str__(self):
+        return f'{self.vehicle_id} {self.get_kind_display()} ({self.previous_record_id} → {self.record_id})'
+
+
+
+# 주행거리 점검 실행 기록 (다음 점검에서 이후 변경된 차량만 다시 점검)
+class OdometerCheckRun(models.Model):
+    started_at = models.DateTimeField(default=timezone.now)  # 점검 시작 일시
+    finished_at = models.DateTimeField(null=True, blank=True)  # 점검 완료 일시 (실패하면 비어 있음)
+    full = models.BooleanField(default=False)  # 전체 점검 여부
+    vehicles = models.PositiveIntegerField(default=0)  # 점검한 차량 수 (전체 점검은 0)
+    anomalies = models.PositiveIntegerField(default=0)  # 발견한 이상 수
+
+    def __str__(self):
+        return f'{self.started_at:%Y-%m-%d %H:%M} 주행거리 점검'
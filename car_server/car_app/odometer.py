@@ -0,0 +1,124 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Window, Case, When, Value
+from django.db.models.functions import Lag
+from django.utils import timezone
+
+
+
+# 차량별 연속 운행 기록의 주행거리 점검 (운행기록부의 누락/역행/시간 겹침)
+DEFAULT_ODOMETER_CHECK = {
+    'BATCH_SIZE': 1000,  # 이상 저장 및 차량 ID 조건을 나누는 단위
+    'OVERLAP_SECONDS': 60,  # 이전 점검 시작 시각보다 이만큼 앞의 변경부터 다시 점검 (점검 중 커밋된 변경 포함)
+}
+
+# 이상 유형별 비트 (한 쌍의 운행 기록에 주행거리 이상과 시간 겹침이 함께 있을 수 있음)
+FLAGS = {1: 'gap', 2: 'rollback', 4: 'overlap'}
+
+
+def get_config():
+    return {**DEFAULT_ODOMETER_CHECK, **getattr(settings, 'ODOMETER_CHECK', {})}
+
+
+def previous(field):
+    # 같은 차량의 직전 운행 기록(출발 시간, ID 순)의 값
+    return Window(Lag(field), partition_by=[F('vehicle_id')], order_by=[F('departure_time').asc(), F('id').asc()])
+
+
+def anomaly_rows(records):
+    """
+    운행 기록 중 직전 운행 기록과 주행거리/시간이 맞지 않는 행을 반환합니다.
+    LAG 윈도우 함수로 차량별 직전 운행을 구하므로 전체 운행 기록을 한 번만 읽으며, (차량, 출발 시간) 색인 순서로 처리됩니다.
+    """
+    return records.annotate(
+        previous_id=previous('id'),
+        previous_arrival_mileage=previous('arrival_mileage'),
+        previous_arrival_time=previous('arrival_time'),
+    ).annotate(
+        flags=Case(
+            When(departure_mileage__gt=F('previous_arrival_mileage'), then=Value(1)),
+            When(departure_mileage__lt=F('previous_arrival_mileage'), then=Value(2)),
+            default=Value(0),
+        ) + Case(When(departure_time__lt=F('previous_arrival_time'), then=Value(4)), default=Value(0)),
+    ).filter(flags__gt=0).values(
+        'id', 'vehicle_id', 'company_id', 'departure_mileage', 'departure_time',
+        'previous_id', 'previous_arrival_mileage', 'previous_arrival_time', 'flags',
+    )
+
+
+def check(vehicle_ids=None, batch_size=None):
+    """
+    차량의 이상 목록을 다시 계산합니다. vehicle_ids가 None이면 전체 차량을 점검합니다. 발견한 이상 수를 반환합니다.
+    """
+    from .models import DrivingRecord, OdometerAnomaly
+    batch_size = batch_size or get_config()['BATCH_SIZE']
+    if vehicle_ids is None:
+        scopes = [None]
+    else:
+        vehicle_ids = sorted(vehicle_ids)
+        scopes = [vehicle_ids[start:start + batch_size] for start in range(0, len(vehicle_ids), batch_size)]
+
+    found = 0
+    for scope in scopes:
+        records, anomalies = DrivingRecord.objects.all(), OdometerAnomaly.objects.all()
+        if scope is not None:
+            records, anomalies = records.filter(vehicle_id__in=scope), anomalies.filter(vehicle_id__in=scope)
+        with transaction.atomic():
+            anomalies.delete()
+            pending = []
+            for row in anomaly_rows(records).iterator(chunk_size=batch_size):
+                for flag, kind in FLAGS.items():
+                    if row['flags'] & flag:
+                        pending.append(OdometerAnomaly(
+                            company_id=row['company_id'], vehicle_id=row['vehicle_id'], kind=kind,
+                            record_id=row['id'], previous_record_id=row['previous_id'],
+                            previous_arrival_mileage=row['previous_arrival_mileage'], departure_mileage=row['departure_mileage'],
+                            previous_arrival_time=row['previous_arrival_time'], departure_time=row['departure_time'],
+                        ))
+                if len(pending) >= batch_size:
+                    found += len(OdometerAnomaly.objects.bulk_create(pending))
+                    pending = []
+            found += len(OdometerAnomaly.objects.bulk_create(pending))
+    return found
+
+
+def changed_vehicle_ids(since):
+    """
+    since 이후 운행 기록이 생성/수정/삭제된 차량 ID 집합을 반환합니다.
+    생성/수정은 운행 기록의 (회사, 변경 일시) 색인으로, 삭제는 차량의 마지막 운행 기록 삭제 일시로 찾습니다.
+    """
+    from .models import Company, DrivingRecord, Vehicle
+    changed = set(
+        DrivingRecord.objects.filter(company_id__in=Company.objects.values('pk'), updated_at__gt=since).values_list('vehicle_id', flat=True).distinct()
+    )
+    changed.update(Vehicle.objects.filter(record_deleted_at__gt=since).values_list('pk', flat=True))
+    return changed
+
+
+def run(full=False, batch_size=None):
+    """
+    주행거리 점검을 실행하고 실행 기록(OdometerCheckRun)을 반환합니다.
+    완료된 이전 점검이 있으면 그 이후 운행 기록이 바뀐 차량만 다시 점검하고, 없거나 full=True이면 전체를 점검합니다.
+    """
+    from .models import OdometerCheckRun
+    config = get_config()
+    last = OdometerCheckRun.objects.filter(finished_at__isnull=False).order_by('-started_at').first()
+    current = OdometerCheckRun.objects.create(full=full or last is None)
+    if current.full:
+        current.anomalies = check(batch_size=batch_size)
+    else:
+        vehicle_ids = changed_vehicle_ids(last.started_at - timedelta(seconds=config['OVERLAP_SECONDS']))
+        current.vehicles = len(vehicle_ids)
+        current.anomalies = check(vehicle_ids, batch_size=batch_size) if vehicle_ids else 0
+    current.finished_at = timezone.now()
+    current.save(update_fields=['vehicles', 'anomalies', 'finished_at'])
+    return current
+
+
+def mark_vehicle(sender, instance, using, **kwargs):
+    """
+    운행 기록이 삭제되면 차량의 운행 기록 삭제 일시를 기록합니다. (post_delete 시그널, 다음 점검 대상)
+    """
+    from .models import Vehicle
+    Vehicle.objects.using(using).filter(pk=instance.vehicle_id).update(record_deleted_at=timezone.now())
@@ -0,0 +1,20 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+
+# 목록 조회 API에서 공통으로 사용하는 페이지네이션
+class StandardPagination(PageNumberPagination):
+    page_size = 50  # 기본 페이지 크기
+    page_size_query_param = 'page_size'  # ?page_size= 로 페이지 크기 조절
+    max_page_size = 500  # 최대 페이지 크기
+
+    def get_page_info(self):
+        """
+        응답 본문에 함께 담을 페이지 정보를 반환합니다.
+        """
+        return {
+            "count": self.page.paginator.count,  # 전체 개수
+            "page": self.page.number,  # 현재 페이지
+            "next": self.get_next_link(),  # 다음 페이지 URL
+            "previous": self.get_previous_link(),  # 이전 페이지 URL
+        }
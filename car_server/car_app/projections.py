@@ -0,0 +1,113 @@
+from django.db import models
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from .fieldsets import resolve
+
+
+
+# 목록 응답용 읽기 모델 (모델 인스턴스 대신 .values() 결과로 Serializer와 같은 응답 생성)
+def field_plan(serializer, name, field, model):
+    """
+    필드 하나를 (응답 이름, 값 컬럼, 중간 관계 컬럼 목록, 변환 함수, 계산 함수 여부)로 변환합니다.
+    - Serializer에 project_<필드 이름>(row) 메서드가 있으면 그 결과를 사용합니다. (SerializerMethodField 등)
+    - 그 외에는 source 경로의 컬럼 값을 필드의 to_representation으로 변환합니다.
+    지원하지 않는 필드(중첩 Serializer, 모델 컬럼이 아닌 source)는 None을 반환합니다.
+    """
+    method = getattr(serializer, f'project_{name}', None)
+    if method is not None:
+        return name, None, (), method, True
+    if isinstance(field, serializers.BaseSerializer) or field.source == '*':
+        return None
+    resolved = resolve(model, '__'.join(field.source_attrs))
+    if resolved is None:
+        return None
+    column, relations = resolved
+    if isinstance(field, serializers.RelatedField):  # PrimaryKeyRelatedField: 관계 컬럼 값(ID)을 그대로 사용
+        convert = None
+    else:
+        model_field = resolve_model_field(model, column)
+        if isinstance(model_field, models.FileField):  # 파일 이름을 FieldFile로 바꿔 URL 생성
+            convert = lambda value, field=field, model_field=model_field: field.to_representation(model_field.attr_class(None, model_field, value))
+        elif type(field) is serializers.DateTimeField:
+            convert = datetime_converter(field)
+        else:
+            convert = field.to_representation
+    return name, column, tuple(relations), convert, False
+
+
+def datetime_converter(field):
+    """
+    DateTimeField.to_representation과 같은 ISO 8601 문자열을 만드는 변환 함수를 반환합니다.
+    DRF는 값마다 현재 시간대를 조회하므로, 목록 응답에서는 시간대를 한 번만 조회하여 사용합니다.
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if isinstance(value, str) or timezone.is_naive(value):
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def resolve_model_field(model, path):
+    *relations, name = path.split('__')
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.get_field(name)
+
+
+def build_plan(serializer, model):
+    """
+    Serializer의 읽기 필드로 (필드 계획 목록, .values()에 넘길 컬럼 목록)을 만듭니다. 지원하지 않는 필드가 있으면 None을 반환합니다.
+    """
+    declared = getattr(getattr(serializer, 'Meta', None), 'sparse_sources', {})
+    plan, columns = [], {}
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        item = field_plan(serializer, name, field, model)
+        if item is None:
+            return None
+        plan.append(item)
+        for column in (item[1], *item[2], *declared.get(name, ())):
+            if column is not None:
+                columns[column] = None
+    return plan, list(columns)
+
+
+def to_representation(plan, row):
+    """
+    Serializer.to_representation과 같은 규칙으로 한 행을 변환합니다.
+    source 중간 관계가 비어 있으면 필드를 생략하고, 값이 None이면 변환하지 않고 None을 넣습니다.
+    """
+    ret = {}
+    for name, column, relations, convert, computed in plan:
+        if computed:
+            ret[name] = convert(row)
+            continue
+        if relations and any(row[relation] is None for relation in relations):
+            continue
+        value = row[column]
+        ret[name] = value if value is None or convert is None else convert(value)
+    return ret
+
+
+def project(serializer):
+    """
+    many=True Serializer의 응답(serializer.data)과 같은 목록을 .values() 조회로 만듭니다.
+    모델 인스턴스 생성과 필드별 속성 조회를 건너뛰므로 목록이 클수록 빠릅니다.
+    지원하지 않는 필드가 있거나 QuerySet이 아닌 경우에는 serializer.data를 반환합니다.
+    """
+    queryset, child = serializer.instance, serializer.child
+    if not isinstance(queryset, models.QuerySet):
+        return serializer.data
+    built = build_plan(child, queryset.model)
+    if built is None:
+        return serializer.data
+    plan, columns = built
+    return [to_representation(plan, row) for row in queryset.values(*columns)]
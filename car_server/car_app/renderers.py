@@ -0,0 +1,74 @@
+from rest_framework.utils import encoders
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # orjson이 설치되지 않은 경우 DRF 기본 JSON 처리 사용
+    orjson = None
+
+
+
+# orjson을 사용하는 JSON 렌더러/파서 (운행 기록 좌표처럼 큰 실수 배열을 빠르게 처리)
+# orjson이 직접 처리하지 못하는 값(Decimal, timedelta, 지연 번역 문자열 등)은 DRF JSONEncoder와 같은 방식으로 변환
+_drf_encoder = encoders.JSONEncoder()
+
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0  # UTC는 'Z'로 표시 (DRF와 동일), 숫자 키 허용
+
+
+def is_available():
+    return orjson is not None
+
+
+def default(obj):
+    """
+    orjson이 직렬화하지 못하는 값을 변환합니다.
+    Decimal → float, timedelta → 초 문자열, QuerySet → 목록 등 DRF JSONEncoder.default와 같은 결과를 반환합니다.
+    """
+    return _drf_encoder.default(obj)
+
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    orjson으로 렌더링하는 JSONRenderer. 결과는 DRF JSONRenderer와 같은 JSON입니다.
+    - datetime, date, time, UUID는 orjson이 직접 처리합니다.
+    - 들여쓰기 요청(Accept: application/json; indent=4, Browsable API), UNICODE_JSON/COMPACT_JSON 설정 변경,
+      orjson 미설치 시에는 DRF 기본 렌더러로 처리합니다.
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=default, option=ORJSON_OPTIONS)
+        except TypeError:  # 64비트 범위를 넘는 정수 등 orjson이 처리하지 못하는 값
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # DRF와 같이 \u2028, \u2029를 이스케이프하여 JavaScript에서도 안전한 JSON으로 반환
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+
+class FastJSONParser(JSONParser):
+    """
+    orjson으로 요청 본문을 파싱하는 JSONParser.
+    UTF-8이 아닌 인코딩, STRICT_JSON 해제(NaN 허용), orjson 미설치 시에는 DRF 기본 파서로 처리합니다.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding') or 'utf-8'
+        if orjson is None or not self.strict or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
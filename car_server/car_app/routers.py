@@ -0,0 +1,148 @@
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+
+
+# 읽기 전용 복제본(replica) 라우팅
+REPLICA_ALIAS = 'replica'
+PRIMARY_ALIAS = 'default'
+
+
+class RoutingState:
+    """
+    요청 하나의 DB 라우팅 상태입니다.
+    - use_replica: 이 요청의 조회 쿼리를 복제본으로 보낼지 여부 (ReplicaReadMixin이 설정)
+    - wrote: 이 요청에서 쓰기가 발생했는지 여부. 쓰기 이후의 조회는 모두 원본 DB로 보냄 (요청 내 고정)
+    """
+    __slots__ = ('use_replica', 'wrote')
+
+    def __init__(self):
+        self.use_replica = False
+        self.wrote = False
+
+
+_routing_state = ContextVar('db_routing_state', default=None)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def _pin_key(user_id):
+    return f'db_primary_pin:{user_id}'
+
+
+def pin_to_primary(user_id):
+    """
+    사용자가 방금 쓴 데이터를 바로 다시 읽을 수 있도록 일정 시간(REPLICA_PIN_SECONDS) 동안
+    해당 사용자의 조회를 원본 DB로 보냅니다. (복제 지연 동안 방금 저장한 운행 기록이 안 보이는 문제 방지)
+    """
+    seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 10)
+    if user_id is not None and seconds:
+        cache.set(_pin_key(user_id), True, seconds)
+
+
+def is_pinned_to_primary(user_id):
+    return user_id is not None and cache.get(_pin_key(user_id)) is not None
+
+
+def use_replica(user=None):
+    """
+    현재 요청의 조회 쿼리를 복제본으로 보냅니다.
+    복제본이 설정되지 않았거나, 이미 쓰기가 발생했거나, 사용자가 원본 DB에 고정된 경우에는 무시합니다.
+    """
+    state = _routing_state.get()
+    if state is None or state.wrote or not replica_configured():
+        return False
+    if user is not None and is_pinned_to_primary(user.pk):
+        return False
+    state.use_replica = True
+    return True
+
+
+
+class PrimaryReplicaRouter:
+    """
+    - 쓰기는 항상 원본 DB(default)로 보냅니다.
+    - 조회는 요청에서 use_replica()를 호출한 경우(목록/통계 View)에만 복제본으로 보내고, 그 외에는 원본 DB를 사용합니다.
+    - 요청 중 쓰기가 한 번이라도 발생하면 이후 조회는 모두 원본 DB로 보냅니다.
+    """
+    def db_for_read(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None and state.use_replica and not state.wrote:
+            return REPLICA_ALIAS
+        return PRIMARY_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            state.wrote = True
+        return PRIMARY_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True  # 복제본은 원본 DB와 같은 데이터
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_ALIAS  # 복제본의 스키마는 원본 DB에서 복제됨
+
+
+
+class ReplicaRoutingMiddleware:
+    """
+    요청마다 새로운 라우팅 상태를 만들고, 쓰기가 발생한 요청이 끝나면 해당 사용자를 잠시 원본 DB에 고정합니다.
+    (예: 운행 기록 생성 직후의 운행 기록 목록 조회는 복제 지연과 관계없이 원본 DB에서 조회)
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RoutingState()
+        token = _routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+        self.process_state(request, state)
+        return response
+
+    async def __acall__(self, request):
+        state = RoutingState()
+        token = _routing_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+        self.process_state(request, state)
+        return response
+
+    def process_state(self, request, state):
+        if not state.wrote or not replica_configured():
+            return
+        user = getattr(request, 'user', None)  # DRF가 JWT 인증 후 설정한 사용자
+        if user is not None and user.is_authenticated:
+            pin_to_primary(user.pk)
+
+
+
+# 목록/통계 View에서 사용하는 Mixin
+class ReplicaReadMixin:
+    """
+    GET/HEAD 요청의 조회 쿼리를 복제본으로 보냅니다. (인증 이후부터 적용)
+    """
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS:
+            use_replica(request.user)
@@ -0,0 +1,203 @@
+import re
+from django.db import connections, DEFAULT_DB_ALIAS
+from django.db.models import Q
+from django.db.utils import OperationalError
+from django.utils.html import escape
+from .models import Notice
+
+
+
+# 공지사항 전문 검색 (SQLite FTS5, 그 외 DB에서는 LIKE 검색으로 대체)
+FTS_TABLE = 'car_app_notice_fts'
+NOTICE_TABLE = Notice._meta.db_table
+MAX_QUERY_TOKENS = 8  # 검색어에서 사용할 최대 단어 수
+SNIPPET_TOKENS = 16  # 본문 요약에 포함할 단어 수
+HIGHLIGHT_START, HIGHLIGHT_END = '\x02', '\x03'  # 이스케이프 후 <mark> 태그로 바꾸기 위한 임시 구분자
+
+# FTS 테이블과 Notice 테이블을 동기화하는 트리거 (Notice가 어떤 경로로 수정되어도 색인이 갱신됨)
+FTS_TRIGGERS = {
+    f'{FTS_TABLE}_ai': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {NOTICE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+        END""",
+    f'{FTS_TABLE}_ad': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {NOTICE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        END""",
+    f'{FTS_TABLE}_au': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, content ON {NOTICE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+        END""",
+}
+
+
+def is_fts_enabled(using=DEFAULT_DB_ALIAS):
+    """
+    해당 DB에 공지사항 FTS 색인이 준비되어 있는지 확인합니다.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+def ensure_notice_index(using=DEFAULT_DB_ALIAS, rebuild=False, **kwargs):
+    """
+    SQLite인 경우 FTS5 가상 테이블과 동기화 트리거를 생성합니다. (post_migrate 시 호출)
+    트리거가 새로 만들어진 경우(테이블 재생성 등으로 사라진 경우 포함) 색인을 다시 구축합니다.
+    FTS5를 지원하지 않는 SQLite 빌드에서는 아무것도 하지 않고 LIKE 검색을 사용합니다.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or NOTICE_TABLE not in connection.introspection.table_names():
+        return False
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                f"title, content, content='{NOTICE_TABLE}', content_rowid='id', "
+                f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            )
+        except OperationalError:  # FTS5 미지원 빌드
+            return False
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s", [f'{FTS_TABLE}_%'])
+        existing = {row[0] for row in cursor.fetchall()}
+        for name, sql in FTS_TRIGGERS.items():
+            if name not in existing:
+                cursor.execute(sql)
+                rebuild = True
+        if rebuild:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return True
+
+
+def tokenize(query):
+    return re.findall(r'\w+', query)[:MAX_QUERY_TOKENS]
+
+
+def highlight(text, tokens):
+    """
+    LIKE 검색 결과에서 검색어 부분을 <mark> 태그로 감쌉니다.
+    """
+    if not tokens:
+        return escape(text)
+    pattern = re.compile('|'.join(re.escape(token) for token in tokens), re.IGNORECASE)
+    marked = pattern.sub(lambda match: f'{HIGHLIGHT_START}{match.group(0)}{HIGHLIGHT_END}', text)
+    return render_marks(marked)
+
+
+def render_marks(text):
+    # 본문은 HTML 이스케이프한 뒤 임시 구분자만 <mark> 태그로 변환
+    return escape(text).replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_END, '</mark>')
+
+
+def make_snippet(content, tokens, width=60):
+    """
+    LIKE 검색 결과의 본문에서 첫 번째 검색어 주변만 잘라 요약을 만듭니다.
+    """
+    lowered = content.lower()
+    positions = [lowered.find(token.lower()) for token in tokens]
+    positions = [position for position in positions if position >= 0]
+    start = max(min(positions) - width // 2, 0) if positions else 0
+    snippet = content[start:start + width]
+    prefix = '…' if start > 0 else ''
+    suffix = '…' if start + width < len(content) else ''
+    return prefix + highlight(snippet, tokens) + suffix
+
+
+
+# 페이지네이션에서 필요한 부분만 조회하는 검색 결과 목록
+class NoticeSearchResults:
+    """
+    Django Paginator가 요구하는 count()와 슬라이싱을 지원합니다.
+    슬라이싱 시 해당 페이지의 결과만 관련도 순으로 조회합니다.
+    """
+    def __init__(self, company, query, using=DEFAULT_DB_ALIAS):
+        self.company_id = company.pk if company else None
+        self.tokens = tokenize(query)
+        self.using = using
+        self.use_fts = bool(self.tokens) and is_fts_enabled(using)
+        self._count = None
+
+    def match_expression(self):
+        # 각 단어를 따옴표로 감싸 FTS 문법을 이스케이프하고, 접두어 검색(*)으로 조사가 붙은 단어도 검색
+        return ' '.join('"{}"*'.format(token.replace('"', '""')) for token in self.tokens)
+
+    def fallback_queryset(self):
+        queryset = Notice.objects.using(self.using).filter(company_id=self.company_id)
+        for token in self.tokens:
+            queryset = queryset.filter(Q(title__icontains=token) | Q(content__icontains=token))
+        return queryset.order_by('-created_at', '-id')
+
+    def count(self):
+        if self._count is None:
+            if not self.tokens:
+                self._count = 0
+            elif self.use_fts:
+                with connections[self.using].cursor() as cursor:
+                    cursor.execute(
+                        f"SELECT COUNT(*) FROM {FTS_TABLE} f JOIN {NOTICE_TABLE} n ON n.id = f.rowid "
+                        f"WHERE {FTS_TABLE} MATCH %s AND n.company_id = %s",
+                        [self.match_expression(), self.company_id],
+                    )
+                    self._count = cursor.fetchone()[0]
+            else:
+                self._count = self.fallback_queryset().count()
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop
+        if not self.tokens or stop is not None and stop <= start:
+            return []
+        if self.use_fts:
+            return self._fts_page(start, stop)
+        return self._fallback_page(start, stop)
+
+    def _fts_page(self, start, stop):
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(
+                f"SELECT f.rowid, highlight({FTS_TABLE}, 0, %s, %s), snippet({FTS_TABLE}, 1, %s, %s, '…', %s), "
+                f"bm25({FTS_TABLE}, 10.0, 1.0) AS rank "  # 제목 일치에 가중치
+                f"FROM {FTS_TABLE} f JOIN {NOTICE_TABLE} n ON n.id = f.rowid "
+                f"WHERE {FTS_TABLE} MATCH %s AND n.company_id = %s "
+                f"ORDER BY rank, n.created_at DESC LIMIT %s OFFSET %s",
+                [HIGHLIGHT_START, HIGHLIGHT_END, HIGHLIGHT_START, HIGHLIGHT_END, SNIPPET_TOKENS,
+                 self.match_expression(), self.company_id,
+                 -1 if stop is None else stop - start, start],
+            )
+            hits = cursor.fetchall()
+
+        notices = {
+            notice['id']: notice
+            for notice in Notice.objects.using(self.using).filter(id__in=[hit[0] for hit in hits]).values('id', 'title', 'created_at', 'created_by__name')
+        }
+        results = []
+        for notice_id, title, snippet, rank in hits:
+            if notice_id in notices:
+                results.append({
+                    **notices[notice_id],
+                    "title_highlight": render_marks(title),  # 검색어가 강조된 제목
+                    "snippet": render_marks(snippet),  # 검색어 주변 본문 요약
+                    "score": -rank,  # 관련도 점수 (BM25) (클수록 관련도 높음)
+                })
+        return results
+
+    def _fallback_page(self, start, stop):
+        notices = self.fallback_queryset().values('id', 'title', 'content', 'created_at', 'created_by__name')[start:stop]
+        results = []
+        for notice in notices:
+            content = notice.pop('content')
+            results.append({
+                **notice,
+                "title_highlight": highlight(notice['title'], self.tokens),
+                "snippet": make_snippet(content, self.tokens),
+                "score": None,  # LIKE 검색은 관련도 점수를 계산하지 않음 (최신순 정렬)
+            })
+        return results
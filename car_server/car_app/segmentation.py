@@ -0,0 +1,210 @@
+import math
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+
+
+# GPS 좌표로 운행 기록 나누기 (운행 종료를 누르지 않아 하루 전체가 한 운행으로 저장된 경우 정차 지점으로 분리)
+DEFAULT_TRIP_SEGMENTATION = {
+    'STOP_RADIUS_METERS': 150,  # 이 반경 안에 머무르면 정차로 판단
+    'DWELL_SECONDS': 600,  # 반경 안에 이 시간 이상 머무르면 운행 종료로 판단
+    'MIN_TRIP_METERS': 300,  # 이보다 짧은 이동은 운행으로 나누지 않음 (주차장 안 이동 등)
+}
+
+EARTH_RADIUS_METERS = 6371008.8
+
+
+def get_config():
+    return {**DEFAULT_TRIP_SEGMENTATION, **getattr(settings, 'TRIP_SEGMENTATION', {})}
+
+
+def haversine(lat1, lng1, lat2, lng2):
+    """
+    두 좌표 사이의 거리(미터)를 반환합니다.
+    """
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * math.asin(min(1.0, math.sqrt(a)))
+
+
+def parse_time(value):
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=dt_timezone.utc)
+    moment = parse_datetime(value) if isinstance(value, str) else None
+    if moment is None:
+        raise ValueError(f"좌표의 시각을 읽을 수 없습니다: {value!r}")
+    return moment
+
+
+def timed_points(coordinates, departure_time, arrival_time):
+    """
+    좌표 목록을 (순번, 위도, 경도, 시각)으로 하나씩 반환합니다.
+    좌표에 시각([위도, 경도, 시각], 시각은 epoch 초 또는 ISO 8601)이 없으면 출발~도착 시간 동안 일정한 간격으로 저장된 것으로 봅니다.
+    """
+    interval = (arrival_time - departure_time) / max(len(coordinates) - 1, 1)
+    for index, point in enumerate(coordinates):
+        moment = parse_time(point[2]) if len(point) > 2 and point[2] is not None else departure_time + interval * index
+        yield index, float(point[0]), float(point[1]), moment
+
+
+
+class StopDetector:
+    """
+    좌표를 한 번씩만 읽으면서(feed) 정차 지점을 찾아 운행 구간을 반환하는 엔진. 좌표 수와 관계없이 상태는 몇 개의 좌표뿐입니다.
+    - 정차 후보의 첫 좌표(anchor)에서 STOP_RADIUS_METERS 안에 DWELL_SECONDS 이상 머무른 뒤 벗어나면 정차로 판단합니다.
+    - 운행 구간은 이전 정차의 마지막 좌표에서 출발해 다음 정차의 첫 좌표에 도착합니다.
+    구간: {"start_index", "end_index", "departure_time", "arrival_time", "distance_m"} (distance_m은 좌표 사이 거리의 합)
+    """
+    def __init__(self, radius, dwell, min_trip):
+        self.radius, self.dwell, self.min_trip = radius, dwell, min_trip
+        self.previous = None  # 직전 좌표
+        self.path = 0.0  # 첫 좌표부터의 누적 이동 거리
+        self.start = None  # 현재 운행 구간의 출발 좌표와 그때까지의 누적 거리
+        self.anchor = None  # 정차 후보의 첫 좌표와 그때까지의 누적 거리
+        self.inside = None  # 정차 후보 반경 안의 마지막 좌표와 그때까지의 누적 거리
+        self.emitted = 0
+
+    def dwelled(self):
+        return (self.inside[0][3] - self.anchor[0][3]).total_seconds() >= self.dwell
+
+    def segment(self, start, end):
+        """
+        출발 좌표에서 도착 좌표까지를 운행 구간으로 반환합니다. MIN_TRIP_METERS보다 짧으면 None을 반환합니다.
+        """
+        (first, first_path), (last, last_path) = start, end
+        if last[0] <= first[0] or last_path - first_path < self.min_trip:
+            return None
+        self.emitted += 1
+        return {
+            "start_index": first[0],
+            "end_index": last[0],
+            "departure_time": first[3],
+            "arrival_time": last[3],
+            "distance_m": last_path - first_path,
+        }
+
+    def feed(self, point):
+        """
+        좌표 하나를 처리하고, 이 좌표로 끝난 운행 구간이 있으면 반환합니다. (없으면 None)
+        """
+        if self.previous is not None:
+            self.path += haversine(self.previous[1], self.previous[2], point[1], point[2])
+        self.previous = point
+        current = (point, self.path)
+        if self.start is None:
+            self.start = self.anchor = self.inside = current
+            return None
+        if haversine(self.anchor[0][1], self.anchor[0][2], point[1], point[2]) <= self.radius:
+            self.inside = current
+            return None
+
+        # 정차 후보 반경을 벗어남: 충분히 머물렀으면 정차 전까지를 운행 구간으로 끝내고 정차의 마지막 좌표에서 새 구간 시작
+        finished = None
+        if self.dwelled():
+            finished = self.segment(self.start, self.anchor)
+            self.start = self.inside
+        self.anchor = self.inside = current
+        return finished
+
+    def finish(self):
+        """
+        마지막 운행 구간을 반환합니다. 끝이 정차이면 정차의 첫 좌표에 도착한 것으로 봅니다.
+        나눈 구간이 하나도 없으면 짧더라도 전체를 하나의 구간으로 반환합니다.
+        """
+        if self.start is None:
+            return None
+        end = self.anchor if self.dwelled() else (self.previous, self.path)
+        finished = self.segment(self.start, end)
+        if finished is None and not self.emitted:
+            self.min_trip = 0
+            finished = self.segment(self.start, (self.previous, self.path))
+        return finished
+
+
+def detect_segments(points, radius=None, dwell=None, min_trip=None):
+    """
+    (순번, 위도, 경도, 시각) 좌표를 차례로 읽어 운행 구간을 하나씩 반환합니다. (generator)
+    """
+    config = get_config()
+    detector = StopDetector(
+        config['STOP_RADIUS_METERS'] if radius is None else radius,
+        config['DWELL_SECONDS'] if dwell is None else dwell,
+        config['MIN_TRIP_METERS'] if min_trip is None else min_trip,
+    )
+    for point in points:
+        finished = detector.feed(point)
+        if finished is not None:
+            yield finished
+    finished = detector.finish()
+    if finished is not None:
+        yield finished
+
+
+
+def place_name(coordinates, index):
+    # 중간 정차 지점은 장소 이름을 알 수 없으므로 좌표로 표시 (출발지/도착지 30자 제한 안, Location.COORDINATE_NAME_RE와 같은 형식이라 장소 사전에는 등록되지 않음)
+    return f'{float(coordinates[index][0]):.5f},{float(coordinates[index][1]):.5f}'
+
+
+def suggest(record, coordinates, **thresholds):
+    """
+    운행 기록을 정차 지점으로 나눈 운행 기록 제안 목록을 반환합니다.
+    주행거리는 계기판 주행거리(도착 - 출발)를 구간별 GPS 이동 거리 비율로 나누며, 마지막 구간의 도착 주행거리는 원래 값과 같습니다.
+    """
+    segments = list(detect_segments(timed_points(coordinates, record.departure_time, record.arrival_time), **thresholds))
+    total_path = sum(segment['distance_m'] for segment in segments)
+    total_mileage = record.arrival_mileage - record.departure_mileage
+    suggestions, travelled = [], 0.0
+    for number, segment in enumerate(segments):
+        first, last = number == 0, number == len(segments) - 1
+        departure_mileage = record.departure_mileage + (round(total_mileage * travelled / total_path) if total_path else 0)
+        travelled += segment['distance_m']
+        arrival_mileage = record.arrival_mileage if last else record.departure_mileage + round(total_mileage * travelled / total_path)
+        suggestions.append({
+            **segment,
+            "departure_location": record.departure_location if first else place_name(coordinates, segment['start_index']),
+            "arrival_location": record.arrival_location if last else place_name(coordinates, segment['end_index']),
+            "departure_mileage": departure_mileage,
+            "arrival_mileage": arrival_mileage,
+            "driving_distance": arrival_mileage - departure_mileage,
+            "distance_m": round(segment['distance_m']),
+        })
+    return suggestions
+
+
+@transaction.atomic
+def apply_suggestions(record, coordinates, suggestions):
+    """
+    운행 기록을 제안된 구간으로 나눕니다. 첫 구간은 기존 운행 기록을 수정하고(비용 유지), 나머지는 새 운행 기록으로 생성합니다.
+    나눈 후에도 전체 주행거리와 비용은 같으므로 차량 부품 사용량은 그대로 두고, 사용자/차량 통계는 운행 횟수를 포함해 다시 반영합니다.
+    생성한 운행 기록 목록(첫 구간 포함)을 반환합니다.
+    """
+    from .models import DrivingRecord, UserDrivingStat, VehicleFuelStat
+    UserDrivingStat.remove_record(record)
+    VehicleFuelStat.remove_record(record)
+    records = []
+    for number, suggestion in enumerate(suggestions):
+        if number == 0:
+            segment = record
+            segment.coordinates_archive = ''
+        else:
+            segment = DrivingRecord(
+                vehicle=record.vehicle, user=record.user, driving_purpose=record.driving_purpose,
+                fuel_cost=None, toll_fee=None, other_costs=None,
+            )
+        segment.departure_location = suggestion['departure_location'][:30]
+        segment.arrival_location = suggestion['arrival_location'][:30]
+        segment.departure_mileage = suggestion['departure_mileage']
+        segment.arrival_mileage = suggestion['arrival_mileage']
+        segment.driving_distance = suggestion['driving_distance']
+        segment.departure_time = suggestion['departure_time']
+        segment.arrival_time = suggestion['arrival_time']
+        segment.driving_time = segment.arrival_time - segment.departure_time
+        segment.coordinates = coordinates[suggestion['start_index']:suggestion['end_index'] + 1]
+        segment.save()
+        UserDrivingStat.add_record(segment)
+        VehicleFuelStat.add_record(segment)
+        records.append(segment)
+    return records
@@ -1,9 +1,12 @@
 from rest_framework import serializers
-from .models import Company, CustomUser, Notice, Vehicle, DrivingRecord, Maintenance, Expense
+from .models import Company, CustomUser, Notice, Vehicle, DrivingRecord, Maintenance, Expense, UserDrivingStat, VehicleFuelStat
 from django.db import transaction
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
+from .instrumentation import SerializerTimingMixin
+from .fieldsets import SparseFieldsetMixin
+from .tasks import enqueue
 
 
 
@@ -160,7 +163,7 @@ class RegisterUserSerializer(serializers.ModelSerializer):
 
 
 # 사용자 정보 조회 시리얼라이저
-class CustomUserSerializer(serializers.ModelSerializer):
+class CustomUserSerializer(SparseFieldsetMixin, SerializerTimingMixin, serializers.ModelSerializer):
     company = CompanySerializer()  # 회사 정보 포함
     password = serializers.CharField(write_only=True, required=False, style={'input_type': 'password'}, label="Password")
     password2 = serializers.CharField(write_only=True, required=False, style={'input_type': 'password'}, label="Confirm Password")
@@ -178,12 +181,15 @@ class CustomUserSerializer(serializers.ModelSerializer):
             'position',                 # 직급
             'name',                     # 이름
             'usage_distance',           # 사용 거리
+            'trip_count',               # 운행 횟수
+            'total_driving_cost',       # 운행 비용 합계
             'unpaid_penalties',         # 미납 과태료
             'created_at',               # 생성 일시
+            'updated_at',               # 수정 일시 (자동 갱신)
             'password',                 # 비밀번호 (작성 전용)
             'password2'                 # 비밀번호 확인 (작성 전용)
         ]
-        read_only_fields = ['is_admin', 'created_at']  # 읽기 전용 필드 설정
+        read_only_fields = ['is_admin', 'created_at', 'usage_distance', 'trip_count', 'total_driving_cost']  # 읽기 전용 필드 설정 (운행 통계는 운행 기록으로만 갱신)
         extra_kwargs = {
             'password': {'write_only': True, 'required': False},  # 비밀번호는 작성 전용으로 설정, 필수 아님
         }
@@ -240,7 +246,7 @@ class LoginSerializer(serializers.Serializer):
 
 
 # 공지사항 Serializer
-class NoticeSerializer(serializers.ModelSerializer):
+class NoticeSerializer(SparseFieldsetMixin, SerializerTimingMixin, serializers.ModelSerializer):
     company_name = serializers.SerializerMethodField()  # 회사 이름을 반환하는 필드 추가
     created_by_name = serializers.SerializerMethodField()  # 작성자 이름을 반환하는 필드 추가
     
@@ -259,6 +265,10 @@ class NoticeSerializer(serializers.ModelSerializer):
             'created_at',  # 생성 일시는 자동 생성되므로 읽기 전용
             'updated_at',  # 수정 일시는 자동 갱신되므로 읽기 전용
         ]
+        sparse_sources = {  # SerializerMethodField가 사용하는 모델 필드 (?fields= 조회 시 필요한 컬럼만 조회)
+            'company_name': ['company__name'],
+            'created_by_name': ['created_by__name'],
+        }
         
     def get_company_name(self, obj):
         return obj.company.name  # 회사 이름 반환
@@ -269,7 +279,7 @@ class NoticeSerializer(serializers.ModelSerializer):
 
 
 # 차량 정보를 처리하는 Serializer
-class VehicleSerializer(serializers.ModelSerializer):
+class VehicleSerializer(SparseFieldsetMixin, SerializerTimingMixin, serializers.ModelSerializer):
     company_name = serializers.CharField(source='company.name', read_only=True)  # 로그인한 사용자의 회사명 반환
     last_user = serializers.CharField(source='last_user.name', read_only=True)  # 마지막 사용자 반환
     last_used_date = serializers.DateField(read_only=True)  # 마지막 사용일 반환
@@ -298,7 +308,8 @@ class VehicleSerializer(serializers.ModelSerializer):
             'down_payment',            # 선수금
             'deposit',                 # 보증금
             'expiration_date',         # 만기일
-            'company_name'             # 회사명 (자동 설정)
+            'company_name',            # 회사명 (자동 설정)
+            'updated_at'               # 수정 일시 (자동 갱신)
         ]
         read_only_fields = ['last_user', 'last_used_date', 'company_name']  # 마지막 사용자와 회사명은 자동으로 설정되므로 읽기 전용
 
@@ -310,8 +321,12 @@ class VehicleSerializer(serializers.ModelSerializer):
 
 
 
+# 정비 유형 코드 → 표시용 값 (get_maintenance_type_display와 동일)
+MAINTENANCE_TYPE_LABELS = dict(Maintenance.MAINTENANCE_TYPE_CHOICES)
+
+
 # 정비 기록을 처리하는 Serializer
-class MaintenanceSerializer(serializers.ModelSerializer):
+class MaintenanceSerializer(SparseFieldsetMixin, SerializerTimingMixin, serializers.ModelSerializer):
     vehicle_info = serializers.SerializerMethodField()  # 차량 정보 추가
     maintenance_type_display = serializers.CharField(source='get_maintenance_type_display', read_only=True)  # 정비 유형의 표시용 값을 반환
 
@@ -326,9 +341,14 @@ class MaintenanceSerializer(serializers.ModelSerializer):
             'maintenance_type_display',  # 정비 유형 (표시용 값)
             'maintenance_cost',      # 정비 비용
             'maintenance_description', # 정비 내용
-            'created_at'             # 생성 일시
+            'created_at',            # 생성 일시
+            'updated_at'             # 수정 일시 (자동 갱신)
         ]
         read_only_fields = ['created_at', 'maintenance_type_display']  # 읽기 전용 필드 설정
+        sparse_sources = {  # 모델 필드가 아닌 필드가 사용하는 모델 필드 (?fields= 조회 시 필요한 컬럼만 조회)
+            'vehicle_info': ['vehicle__vehicle_type', 'vehicle__license_plate_number', 'vehicle__company__name'],
+            'maintenance_type_display': ['maintenance_type'],
+        }
 
     def get_vehicle_info(self, obj):
         return {
@@ -337,13 +357,25 @@ class MaintenanceSerializer(serializers.ModelSerializer):
             "company": obj.vehicle.company.name if obj.vehicle.company else None
         }
 
+    # 목록 응답용 (.values() 결과 한 행으로 위와 같은 값 생성, car_app.projections 참고)
+    def project_vehicle_info(self, row):
+        return {
+            "vehicle_type": row['vehicle__vehicle_type'],
+            "license_plate_number": row['vehicle__license_plate_number'],
+            "company": row['vehicle__company__name']
+        }
+
+    def project_maintenance_type_display(self, row):
+        return MAINTENANCE_TYPE_LABELS.get(row['maintenance_type'], row['maintenance_type'])
+
 
 
 # 운행 기록을 처리하는 Serializer
-class DrivingRecordSerializer(serializers.ModelSerializer):
+class DrivingRecordSerializer(SparseFieldsetMixin, SerializerTimingMixin, serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.name', read_only=True)  # 사용자 이름 추가
     vehicle_type = serializers.CharField(source='vehicle.vehicle_type', read_only=True)  # 차량 차종 추가
     vehicle_license_plate_number = serializers.CharField(source='vehicle.license_plate_number', read_only=True)  # 차량 번호판 추가
+    coordinates_archived = serializers.BooleanField(read_only=True)  # 좌표 보관 여부 (목록 조회 시 보관된 좌표는 빈 목록)
 
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())  # 로그인한 사용자의 계정을 자동 설정
 
@@ -366,14 +398,24 @@ class DrivingRecordSerializer(serializers.ModelSerializer):
             'arrival_time',                  # 도착 시간
             'driving_time',                  # 운행 시간
             'coordinates',                   # 주기적으로 저장된 좌표 정보
+            'coordinates_archived',          # 좌표 보관 여부
             'driving_purpose',               # 운행 목적
             'fuel_cost',                     # 유류비
             'toll_fee',                      # 통행료
             'other_costs',                   # 기타 비용
             'total_cost',                    # 합계 비용
-            'created_at'                     # 생성 일시
+            'created_at',                    # 생성 일시
+            'updated_at'                     # 수정 일시 (자동 갱신)
         ]
         read_only_fields = ['driving_distance', 'driving_time', 'created_at']  # 읽기 전용 필드 설정
+        sparse_sources = {  # 모델 필드가 아닌 필드가 사용하는 모델 필드 (?fields= 조회 시 필요한 컬럼만 조회)
+            'coordinates': ['coordinates', 'coordinates_archive'],  # 보관된 좌표를 읽을 때 파일 이름 필요
+            'coordinates_archived': ['coordinates_archive'],
+        }
+
+    # 목록 응답용 (.values() 결과 한 행으로 값 생성, car_app.projections 참고)
+    def project_coordinates_archived(self, row):
+        return bool(row['coordinates_archive'])
 
     def validate(self, data):
         # 출발 주행거리와 도착 주행거리가 올바른지 확인
@@ -381,6 +423,7 @@ class DrivingRecordSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("도착 주행거리는 출발 주행거리보다 크거나 같아야 합니다.")
         return data
 
+    @transaction.atomic  # 운행 기록과 차량/사용자 통계를 함께 저장
     def create(self, validated_data):
         # 운행 거리 및 운행 시간 계산
         validated_data['driving_distance'] = validated_data['arrival_mileage'] - validated_data['departure_mileage']
@@ -389,22 +432,57 @@ class DrivingRecordSerializer(serializers.ModelSerializer):
         # 운행 기록 생성
         record = super().create(validated_data)
 
-        # 차량의 누적 주행 거리 업데이트
-        record.vehicle.total_mileage = validated_data['arrival_mileage']
-        record.vehicle.save()
+        # 사용자의 누적/월간 운행 통계, 차량의 월간 유류비 통계 업데이트
+        UserDrivingStat.add_record(record)
+        VehicleFuelStat.add_record(record)
 
-        # 차량의 엔진오일 필터, 에어컨 필터, 브레이크 패드, 타이어의 사용량 업데이트
-        record.vehicle.update_components_usage(record)
+        # 차량의 누적 주행 거리 업데이트 (다음 운행의 출발 주행거리로 사용되므로 바로 반영)
+        record.vehicle.total_mileage = validated_data['arrival_mileage']
+        record.vehicle.save(update_fields=['total_mileage', 'updated_at'])  # update_fields를 지정하면 auto_now 필드도 직접 포함해야 저장됨
 
-        # 차량의 마지막 사용일과 마지막 사용자 업데이트
-        record.vehicle.update_last_user_and_date(record)
+        # 차량의 부품 사용량, 마지막 사용일과 마지막 사용자 업데이트는 백그라운드 작업으로 처리
+        enqueue('driving_record.update_vehicle_usage', company_id=record.company_id, record_id=record.pk)
         
         return record
 
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        # 수정 전 값을 사용자/차량 통계에서 차감한 뒤, 수정된 값으로 다시 반영
+        UserDrivingStat.remove_record(instance)
+        VehicleFuelStat.remove_record(instance)
+
+        # 주행거리나 시간이 수정된 경우 운행 거리 및 운행 시간 재계산
+        validated_data['driving_distance'] = validated_data.get('arrival_mileage', instance.arrival_mileage) - validated_data.get('departure_mileage', instance.departure_mileage)
+        validated_data['driving_time'] = validated_data.get('arrival_time', instance.arrival_time) - validated_data.get('departure_time', instance.departure_time)
+
+        # 좌표가 새로 입력된 경우 보관 파일 대신 DB의 좌표를 사용
+        if 'coordinates' in validated_data:
+            validated_data['coordinates_archive'] = ''
+
+        record = super().update(instance, validated_data)
+        UserDrivingStat.add_record(record)
+        VehicleFuelStat.add_record(record)
+        return record
+
+
+
+# 사용자 월간 운행 통계 Serializer
+class UserDrivingStatSerializer(SparseFieldsetMixin, SerializerTimingMixin, serializers.ModelSerializer):
+    month = serializers.DateField(format='%Y-%m')  # 집계 월 (YYYY-MM)
+
+    class Meta:
+        model = UserDrivingStat
+        fields = [
+            'month',             # 집계 월
+            'driving_distance',  # 월간 운행 거리
+            'trip_count',        # 월간 운행 횟수
+            'total_cost'         # 월간 운행 비용 합계
+        ]
+
 
 
 # 지출 내역을 처리하는 Serializer
-class ExpenseSerializer(serializers.ModelSerializer):
+class ExpenseSerializer(SparseFieldsetMixin, SerializerTimingMixin, serializers.ModelSerializer):
     user_info = serializers.SerializerMethodField()  # 사용자 정보 추가
     vehicle_info = serializers.SerializerMethodField()  # 차량 정보 추가
 
@@ -423,9 +501,14 @@ class ExpenseSerializer(serializers.ModelSerializer):
             'payment_method',       # 결제 수단
             'amount',               # 금액
             'receipt_detail',       # 영수증 상세
-            'created_at'            # 생성 일시
+            'created_at',           # 생성 일시
+            'updated_at'            # 수정 일시 (자동 갱신)
         ]
         read_only_fields = ['created_at']
+        sparse_sources = {  # SerializerMethodField가 사용하는 모델 필드 (?fields= 조회 시 필요한 컬럼만 조회)
+            'user_info': ['user__name', 'user__department', 'user__position'],
+            'vehicle_info': ['vehicle', 'vehicle__vehicle_type', 'vehicle__license_plate_number', 'vehicle__company__name'],
+        }
 
     def get_user_info(self, obj):
         return {
@@ -441,4 +524,21 @@ class ExpenseSerializer(serializers.ModelSerializer):
                 "license_plate_number": obj.vehicle.license_plate_number,
                 "company": obj.vehicle.company.name
             }
+        return None
+
+    # 목록 응답용 (.values() 결과 한 행으로 위와 같은 값 생성, car_app.projections 참고)
+    def project_user_info(self, row):
+        return {
+            "name": row['user__name'],
+            "department": row['user__department'],
+            "position": row['user__position']
+        }
+
+    def project_vehicle_info(self, row):
+        if row['vehicle'] is not None:
+            return {
+                "vehicle_type": row['vehicle__vehicle_type'],
+                "license_plate_number": row['vehicle__license_plate_number'],
+                "company": row['vehicle__company__name']
+            }
         return None
\ No newline at end of file
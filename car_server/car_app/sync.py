@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+from django.utils import timezone
+from .projections import project
+
+
+
+# 모바일 앱 변경분 동기화 (GET /sync/?since=<토큰>)
+DEFAULT_SYNC = {
+    'LIMIT': 500,  # 종류별 한 번에 응답할 최대 행 수
+    'MAX_LIMIT': 2000,  # ?limit= 으로 지정할 수 있는 최대 값
+    'OVERLAP_SECONDS': 5,  # 다음 토큰을 응답 시각보다 이만큼 앞당김 (늦게 커밋된 트랜잭션의 변경을 놓치지 않도록)
+    'TOMBSTONE_RETENTION_DAYS': 90,  # 삭제 기록 보관 기간 (이보다 오래된 토큰은 전체 동기화 필요)
+}
+
+TOKEN_SALT = 'car_app.sync'
+
+
+def get_config():
+    return {**DEFAULT_SYNC, **getattr(settings, 'SYNC', {})}
+
+
+class InvalidToken(Exception):
+    pass
+
+
+class ExpiredToken(Exception):
+    pass
+
+
+
+def get_sources():
+    """
+    동기화 대상 (응답 키, 모델, Serializer, 변경 일시 필드) 목록을 반환합니다.
+    삭제 기록(Tombstone)은 응답의 deleted에 종류별 ID 목록으로 들어갑니다.
+    """
+    from .models import CustomUser, Notice, Vehicle, DrivingRecord, Maintenance, Expense, Tombstone
+    from .serializers import CustomUserSerializer, NoticeSerializer, VehicleSerializer, DrivingRecordSerializer, MaintenanceSerializer, ExpenseSerializer
+    return [
+        ('users', CustomUser, CustomUserSerializer, 'updated_at'),
+        ('notices', Notice, NoticeSerializer, 'updated_at'),
+        ('vehicles', Vehicle, VehicleSerializer, 'updated_at'),
+        ('driving_records', DrivingRecord, DrivingRecordSerializer, 'updated_at'),
+        ('maintenances', Maintenance, MaintenanceSerializer, 'updated_at'),
+        ('expenses', Expense, ExpenseSerializer, 'updated_at'),
+        ('deleted', Tombstone, None, 'deleted_at'),
+    ]
+
+
+def record_tombstone(sender, instance, using, **kwargs):
+    """
+    동기화 대상 행이 삭제되면 삭제 기록을 남깁니다. (post_delete 시그널, 차량 삭제에 따른 운행 기록 삭제 등 CASCADE 포함)
+    """
+    from .models import Tombstone
+    key = next((key for key, model, _, _ in get_sources() if model is sender), None)
+    if key is None or instance.company_id is None:
+        return
+    Tombstone.objects.using(using).create(company_id=instance.company_id, model=key, object_id=instance.pk)
+
+
+
+# 토큰: 변경 일시(마이크로초)와, 같은 일시의 행이 페이지 경계에 걸린 종류의 마지막 ID
+def to_micros(moment):
+    return int(moment.timestamp()) * 1_000_000 + moment.microsecond
+
+
+def from_micros(micros):
+    return datetime.fromtimestamp(micros // 1_000_000, tz=dt_timezone.utc).replace(microsecond=micros % 1_000_000)
+
+
+def encode_token(micros, last_ids=None):
+    return signing.dumps({'t': micros, 'k': last_ids or {}}, salt=TOKEN_SALT)
+
+
+def decode_token(token):
+    """
+    토큰을 (변경 일시(마이크로초), 종류별 마지막 ID)로 변환합니다.
+    서명이 맞지 않으면 InvalidToken, 삭제 기록 보관 기간보다 오래되었으면 ExpiredToken을 발생시킵니다.
+    """
+    try:
+        payload = signing.loads(token, salt=TOKEN_SALT)
+        micros, last_ids = int(payload['t']), {str(key): int(pk) for key, pk in payload['k'].items()}
+    except (signing.BadSignature, KeyError, TypeError, ValueError, AttributeError):
+        raise InvalidToken
+    retention = timedelta(days=get_config()['TOMBSTONE_RETENTION_DAYS'])
+    if from_micros(micros) < timezone.now() - retention:
+        raise ExpiredToken
+    return micros, last_ids
+
+
+
+def changes_since(company, token, limit, request):
+    """
+    회사의 동기화 대상 행 중 토큰 이후에 변경된 행과 삭제된 행의 ID를 반환합니다.
+    종류마다 (회사, 변경 일시) 색인으로 범위 조회를 한 번 하며, (변경 일시, ID) 순으로 최대 limit 건을 가져옵니다.
+    반환 값: (종류별 변경된 행, 종류별 삭제된 ID, 다음 토큰, 남은 변경이 있는지 여부)
+
+    토큰 이후 변경을 놓치지 않는 대신, 이미 받은 행이 다시 포함될 수 있으므로 클라이언트는 ID 기준으로 덮어쓰면 됩니다.
+    - 한 종류라도 limit 건을 넘으면(has_more) 다음 토큰은 잘린 종류 중 가장 이른 마지막 변경 일시에서 시작합니다.
+    - 모두 받은 경우 다음 토큰은 응답 시각에서 OVERLAP_SECONDS를 뺀 시각(토큰보다 이르면 그대로)입니다.
+    """
+    started = timezone.now()
+    since, last_ids = decode_token(token) if token else (None, {})
+    changes, deleted, boundaries = {}, {}, {}
+    for key, model, serializer_class, field in get_sources():
+        if key == 'deleted' and since is None:  # 처음 동기화할 때는 삭제 기록이 필요 없음
+            continue
+        queryset = model.objects.filter(company=company)
+        if since is not None:
+            moment = from_micros(since)
+            if key in last_ids:
+                queryset = queryset.filter(Q(**{f'{field}__gt': moment}) | Q(**{field: moment, 'pk__gt': last_ids[key]}))
+            else:
+                queryset = queryset.filter(**{f'{field}__gte': moment})
+        queryset = queryset.order_by(field, 'pk')
+
+        if key == 'deleted':
+            rows = list(queryset.values_list('model', 'object_id', 'deleted_at', 'pk')[:limit + 1])
+            if len(rows) > limit:
+                rows = rows[:limit]
+                boundaries[key] = (rows[-1][2], rows[-1][3])
+            for model_key, object_id, _, _ in rows:
+                deleted.setdefault(model_key, []).append(object_id)
+            continue
+
+        queryset = serializer_class.prune(queryset, request)
+        rows = project(serializer_class(queryset[:limit + 1], many=True, context={'request': request}))
+        if len(rows) > limit:
+            rows = rows[:limit]
+            # 응답 필드(?fields=)에 없을 수 있으므로 경계 행의 (변경 일시, ID)는 같은 범위에서 따로 조회
+            boundaries[key] = queryset.values_list(field, 'pk')[limit - 1]
+        changes[key] = rows
+
+    if boundaries:
+        moment = min(moment for moment, _ in boundaries.values())
+        micros = to_micros(moment)
+        next_token = encode_token(micros, {key: pk for key, (value, pk) in boundaries.items() if value == moment})
+    else:
+        micros = to_micros(started - timedelta(seconds=get_config()['OVERLAP_SECONDS']))
+        next_token = token if since is not None and micros <= since else encode_token(micros)
+    return changes, deleted, next_token, bool(boundaries)
+
+
+def purge_tombstones(days=None):
+    """
+    보관 기간이 지난 삭제 기록을 삭제하고 삭제한 건수를 반환합니다.
+    """
+    from .models import Tombstone
+    days = get_config()['TOMBSTONE_RETENTION_DAYS'] if days is None else days
+    return Tombstone.objects.filter(deleted_at__lt=timezone.now() - timedelta(days=days)).delete()[0]
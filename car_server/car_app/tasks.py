@@ -0,0 +1,206 @@
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger('car_app.tasks')
+
+
+
+# DB 기반 백그라운드 작업 큐 (외부 브로커 없이 run_tasks 워커가 처리)
+DEFAULT_TASK_QUEUE = {
+    'ALWAYS_EAGER': False,  # True이면 트랜잭션 커밋 직후 요청 스레드에서 바로 실행 (개발/테스트용, 실패한 작업의 재시도는 워커가 처리)
+    'MAX_ATTEMPTS': 5,  # 실패 시 최대 실행 횟수
+    'RETRY_DELAY': 10,  # 첫 재시도까지 대기 시간(초). 재시도마다 두 배로 늘어남
+    'LEASE_SECONDS': 300,  # 워커가 이 시간 안에 끝내지 못한 작업은 다른 워커가 다시 가져감 (워커 비정상 종료 대비)
+    'POLL_INTERVAL': 1.0,  # 대기 중인 작업이 없을 때 다시 확인하기까지 대기 시간(초)
+    'BATCH_SIZE': 20,  # 워커가 한 번에 가져오는 작업 수
+    'RETENTION_DAYS': 7,  # 완료된 작업을 보관하는 기간
+}
+
+_handlers = {}  # 작업 이름 -> (핸들러 함수, 최대 실행 횟수)
+
+
+def get_config():
+    return {**DEFAULT_TASK_QUEUE, **getattr(settings, 'TASK_QUEUE', {})}
+
+
+def task(name, max_attempts=None):
+    """
+    작업 핸들러를 등록합니다. 실패 시 재시도되므로 핸들러는 같은 인자로 여러 번 실행되어도
+    결과가 같도록(멱등) 작성해야 합니다. 핸들러의 변경 내용과 작업 완료 표시는 같은 트랜잭션으로 저장됩니다.
+    """
+    def decorator(function):
+        _handlers[name] = (function, max_attempts)
+        return function
+    return decorator
+
+
+def enqueue(name, company_id=None, delay=0, **kwargs):
+    """
+    작업을 큐에 추가합니다. 작업 행은 현재 트랜잭션과 함께 저장되므로 요청이 롤백되면 작업도 취소되고,
+    워커는 커밋된 데이터에 대해서만 작업을 실행합니다. kwargs는 JSON으로 저장할 수 있는 값이어야 합니다.
+    ALWAYS_EAGER이면 커밋 직후 요청 스레드에서 워커와 같은 방법으로 실행합니다. (run_eager)
+    """
+    if name not in _handlers:
+        raise ValueError(f"Unknown task: {name}")
+    _, max_attempts = _handlers[name]
+    config = get_config()
+
+    from .models import Task
+    queued = Task.objects.create(
+        name=name,
+        company_id=company_id,
+        kwargs=kwargs,
+        max_attempts=max_attempts or config['MAX_ATTEMPTS'],
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+    if config['ALWAYS_EAGER'] and not delay:
+        # robust=True: 실행 중 오류가 나도 이미 커밋된 요청의 응답은 그대로 보냄 (오류는 로그로 남음)
+        transaction.on_commit(lambda: run_eager(queued.pk), robust=True)
+    return queued
+
+
+def run_eager(task_id):
+    """
+    작업 하나를 바로 가져와 실행합니다. (ALWAYS_EAGER, 개발/테스트용)
+    실패하면 워커와 같이 Task에 오류와 재시도 시각이 기록되고, 재시도는 run_tasks 워커가 처리합니다.
+    """
+    from .models import Task
+    worker = Worker(worker_id=f'eager:{socket.gethostname()}:{os.getpid()}')
+    if worker.take(task_id, timezone.now()):
+        worker.execute(Task.objects.get(pk=task_id))
+
+
+
+class LeaseLost(Exception):
+    """
+    작업 실행 중 임대 시간이 지나 다른 워커가 작업을 가져간 경우 (변경 내용을 롤백)
+    """
+
+
+
+class Worker:
+    """
+    대기 중인 작업을 가져와 실행합니다. 작업마다 조건부 UPDATE로 상태를 바꿔 가져가므로
+    SELECT ... FOR UPDATE SKIP LOCKED가 없는 SQLite에서도 여러 워커가 같은 작업을 중복 실행하지 않습니다.
+    """
+    def __init__(self, worker_id=None, config=None):
+        self.worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+        self.config = config or get_config()
+
+    def requeue_expired(self):
+        """
+        임대 시간이 지난 실행 중 작업을 다시 대기 상태로 돌립니다. (실행 횟수를 다 쓴 작업은 실패 처리)
+        """
+        from .models import Task
+        now = timezone.now()
+        expired = Task.objects.filter(status=Task.RUNNING, locked_at__lt=now - timedelta(seconds=self.config['LEASE_SECONDS']))
+        expired.filter(attempts__gte=F('max_attempts')).update(
+            status=Task.FAILED, locked_by='', locked_at=None, finished_at=now, last_error="작업 임대 시간이 지났습니다."
+        )
+        return expired.update(status=Task.PENDING, locked_by='', locked_at=None)
+
+    def take(self, task_id, now):
+        """
+        대기 중인 작업을 실행 중으로 바꿉니다. 다른 워커가 먼저 가져갔으면 False를 반환합니다.
+        """
+        from .models import Task
+        return bool(Task.objects.filter(pk=task_id, status=Task.PENDING).update(
+            status=Task.RUNNING, locked_by=self.worker_id, locked_at=now, attempts=F('attempts') + 1
+        ))
+
+    def claim(self):
+        from .models import Task
+        now = timezone.now()
+        candidates = Task.objects.filter(status=Task.PENDING, run_at__lte=now).order_by('run_at', 'id').values_list('pk', flat=True)
+        claimed = [pk for pk in candidates[:self.config['BATCH_SIZE']] if self.take(pk, now)]
+        return list(Task.objects.filter(pk__in=claimed).order_by('run_at', 'id'))
+
+    def execute(self, task):
+        from .models import Task
+        owned = Task.objects.filter(pk=task.pk, status=Task.RUNNING, locked_by=self.worker_id)
+        try:
+            if task.name not in _handlers:
+                raise LookupError(f"Unknown task: {task.name}")
+            with transaction.atomic():
+                _handlers[task.name][0](**task.kwargs)
+                if not owned.update(status=Task.DONE, finished_at=timezone.now(), last_error=''):
+                    raise LeaseLost
+        except LeaseLost:
+            logger.warning("작업 %s(%s)의 임대 시간이 지나 결과를 버렸습니다.", task.pk, task.name)
+            return False
+        except Exception:
+            error = traceback.format_exc()
+            if task.attempts >= task.max_attempts:
+                owned.update(status=Task.FAILED, finished_at=timezone.now(), locked_by='', locked_at=None, last_error=error)
+                logger.error("작업 %s(%s)이 %s회 실패했습니다.\n%s", task.pk, task.name, task.attempts, error)
+            else:
+                delay = self.config['RETRY_DELAY'] * 2 ** (task.attempts - 1)
+                owned.update(
+                    status=Task.PENDING, run_at=timezone.now() + timedelta(seconds=delay), locked_by='', locked_at=None, last_error=error
+                )
+                logger.warning("작업 %s(%s) 실패, %s초 후 재시도합니다. (%s/%s)", task.pk, task.name, delay, task.attempts, task.max_attempts)
+            return False
+        return True
+
+    def run_once(self):
+        """
+        대기 중인 작업을 한 번 가져와 실행하고, 실행한 작업 수를 반환합니다.
+        """
+        self.requeue_expired()
+        tasks = self.claim()
+        for claimed in tasks:
+            self.execute(claimed)
+        return len(tasks)
+
+    def purge(self):
+        from .models import Task
+        cutoff = timezone.now() - timedelta(days=self.config['RETENTION_DAYS'])
+        return Task.objects.filter(status=Task.DONE, finished_at__lt=cutoff).delete()[0]
+
+    def run(self, burst=False):
+        """
+        작업을 계속 처리합니다. burst=True이면 대기 중인 작업이 없을 때 종료합니다.
+        """
+        last_purge = 0
+        while True:
+            if time.monotonic() - last_purge > 3600:
+                self.purge()
+                last_purge = time.monotonic()
+            if not self.run_once():
+                if burst:
+                    return
+                time.sleep(self.config['POLL_INTERVAL'])
+
+
+
+# 작업 핸들러 (운행/정비 기록 저장 시 요청 처리와 분리해도 되는 부가 작업)
+@task('driving_record.create_expenses')
+def create_driving_record_expenses(record_id):
+    from .models import DrivingRecord
+    record = DrivingRecord.objects.select_related('vehicle', 'user').filter(pk=record_id).first()
+    if record is not None:  # 실행 전에 삭제된 운행 기록은 건너뜀
+        record.create_expenses()
+
+
+@task('driving_record.update_vehicle_usage')
+def update_vehicle_usage(record_id):
+    from .models import DrivingRecord, Vehicle
+    record = DrivingRecord.objects.filter(pk=record_id).first()
+    if record is not None:
+        Vehicle.add_usage(record)
+
+
+@task('maintenance.create_expense')
+def create_maintenance_expense(maintenance_id):
+    from .models import Maintenance
+    maintenance = Maintenance.objects.select_related('vehicle').filter(pk=maintenance_id).first()
+    if maintenance is not None:
+        maintenance.create_expense()
@@ -1,3 +1,866 @@
-from django.test import TestCase
+import datetime
+import io
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from . import locations
+from .models import Company, CustomUser, DrivingRecord, Expense, IdempotencyKey, Location, Maintenance, Notice, NoticeReadState, OdometerAnomaly, OdometerCheckRun, Task, UserDrivingStat, Vehicle, VehicleFuelStat
+from .fuel import month_range, ranking, slope, trends
+from .odometer import check as check_odometer, run as run_odometer_check
+from .projections import project
+from .segmentation import apply_suggestions, detect_segments, suggest, timed_points
+from .serializers import DrivingRecordSerializer, ExpenseSerializer, MaintenanceSerializer
+from .sync import encode_token, to_micros
+from .tasks import Worker, enqueue, task
+from .throttling import LocMemBucketBackend, SQLiteBucketBackend, get_backend as get_login_throttle_backend
 
-# Create your tests here.
+
+
+def make_company(number='111'):
+    return Company.objects.create(name=f'회사 {number}', business_registration_number=number)
+
+
+def make_user(company, email='user@example.com', phone_number='01000000000', name='홍길동'):
+    return CustomUser.objects.create(email=email, phone_number=phone_number, name=name, department='영업', position='대리', company=company)
+
+
+def make_vehicle(company, plate='12가3456', total_mileage=1000):
+    return Vehicle.objects.create(
+        vehicle_category='내연기관', vehicle_type='K5', car_registration_number=plate, license_plate_number=plate,
+        purchase_date=datetime.date(2024, 1, 1), purchase_price=Decimal('100.00'), total_mileage=total_mileage, company=company,
+    )
+
+
+def make_record(vehicle, user, departure_mileage, arrival_mileage, departure_time, minutes=60, coordinates=None, **extra):
+    return DrivingRecord.objects.create(
+        vehicle=vehicle, user=user, departure_location='서울', arrival_location='부산',
+        departure_mileage=departure_mileage, arrival_mileage=arrival_mileage, driving_distance=arrival_mileage - departure_mileage,
+        departure_time=departure_time, arrival_time=departure_time + datetime.timedelta(minutes=minutes),
+        driving_time=datetime.timedelta(minutes=minutes), coordinates=[[37.5, 127.0], [37.6, 127.1]] if coordinates is None else coordinates,
+        **extra,
+    )
+
+
+
+# 목록 응답용 읽기 모델 (car_app.projections) - .values() 조회 결과가 serializer.data와 바이트 단위로 같은지 확인
+class ProjectionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = make_company()
+        cls.user = make_user(cls.company)
+        cls.vehicle = make_vehicle(cls.company)
+        departure = datetime.datetime(2024, 5, 1, 9, 0, 30, 123456, tzinfo=datetime.timezone.utc)  # 마이크로초까지 같은 형식인지 확인
+        cls.record = make_record(cls.vehicle, cls.user, 0, 100, departure, fuel_cost=Decimal('30.50'), toll_fee=Decimal('1.20'))
+        make_record(cls.vehicle, cls.user, 100, 150, departure + datetime.timedelta(days=1), coordinates=[], driving_purpose=DrivingRecord.BUSINESS)
+        Maintenance.objects.create(vehicle=cls.vehicle, maintenance_date=datetime.date(2024, 5, 2), maintenance_type=Maintenance.TIRE_CHANGE, maintenance_cost=Decimal('80.00'))
+        Maintenance.objects.create(vehicle=cls.vehicle, maintenance_date=datetime.date(2024, 5, 3), maintenance_cost=Decimal('5.00'), maintenance_description='세차')
+        Expense.objects.create(expense_type='지출', expense_date=datetime.date(2024, 5, 1), user=cls.user, vehicle=cls.vehicle, details='유류비', amount=Decimal('30.50'))
+        Expense.objects.create(
+            expense_type='정비', expense_date=datetime.date(2024, 5, 2), status='승인', user=cls.user, vehicle=cls.vehicle,
+            details='타이어 교체', amount=Decimal('80.00'), receipt_detail='receipts/영수증 1.pdf',
+        )
+
+    def assertProjected(self, serializer_class, queryset, params=None):
+        request = Request(APIRequestFactory().get('/api/records/', params or {}))
+        queryset = serializer_class.prune(queryset.order_by('id'), request)
+        serializer = serializer_class(queryset, many=True, context={'request': request})
+        expected = JSONRenderer().render(serializer.data)
+        self.assertEqual(JSONRenderer().render(project(serializer)), expected)
+        return expected
+
+    def test_driving_records(self):
+        self.assertProjected(DrivingRecordSerializer, DrivingRecord.objects.filter(company=self.company))
+
+    def test_maintenances(self):
+        self.assertProjected(MaintenanceSerializer, Maintenance.objects.filter(company=self.company))
+
+    def test_expenses(self):
+        body = self.assertProjected(ExpenseSerializer, Expense.objects.filter(company=self.company))
+        self.assertIn(b'http://testserver/', body)  # 영수증 파일은 요청 기준 절대 URL
+
+    def test_fields(self):
+        self.assertProjected(DrivingRecordSerializer, DrivingRecord.objects.all(), {'fields': 'id,user_name,departure_time,coordinates_archived'})
+        self.assertProjected(MaintenanceSerializer, Maintenance.objects.all(), {'fields': 'id,vehicle_info,maintenance_type_display'})
+        self.assertProjected(ExpenseSerializer, Expense.objects.all(), {'fields': 'id,user_info,receipt_detail'})
+
+    def test_omit(self):
+        self.assertProjected(DrivingRecordSerializer, DrivingRecord.objects.all(), {'omit': 'coordinates,user_name'})
+        self.assertProjected(MaintenanceSerializer, Maintenance.objects.all(), {'omit': 'vehicle_info'})
+        self.assertProjected(ExpenseSerializer, Expense.objects.all(), {'omit': 'vehicle_info,receipt_detail'})
+
+    def test_null_relation(self):
+        # 회사가 없는 차량의 정비 기록 (vehicle__company__name 이 비어 있음)
+        vehicle = make_vehicle(None, plate='34나5678')
+        Maintenance.objects.create(vehicle=vehicle, maintenance_date=datetime.date(2024, 6, 1), maintenance_cost=Decimal('1.00'))
+        body = self.assertProjected(MaintenanceSerializer, Maintenance.objects.filter(vehicle=vehicle))
+        self.assertIn(b'"company":null', body)
+
+    def test_archived_coordinates(self):
+        DrivingRecord.objects.filter(pk=self.record.pk).update(coordinates=[], coordinates_archive='1/2024-05.zip')
+        body = self.assertProjected(DrivingRecordSerializer, DrivingRecord.objects.all())
+        self.assertIn(b'"coordinates_archived":true', body)
+
+
+
+# 로그인 시도 제한 토큰 버킷 (car_app.throttling)
+class BucketBackendTests(TestCase):
+    def assertBucket(self, backend, clock):
+        # 용량 2, 초당 1개 회복
+        clock.return_value = 100.0
+        self.assertEqual(backend.consume('k', 2, 1), (True, 0))
+        self.assertEqual(backend.consume('k', 2, 1), (True, 0))
+        self.assertEqual(backend.consume('k', 2, 1), (False, 1))
+        clock.return_value = 100.5  # 거절된 시도는 토큰을 쓰지 않으므로 남은 대기 시간만 줄어듦
+        self.assertEqual(backend.consume('k', 2, 1), (False, 0.5))
+        clock.return_value = 101.0
+        self.assertEqual(backend.consume('k', 2, 1), (True, 0))
+        self.assertEqual(backend.consume('other', 2, 1), (True, 0))  # 키마다 별도 버킷
+        clock.return_value = 200.0  # 오래 지나도 용량 이상으로 채워지지 않음
+        self.assertEqual([backend.consume('k', 2, 1)[0] for _ in range(3)], [True, True, False])
+
+    def test_locmem(self):
+        with mock.patch('car_app.throttling.time.monotonic') as clock:
+            self.assertBucket(LocMemBucketBackend(), clock)
+
+    def test_locmem_evicts_least_recently_used(self):
+        backend = LocMemBucketBackend(max_entries=2)
+        with mock.patch('car_app.throttling.time.monotonic', return_value=100.0):
+            backend.consume('a', 1, 1)
+            backend.consume('b', 1, 1)
+            backend.consume('a', 1, 1)  # a를 최근 사용으로 이동
+            backend.consume('c', 1, 1)  # b 제거
+            self.assertEqual(list(backend._buckets), ['a', 'c'])
+            self.assertEqual(backend.consume('b', 1, 1), (True, 0))  # 제거된 버킷은 가득 찬 상태로 다시 시작
+
+    def test_sqlite(self):
+        with tempfile.TemporaryDirectory() as directory, mock.patch('car_app.throttling.time.time') as clock:
+            backend = SQLiteBucketBackend(path=Path(directory) / 'throttle.sqlite3')
+            self.assertBucket(backend, clock)
+            backend.incr('allowed')
+            backend.incr('allowed')
+            self.assertEqual(backend.get_counters(), {'allowed': 2})
+            backend._connect().close()
+
+
+
+class LoginRateThrottleTests(TestCase):
+    def setUp(self):
+        self.backend = get_login_throttle_backend()
+        self.backend.reset()
+        self.addCleanup(self.backend.reset)
+
+    def login(self, identifier, forwarded_for=None):
+        headers = {'HTTP_X_FORWARDED_FOR': forwarded_for} if forwarded_for else {}
+        return APIClient().post('/api/login/', {'email_or_phone': identifier, 'password': 'wrong'}, format='json', **headers)
+
+    def test_identifier_bucket(self):
+        # 같은 식별자는 대소문자/공백과 관계없이 10회까지 (settings.LOGIN_THROTTLE['IDENTIFIER'])
+        for attempt in range(10):
+            self.assertEqual(self.login(' User@Example.com' if attempt % 2 else 'user@example.com').status_code, 400)
+        response = self.login('user@example.com')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(self.login('other@example.com').status_code, 400)
+        self.assertEqual(self.backend.get_counters(), {'allowed': 11, 'rejected_identifier': 1})
+
+    def test_ip_bucket_ignores_forwarded_for(self):
+        # NUM_PROXIES=0 이면 X-Forwarded-For를 바꿔도 같은 IP(REMOTE_ADDR)로 집계
+        for attempt in range(20):
+            self.assertEqual(self.login(f'user{attempt}@example.com', forwarded_for=f'10.0.0.{attempt}').status_code, 400)
+        self.assertEqual(self.login('new@example.com', forwarded_for='10.0.1.1').status_code, 429)
+        self.assertEqual(self.backend.get_counters()['rejected_ip'], 1)
+
+
+
+# 모바일 앱 변경분 동기화 (GET /api/sync/)
+class SyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = make_company()
+        cls.user = make_user(cls.company)
+        other = make_company('222')
+        make_vehicle(other, plate='99허9999')  # 다른 회사의 차량은 포함되지 않음
+        cls.vehicles = [make_vehicle(cls.company, plate=f'12가{index:04d}') for index in range(5)]
+        cls.moment = timezone.now() - datetime.timedelta(days=1)
+        CustomUser.objects.filter(pk=cls.user.pk).update(updated_at=cls.moment - datetime.timedelta(hours=1))
+        Vehicle.objects.filter(company=cls.company).update(updated_at=cls.moment)  # 모두 같은 변경 일시 (페이지 경계에서 ID로 구분)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def sync(self, **params):
+        return self.client.get('/api/sync/', params)
+
+    def test_pages_without_gaps(self):
+        pages, token = [], None
+        for _ in range(10):
+            body = self.sync(limit=2, **({'since': token} if token else {})).json()
+            pages.append([row['id'] for row in body['changes'].get('vehicles', [])])
+            token = body['token']
+            if not body['has_more']:
+                break
+        self.assertEqual(pages, [[vehicle.pk for vehicle in self.vehicles[index:index + 2]] for index in range(0, 5, 2)])
+
+        # 모두 받은 뒤에는 새로 변경/삭제된 행만 포함
+        body = self.sync(since=token).json()
+        self.assertEqual(body['changes']['vehicles'], [])
+        self.assertFalse(body['has_more'])
+        vehicle = self.vehicles[0]
+        vehicle.total_mileage = 2000
+        vehicle.save()
+        deleted_id = self.vehicles[1].pk
+        self.vehicles[1].delete()
+        body = self.sync(since=body['token']).json()
+        self.assertEqual([row['id'] for row in body['changes']['vehicles']], [vehicle.pk])
+        self.assertEqual(body['deleted'], {'vehicles': [deleted_id]})
+
+    def test_fields(self):
+        body = self.sync(fields='id').json()
+        self.assertEqual(body['changes']['users'], [{'id': self.user.pk}])
+        self.assertEqual(len(body['changes']['vehicles']), 5)
+
+    def test_invalid_token(self):
+        token = encode_token(to_micros(self.moment))
+        self.assertEqual(self.sync(since=token[:-1] + ('A' if token[-1] != 'A' else 'B')).status_code, 400)
+        self.assertEqual(self.sync(since='not-a-token').status_code, 400)
+        self.assertEqual(self.sync(limit='many').status_code, 400)
+
+    def test_expired_token(self):
+        token = encode_token(to_micros(timezone.now() - datetime.timedelta(days=91)))  # settings.SYNC['TOMBSTONE_RETENTION_DAYS'] 초과
+        self.assertEqual(self.sync(since=token).status_code, 410)
+
+
+
+# 생성 API의 Idempotency-Key (car_app.idempotency)
+class IdempotencyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = make_company()
+        cls.user = make_user(cls.company)
+        cls.vehicle = make_vehicle(cls.company)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create(self, key, cost='10.00', **data):
+        body = {'vehicle': self.vehicle.pk, 'maintenance_date': '2024-05-01', 'maintenance_cost': cost, **data}
+        headers = {'HTTP_IDEMPOTENCY_KEY': key} if key is not None else {}
+        return self.client.post('/api/maintenances/create/', body, format='json', **headers)
+
+    def test_replay(self):
+        first = self.create('key-1')
+        self.assertEqual(first.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', first)
+        second = self.create('key-1')
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(Maintenance.objects.count(), 1)
+
+        # 키는 사용자별로 구분
+        other = APIClient()
+        other.force_authenticate(make_user(self.company, email='other@example.com', phone_number='01011111111'))
+        response = other.post('/api/maintenances/create/', {'vehicle': self.vehicle.pk, 'maintenance_date': '2024-05-01', 'maintenance_cost': '10.00'}, format='json', HTTP_IDEMPOTENCY_KEY='key-1')
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Maintenance.objects.count(), 2)
+
+    def test_different_request(self):
+        self.assertEqual(self.create('key-1').status_code, 201)
+        self.assertEqual(self.create('key-1', cost='20.00').status_code, 422)
+        self.assertEqual(Maintenance.objects.count(), 1)
+
+    def test_in_flight(self):
+        self.assertEqual(self.create('key-1').status_code, 201)
+        IdempotencyKey.objects.update(status_code=None, response=None)  # 첫 요청을 처리 중인 상태
+        response = self.create('key-1')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response['Retry-After'], '1')
+
+        # LOCK_SECONDS가 지난 처리 중 키는 다음 요청이 이어받아 처리
+        IdempotencyKey.objects.update(locked_at=timezone.now() - datetime.timedelta(minutes=5))
+        response = self.create('key-1')
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(IdempotencyKey.objects.get().status_code, 201)
+
+    def test_failure_is_not_stored(self):
+        self.assertEqual(self.create('key-1', cost='').status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.assertEqual(self.create('key-1').status_code, 201)  # 고친 요청을 같은 키로 다시 보낼 수 있음
+
+    def test_expired_key(self):
+        self.assertEqual(self.create('key-1').status_code, 201)
+        IdempotencyKey.objects.update(expires_at=timezone.now() - datetime.timedelta(seconds=1))
+        response = self.create('key-1', cost='20.00')
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Maintenance.objects.count(), 2)
+
+    def test_header(self):
+        self.assertEqual(self.create(None).status_code, 201)
+        self.assertEqual(self.create(None).status_code, 201)  # 헤더가 없으면 매번 생성
+        self.assertEqual(self.create('x' * 256).status_code, 400)
+        self.assertEqual(Maintenance.objects.count(), 2)
+
+
+
+# GPS 좌표로 운행 기록 나누기 (car_app.segmentation)
+class SegmentationTests(TestCase):
+    START = datetime.datetime(2024, 5, 1, 9, 0, tzinfo=datetime.timezone.utc)
+
+    def route(self, longitudes):
+        # 위도 37.5에서 경도만 바뀌는 1분 간격 좌표 (경도 0.01도 ≈ 880m)
+        return [(index, 37.5, longitude, self.START + datetime.timedelta(minutes=index)) for index, longitude in enumerate(longitudes)]
+
+    def spans(self, points, **thresholds):
+        return [(segment['start_index'], segment['end_index']) for segment in detect_segments(points, **thresholds)]
+
+    def test_split_at_stop(self):
+        # 0~4 이동, 4~14 정차(10분), 14~18 이동
+        points = self.route([127.00, 127.01, 127.02, 127.03] + [127.04] * 11 + [127.05, 127.06, 127.07, 127.08])
+        segments = list(detect_segments(points))
+        self.assertEqual([(segment['start_index'], segment['end_index']) for segment in segments], [(0, 4), (14, 18)])
+        self.assertEqual(segments[0]['departure_time'], self.START)
+        self.assertEqual(segments[1]['departure_time'], self.START + datetime.timedelta(minutes=14))
+        self.assertAlmostEqual(segments[0]['distance_m'], segments[1]['distance_m'], delta=1)
+        self.assertAlmostEqual(segments[0]['distance_m'], 3531, delta=10)
+
+    def test_short_dwell_is_not_a_stop(self):
+        points = self.route([127.00, 127.01] + [127.02] * 10 + [127.03])  # 9분 정차 (DWELL_SECONDS 미만)
+        self.assertEqual(self.spans(points), [(0, 12)])
+        self.assertEqual(self.spans(points, dwell=300), [(0, 2), (11, 12)])
+
+    def test_ends_with_stop(self):
+        points = self.route([127.00, 127.01, 127.02] + [127.03] * 12)
+        self.assertEqual(self.spans(points), [(0, 3)])  # 마지막 정차의 첫 좌표에 도착
+
+    def test_short_trip_between_stops(self):
+        # 정차 사이의 100m 이동(주차장 안 이동 등)은 운행으로 나누지 않음
+        points = self.route([127.00, 127.01] + [127.02] * 11 + [127.0211] * 11 + [127.03, 127.04])
+        self.assertEqual(self.spans(points, radius=50), [(0, 2), (23, 25)])
+
+    def test_no_movement(self):
+        points = self.route([127.0] * 5)
+        self.assertEqual(self.spans(points), [(0, 4)])  # 나눈 구간이 없으면 짧더라도 전체를 하나의 구간으로
+        self.assertEqual(self.spans([]), [])
+
+    def test_single_pass(self):
+        # 좌표를 한 번씩만 읽으며, 첫 구간은 정차를 벗어나는 좌표까지만 읽고 반환
+        consumed = []
+        def points():
+            for point in self.route([127.00, 127.01] + [127.02] * 11 + [127.03] * 20):
+                consumed.append(point[0])
+                yield point
+        segments = detect_segments(points())
+        self.assertEqual(next(segments)['end_index'], 2)
+        self.assertEqual(consumed, list(range(14)))
+
+    def test_timed_points(self):
+        end = self.START + datetime.timedelta(hours=1)
+        self.assertEqual([point[3] for point in timed_points([[37.5, 127.0], [37.5, 127.1], [37.5, 127.2]], self.START, end)],
+                         [self.START, self.START + datetime.timedelta(minutes=30), end])
+        points = list(timed_points([[37.5, 127.0, self.START.timestamp()], [37.5, 127.1, '2024-05-01T09:10:00Z']], self.START, end))
+        self.assertEqual([point[3] for point in points], [self.START, self.START + datetime.timedelta(minutes=10)])
+        with self.assertRaises(ValueError):
+            list(timed_points([[37.5, 127.0, 'yesterday']], self.START, end))
+
+    def test_apply_suggestions(self):
+        company = make_company()
+        user = make_user(company)
+        vehicle = make_vehicle(company)
+        longitudes = [127.00, 127.01, 127.02, 127.03] + [127.04] * 11 + [127.05, 127.06, 127.07, 127.08]
+        coordinates = [[37.5, longitude] for longitude in longitudes]
+        record = make_record(vehicle, user, 1000, 1080, self.START, minutes=len(coordinates) - 1, coordinates=coordinates, fuel_cost=Decimal('30.00'))
+        UserDrivingStat.add_record(record)
+
+        suggestions = suggest(record, coordinates)
+        self.assertEqual([(item['departure_mileage'], item['arrival_mileage']) for item in suggestions], [(1000, 1040), (1040, 1080)])
+        self.assertEqual([(item['departure_location'], item['arrival_location']) for item in suggestions], [('서울', '37.50000,127.04000'), ('37.50000,127.04000', '부산')])
+
+        records = apply_suggestions(record, coordinates, suggestions)
+        self.assertEqual([(item.departure_mileage, item.arrival_mileage, item.fuel_cost) for item in records], [(1000, 1040, Decimal('30.00')), (1040, 1080, None)])
+        self.assertEqual(records[1].coordinates, coordinates[14:])
+        self.assertEqual(UserDrivingStat.objects.get(user=user).trip_count, 2)
+        # 좌표로 만든 중간 정차 지점 이름은 장소 사전에 등록하지 않음
+        self.assertEqual(sorted(Location.objects.filter(company=company).values_list('name', flat=True)), ['부산', '서울'])
+
+
+
+# 차량별 연속 운행 기록의 주행거리 점검 (car_app.odometer)
+class OdometerCheckTests(TestCase):
+    START = datetime.datetime(2024, 5, 1, 9, 0, tzinfo=datetime.timezone.utc)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = make_company()
+        cls.user = make_user(cls.company)
+        cls.vehicle = make_vehicle(cls.company)
+        cls.other_vehicle = make_vehicle(cls.company, plate='34나5678')
+        day = datetime.timedelta(days=1)
+        cls.first = make_record(cls.vehicle, cls.user, 0, 100, cls.START)
+        cls.gap = make_record(cls.vehicle, cls.user, 120, 150, cls.START + day)  # 100 → 120
+        cls.rollback = make_record(cls.vehicle, cls.user, 140, 160, cls.START + day * 2)  # 150 → 140
+        cls.overlap = make_record(cls.vehicle, cls.user, 160, 170, cls.START + day * 2 + datetime.timedelta(minutes=30))  # 직전 운행 도착 전에 출발
+        # 다른 차량은 별도로 비교 (첫 운행은 다른 차량의 마지막 운행과 비교하지 않음)
+        cls.other_first = make_record(cls.other_vehicle, cls.user, 0, 50, cls.START)
+        cls.other_second = make_record(cls.other_vehicle, cls.user, 50, 90, cls.START + day)
+        DrivingRecord.objects.update(updated_at=timezone.now() - datetime.timedelta(hours=1))  # 증분 점검의 OVERLAP_SECONDS 밖
+
+    def anomalies(self):
+        return sorted(OdometerAnomaly.objects.values_list('record_id', 'previous_record_id', 'kind', 'previous_arrival_mileage', 'departure_mileage'))
+
+    def test_check(self):
+        self.assertEqual(check_odometer(), 3)
+        self.assertEqual(self.anomalies(), sorted([
+            (self.gap.pk, self.first.pk, OdometerAnomaly.GAP, 100, 120),
+            (self.rollback.pk, self.gap.pk, OdometerAnomaly.ROLLBACK, 150, 140),
+            (self.overlap.pk, self.rollback.pk, OdometerAnomaly.OVERLAP, 160, 160),
+        ]))
+        self.assertEqual(check_odometer(batch_size=1), 3)  # 다시 점검해도 중복 저장하지 않음
+        self.assertEqual(OdometerAnomaly.objects.count(), 3)
+
+    def test_both_flags(self):
+        # 주행거리 이상과 시간 겹침이 함께 있으면 이상을 각각 저장
+        DrivingRecord.objects.filter(pk=self.other_second.pk).update(departure_mileage=40, departure_time=self.START + datetime.timedelta(minutes=30))
+        check_odometer([self.other_vehicle.pk])
+        self.assertEqual(sorted(OdometerAnomaly.objects.filter(vehicle=self.other_vehicle).values_list('kind', flat=True)), [OdometerAnomaly.OVERLAP, OdometerAnomaly.ROLLBACK])
+
+    def test_check_scope(self):
+        check_odometer()
+        DrivingRecord.objects.filter(pk=self.gap.pk).update(departure_mileage=100)
+        self.assertEqual(check_odometer([self.other_vehicle.pk]), 0)  # 점검 대상이 아닌 차량의 이상은 그대로
+        self.assertEqual(OdometerAnomaly.objects.count(), 3)
+        self.assertEqual(check_odometer([self.vehicle.pk, self.other_vehicle.pk], batch_size=1), 2)
+        self.assertEqual(set(OdometerAnomaly.objects.values_list('kind', flat=True)), {OdometerAnomaly.ROLLBACK, OdometerAnomaly.OVERLAP})
+
+    def test_incremental_run(self):
+        first = run_odometer_check()
+        self.assertTrue(first.full)
+        self.assertEqual(first.anomalies, 3)
+        OdometerCheckRun.objects.filter(pk=first.pk).update(started_at=timezone.now() - datetime.timedelta(minutes=30))
+
+        second = run_odometer_check()
+        self.assertEqual((second.full, second.vehicles, second.anomalies), (False, 0, 0))
+        self.assertEqual(OdometerAnomaly.objects.count(), 3)
+        OdometerCheckRun.objects.filter(pk=second.pk).update(started_at=timezone.now() - datetime.timedelta(minutes=20))
+
+        # 수정된 운행 기록의 차량만 다시 점검
+        self.rollback.departure_mileage = 150
+        self.rollback.save()
+        third = run_odometer_check()
+        self.assertEqual((third.full, third.vehicles, third.anomalies), (False, 1, 2))
+        OdometerCheckRun.objects.filter(pk=third.pk).update(started_at=timezone.now() - datetime.timedelta(minutes=10))
+
+        # 운행 기록이 삭제된 차량도 다시 점검 (삭제된 기록 다음 운행은 그 이전 운행과 비교)
+        DrivingRecord.objects.get(pk=self.gap.pk).delete()
+        fourth = run_odometer_check()
+        self.assertEqual((fourth.full, fourth.vehicles), (False, 1))
+        self.assertEqual(self.anomalies(), sorted([
+            (self.rollback.pk, self.first.pk, OdometerAnomaly.GAP, 100, 150),
+            (self.overlap.pk, self.rollback.pk, OdometerAnomaly.OVERLAP, 160, 160),
+        ]))
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('check_odometer', '--full', stdout=out)
+        self.assertIn('이상: 3건', out.getvalue())
+
+
+
+# 공지사항 읽음 상태 (사용자당 한 행의 watermark와 안 읽은 수 캐시)
+class NoticeReadStateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = make_company()
+        cls.user = make_user(cls.company)
+        cls.notices = [Notice.objects.create(company=cls.company, title=f'공지 {index}', content='내용', created_by=cls.user) for index in range(3)]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def unread_count(self):
+        return self.client.get('/api/notices/unread-count/').json()['unread_count']
+
+    def test_first_lookup_creates_cached_row(self):
+        self.assertFalse(NoticeReadState.objects.filter(user=self.user).exists())
+        self.assertEqual(self.unread_count(), 3)
+        self.assertEqual(NoticeReadState.objects.get(user=self.user).unread_count, 3)
+        with self.assertNumQueries(1):  # 캐시된 행 조회만
+            self.assertEqual(NoticeReadState.for_user(self.user, create=False).get_unread_count(), 3)
+
+        Notice.objects.create(company=self.company, title='새 공지', content='내용', created_by=self.user)
+        self.assertEqual(self.unread_count(), 4)
+
+    def test_read(self):
+        self.client.get(f'/api/notices/{self.notices[1].pk}/')
+        self.assertEqual(self.unread_count(), 2)
+        body = self.client.get('/api/notices/all/').json()
+        self.assertEqual({notice['id']: notice['is_read'] for notice in body['notices']}, {notice.pk: notice.pk == self.notices[1].pk for notice in self.notices})
+        self.client.post('/api/notices/read-all/')
+        self.assertEqual(self.unread_count(), 0)
+
+
+
+# 응답 압축 (car_app.compression)
+@override_settings(RESPONSE_COMPRESSION={'ENABLED': True, 'MIN_SIZE': 10})
+class CompressionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = make_company()
+        cls.user = make_user(cls.company)
+        cls.user.set_password('Str0ngPass!x')
+        cls.user.save()
+
+    def setUp(self):
+        get_login_throttle_backend().reset()
+
+    def test_token_responses_are_not_compressed(self):
+        client = APIClient(HTTP_ACCEPT_ENCODING='gzip')
+        response = client.post('/api/login/', {'email_or_phone': self.user.email, 'password': 'Str0ngPass!x'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.json())
+        self.assertFalse(response.has_header('Content-Encoding'))
+        for path in ('/api/admin/login/', '/api/admin/register/'):
+            self.assertFalse(client.post(path, {}, format='json').has_header('Content-Encoding'))
+
+        client.force_authenticate(self.user)
+        response = client.get('/api/users/me/')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+
+
+# 백그라운드 작업 큐 (car_app.tasks)
+@task('test.create_company')
+def create_company_task(label, fail=False):
+    # 핸들러의 변경 내용이 작업 완료 표시와 함께 커밋/롤백되는지 확인하기 위해 행을 만든 뒤 실패할 수 있음
+    Company.objects.create(name=label, business_registration_number=f'{label}-{Company.objects.count()}')
+    if fail:
+        raise RuntimeError("작업 실패")
+
+
+@override_settings(TASK_QUEUE={'ALWAYS_EAGER': False, 'MAX_ATTEMPTS': 3, 'RETRY_DELAY': 10, 'LEASE_SECONDS': 300, 'BATCH_SIZE': 20})
+class TaskQueueTests(TestCase):
+    def companies(self, name):
+        return Company.objects.filter(name=name).count()
+
+    def test_enqueue_follows_transaction(self):
+        with transaction.atomic():
+            enqueue('test.create_company', label='rolled-back')
+            transaction.set_rollback(True)
+        self.assertFalse(Task.objects.exists())
+        with self.assertRaises(ValueError):
+            enqueue('test.unknown')
+
+    def test_run_once(self):
+        queued = enqueue('test.create_company', label='ok')
+        delayed = enqueue('test.create_company', delay=60, label='later')
+        self.assertEqual(Worker('w1').run_once(), 1)
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts, queued.locked_by), (Task.DONE, 1, 'w1'))
+        self.assertIsNotNone(queued.finished_at)
+        self.assertEqual(self.companies('ok'), 1)
+        self.assertEqual(Task.objects.get(pk=delayed.pk).status, Task.PENDING)  # 실행 예정 시각 전
+        self.assertEqual(Worker('w2').run_once(), 0)  # 완료된 작업은 다시 가져가지 않음
+
+    def test_retry_backoff(self):
+        queued = enqueue('test.create_company', label='fail', fail=True)
+        for attempt, delay in ((1, 10), (2, 20)):
+            before = timezone.now()
+            with self.assertLogs('car_app.tasks', 'WARNING'):
+                self.assertEqual(Worker().run_once(), 1)
+            queued.refresh_from_db()
+            self.assertEqual((queued.status, queued.attempts, queued.locked_by), (Task.PENDING, attempt, ''))
+            self.assertIn('RuntimeError: 작업 실패', queued.last_error)
+            self.assertGreaterEqual(queued.run_at, before + datetime.timedelta(seconds=delay))  # 재시도마다 두 배
+            self.assertLess(queued.run_at, before + datetime.timedelta(seconds=delay + 5))
+            self.assertEqual(Worker().run_once(), 0)  # 재시도 시각 전
+            Task.objects.filter(pk=queued.pk).update(run_at=timezone.now())
+        with self.assertLogs('car_app.tasks', 'ERROR'):
+            self.assertEqual(Worker().run_once(), 1)
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (Task.FAILED, 3))
+        self.assertEqual(self.companies('fail'), 0)  # 실패한 실행의 변경 내용은 모두 롤백
+
+    def test_lease_expiry(self):
+        queued = enqueue('test.create_company', label='lease')
+        slow = Worker('slow')
+        [claimed] = slow.claim()
+        Task.objects.filter(pk=queued.pk).update(locked_at=timezone.now() - datetime.timedelta(seconds=301))
+
+        # 임대 시간이 지난 작업은 다른 워커가 다시 가져가 실행
+        self.assertEqual(Worker('fast').run_once(), 1)
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.locked_by, queued.attempts), (Task.DONE, 'fast', 2))
+
+        # 늦게 끝난 원래 워커는 완료 표시를 하지 못하고 변경 내용을 롤백 (LeaseLost)
+        with self.assertLogs('car_app.tasks', 'WARNING'):
+            self.assertFalse(slow.execute(claimed))
+        self.assertEqual(self.companies('lease'), 1)
+        self.assertEqual(Task.objects.get(pk=queued.pk).locked_by, 'fast')
+
+    def test_expired_lease_without_attempts_left_fails(self):
+        queued = enqueue('test.create_company', label='stuck')
+        Task.objects.filter(pk=queued.pk).update(status=Task.RUNNING, attempts=3, locked_by='gone', locked_at=timezone.now() - datetime.timedelta(hours=1))
+        self.assertEqual(Worker().run_once(), 0)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Task.FAILED)
+        self.assertEqual(self.companies('stuck'), 0)
+
+    @override_settings(TASK_QUEUE={'ALWAYS_EAGER': True, 'MAX_ATTEMPTS': 3, 'RETRY_DELAY': 10})
+    def test_eager(self):
+        # 커밋 직후 요청 스레드에서 실행하되, 실패는 호출한 쪽으로 전달하지 않고 Task에 남겨 워커가 재시도
+        with self.assertLogs('car_app.tasks', 'WARNING'), self.captureOnCommitCallbacks(execute=True):
+            done = enqueue('test.create_company', label='eager')
+            failed = enqueue('test.create_company', label='eager-fail', fail=True)
+        done.refresh_from_db()
+        failed.refresh_from_db()
+        self.assertEqual(done.status, Task.DONE)
+        self.assertEqual((failed.status, failed.attempts), (Task.PENDING, 1))
+        self.assertEqual((self.companies('eager'), self.companies('eager-fail')), (1, 0))
+
+    @override_settings(TASK_QUEUE={'ALWAYS_EAGER': True, 'MAX_ATTEMPTS': 3, 'RETRY_DELAY': 10})
+    def test_eager_failure_does_not_fail_request(self):
+        company = make_company()
+        user = make_user(company)
+        vehicle = make_vehicle(company)
+        client = APIClient()
+        client.force_authenticate(user)
+        body = {
+            'vehicle': vehicle.pk, 'departure_location': '서울', 'arrival_location': '부산', 'departure_mileage': 1000, 'arrival_mileage': 1100,
+            'departure_time': '2024-05-01T09:00:00Z', 'arrival_time': '2024-05-01T10:00:00Z', 'coordinates': [[37.5, 127.0]], 'fuel_cost': '10.00',
+        }
+        with mock.patch.object(DrivingRecord, 'create_expenses', side_effect=RuntimeError("지출 생성 실패")), \
+                self.assertLogs('car_app.tasks', 'WARNING'), self.captureOnCommitCallbacks(execute=True):
+            response = client.post('/api/driving-records/create/', body, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(DrivingRecord.objects.count(), 1)
+        failed = Task.objects.get(name='driving_record.create_expenses')
+        self.assertEqual((failed.status, failed.attempts), (Task.PENDING, 1))
+        self.assertEqual(Task.objects.get(name='driving_record.update_vehicle_usage').status, Task.DONE)
+
+
+
+# 장소 사전과 자동 완성 색인 (Location.intern/release, car_app.locations)
+class LocationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = make_company()
+        cls.user = make_user(cls.company)
+        cls.vehicle = make_vehicle(cls.company)
+        cls.departure = datetime.datetime(2024, 5, 1, 9, 0, tzinfo=datetime.timezone.utc)
+
+    def setUp(self):
+        locations.clear_indexes()
+        self.addCleanup(locations.clear_indexes)
+
+    def usage_counts(self):
+        return dict(Location.objects.filter(company=self.company).values_list('name', 'usage_count'))
+
+    def test_intern_and_release(self):
+        first = make_record(self.vehicle, self.user, 0, 100, self.departure)
+        second = make_record(self.vehicle, self.user, 100, 200, self.departure + datetime.timedelta(days=1))
+        self.assertEqual(self.usage_counts(), {'서울': 2, '부산': 2})
+        self.assertEqual(first.departure_place_id, second.departure_place_id)
+
+        second.departure_location = '  대전   역 '  # 앞뒤 공백 제거, 연속 공백은 하나로
+        second.arrival_location = '37.5012,127.0396'  # 운행 기록 나누기의 좌표 이름은 등록하지 않음
+        second.save()
+        second.refresh_from_db()
+        self.assertIsNone(second.arrival_place_id)
+        self.assertEqual(Location.objects.get(pk=second.departure_place_id).name, '대전 역')
+        self.assertEqual(self.usage_counts(), {'서울': 1, '부산': 1, '대전 역': 1})
+
+        second.save()  # 출발지/도착지가 바뀌지 않으면 사용 횟수 유지
+        self.assertEqual(self.usage_counts(), {'서울': 1, '부산': 1, '대전 역': 1})
+
+        # 운행 기록에서 다시 계산한 결과와 같음
+        counts = self.usage_counts()
+        call_command('rebuild_locations', company=self.company.business_registration_number, stdout=io.StringIO())
+        self.assertEqual(self.usage_counts(), counts)
+
+        with transaction.atomic():
+            Location.release_records(DrivingRecord.objects.filter(company=self.company))
+        self.assertEqual(self.usage_counts(), {'서울': 0, '부산': 0, '대전 역': 0})
+
+    def test_index_follows_commits(self):
+        index = locations.get_index(self.company.pk)
+        self.assertEqual(index.search('서', 10), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            record = make_record(self.vehicle, self.user, 0, 100, self.departure)
+        self.assertEqual(locations.autocomplete(self.company.pk, '서', 10), [{"id": record.departure_place_id, "name": '서울', "usage_count": 1}])
+
+        with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+            Location.release(self.company.pk, record.departure_place_id)
+        self.assertEqual(index.search('서', 10)[0]['usage_count'], 0)
+
+    def test_prefix_index(self):
+        for name, count in (('서울역', 5), ('서울 시청', 3), ('서울대', 3), ('수원', 10), ('Seoul Station', 1)):
+            Location.objects.create(company=self.company, name=name, usage_count=count)
+        Location.objects.create(company=make_company('222'), name='서울 공항', usage_count=100)  # 다른 회사의 장소
+        index = locations.PrefixIndex(self.company.pk)
+        index.build()
+
+        def names(prefix, limit=10):
+            return [entry['name'] for entry in index.search(prefix, limit)]
+
+        self.assertEqual(names('서울'), ['서울역', '서울 시청', '서울대'])  # 사용 횟수가 많은 순, 같으면 이름 순
+        self.assertEqual(names(' 서울시'), ['서울 시청'])  # 공백 제거
+        self.assertEqual(names('SEOUL'), ['Seoul Station'])  # 대소문자 구분 없음
+        self.assertEqual(names('', 2), ['수원', '서울역'])
+        self.assertEqual(names('부산'), [])
+
+        seoul_univ = Location.objects.get(company=self.company, name='서울대')
+        index.note(seoul_univ.pk, seoul_univ.name, 5)
+        self.assertEqual(names('서울', 1), ['서울대'])
+        index.note(seoul_univ.pk, None, -100)  # 0 미만으로 줄지 않음
+        self.assertEqual(index.search('서울대', 1)[0]['usage_count'], 0)
+
+        # 다른 프로세스에서 등록된 장소는 refresh()로 가져옴
+        added = Location.objects.create(company=self.company, name='서울숲', usage_count=4)
+        self.assertNotIn('서울숲', names('서울'))
+        index.refresh()
+        self.assertEqual(names('서울'), ['서울역', '서울숲', '서울 시청', '서울대'])
+        self.assertEqual(index.max_id, added.pk)
+
+        # 접두어 검색 결과 캐시는 색인이 바뀌면 비움
+        with mock.patch.object(locations, 'CACHE_MIN_MATCHES', 0):
+            self.assertEqual(names('서울', 1), ['서울역'])
+            index.note(added.pk, added.name, 10)
+            self.assertEqual(names('서울', 1), ['서울숲'])
+
+
+
+# 차량별 월간 유류비 통계 (VehicleFuelStat)와 연비 분석 (car_app.fuel)
+class FuelStatTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = make_company()
+        cls.admin = make_user(cls.company, email='admin@example.com', phone_number='01011111111', name='관리자')
+        cls.admin.is_admin = True
+        cls.admin.save()
+        cls.user = make_user(cls.company)
+        cls.vehicle = make_vehicle(cls.company)
+        cls.other_vehicle = make_vehicle(cls.company, plate='34나5678')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def stats(self):
+        # 운행 횟수가 0이 된 월은 다시 계산하면 삭제되므로 비교에서 제외
+        return list(VehicleFuelStat.objects.filter(company=self.company).exclude(trip_count=0).order_by('vehicle_id', 'month').values_list(
+            'vehicle_id', 'month', 'driving_distance', 'fuel_cost', 'trip_count'
+        ))
+
+    def assertMatchesRebuild(self):
+        stats = self.stats()
+        call_command('rebuild_fuel_stats', company=self.company.business_registration_number, stdout=io.StringIO())
+        self.assertEqual(stats, self.stats())
+        return stats
+
+    def create(self, vehicle, departure_mileage, arrival_mileage, departure_time, fuel_cost):
+        response = self.client.post('/api/driving-records/create/', {
+            'vehicle': vehicle.pk, 'departure_location': '서울', 'arrival_location': '부산',
+            'departure_mileage': departure_mileage, 'arrival_mileage': arrival_mileage,
+            'departure_time': departure_time, 'arrival_time': departure_time.replace('T09', 'T10'),
+            'coordinates': [[37.5, 127.0]], 'fuel_cost': fuel_cost,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return DrivingRecord.objects.latest('pk')
+
+    def test_api_changes_match_rebuild(self):
+        first = self.create(self.vehicle, 1000, 1100, '2024-05-10T09:00:00Z', '20.00')
+        self.create(self.vehicle, 1100, 1150, '2024-05-20T09:00:00Z', '10.50')
+        third = self.create(self.other_vehicle, 1000, 1300, '2024-05-15T09:00:00Z', '45.00')
+        self.assertEqual(self.assertMatchesRebuild(), [
+            (self.vehicle.pk, datetime.date(2024, 5, 1), 150, Decimal('30.50'), 2),
+            (self.other_vehicle.pk, datetime.date(2024, 5, 1), 300, Decimal('45.00'), 1),
+        ])
+
+        # 다른 달, 다른 차량으로 수정
+        response = self.client.put(f'/api/driving-records/{first.pk}/', {
+            'vehicle': self.other_vehicle.pk, 'departure_time': '2024-06-10T09:00:00Z', 'arrival_time': '2024-06-10T10:00:00Z',
+            'departure_mileage': 1000, 'arrival_mileage': 1200, 'fuel_cost': '25.00',
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.assertMatchesRebuild(), [
+            (self.vehicle.pk, datetime.date(2024, 5, 1), 50, Decimal('10.50'), 1),
+            (self.other_vehicle.pk, datetime.date(2024, 5, 1), 300, Decimal('45.00'), 1),
+            (self.other_vehicle.pk, datetime.date(2024, 6, 1), 200, Decimal('25.00'), 1),
+        ])
+
+        self.assertEqual(self.client.delete(f'/api/driving-records/{third.pk}/').status_code, 204)
+        self.assertEqual(self.assertMatchesRebuild(), [
+            (self.vehicle.pk, datetime.date(2024, 5, 1), 50, Decimal('10.50'), 1),
+            (self.other_vehicle.pk, datetime.date(2024, 6, 1), 200, Decimal('25.00'), 1),
+        ])
+
+    def test_split_and_user_delete_match_rebuild(self):
+        longitudes = [127.00, 127.01, 127.02, 127.03] + [127.04] * 11 + [127.05, 127.06, 127.07, 127.08]
+        coordinates = [[37.5, longitude] for longitude in longitudes]
+        departure = datetime.datetime(2024, 5, 10, 9, 0, tzinfo=datetime.timezone.utc)
+        record = make_record(self.vehicle, self.user, 1000, 1080, departure, minutes=len(coordinates) - 1, coordinates=coordinates, fuel_cost=Decimal('30.00'))
+        UserDrivingStat.add_record(record)
+        VehicleFuelStat.add_record(record)
+        self.create(self.vehicle, 1080, 1100, '2024-05-20T09:00:00Z', '5.00')
+
+        apply_suggestions(record, coordinates, suggest(record, coordinates))
+        self.assertEqual(self.assertMatchesRebuild(), [(self.vehicle.pk, datetime.date(2024, 5, 1), 100, Decimal('35.00'), 3)])
+
+        admin_record = make_record(self.other_vehicle, self.admin, 0, 70, departure, fuel_cost=Decimal('7.00'))
+        UserDrivingStat.add_record(admin_record)
+        VehicleFuelStat.add_record(admin_record)
+        self.client.force_authenticate(self.admin)
+        self.assertEqual(self.client.delete(f'/api/users/{self.user.pk}/').status_code, 204)
+        self.assertFalse(DrivingRecord.objects.filter(user=self.user).exists())
+        self.assertEqual(self.assertMatchesRebuild(), [(self.other_vehicle.pk, datetime.date(2024, 5, 1), 70, Decimal('7.00'), 1)])
+
+    def test_ranking_and_trends(self):
+        third_vehicle = Vehicle.objects.create(
+            vehicle_category='전기', vehicle_type='아이오닉5', car_registration_number='56다7890', license_plate_number='56다7890',
+            purchase_date=datetime.date(2024, 1, 1), purchase_price=Decimal('100.00'), total_mileage=0, company=self.company,
+        )
+        # 차량별 (3월, 4월, 5월) km당 유류비: 0.1 → 0.2 → 0.3, 0.2 일정, 0.05 일정 (3월만 운행)
+        for vehicle, monthly in ((self.vehicle, [(100, '10'), (100, '20'), (100, '30')]), (self.other_vehicle, [(200, '40'), (200, '40'), (200, '40')]), (third_vehicle, [(400, '20')])):
+            for month, (distance, fuel_cost) in zip((3, 4, 5), monthly):
+                VehicleFuelStat.objects.create(vehicle=vehicle, company=self.company, month=datetime.date(2024, month, 1), driving_distance=distance, fuel_cost=Decimal(fuel_cost), trip_count=1)
+        VehicleFuelStat.objects.create(vehicle=third_vehicle, company=self.company, month=datetime.date(2024, 2, 1), driving_distance=1000, fuel_cost=Decimal('900'), trip_count=1)  # 기간 밖
+
+        start, end = month_range(3, today=datetime.date(2024, 5, 20))
+        self.assertEqual((start, end), (datetime.date(2024, 3, 1), datetime.date(2024, 5, 1)))
+        self.assertEqual(month_range(3, today=datetime.date(2024, 1, 31)), (datetime.date(2023, 11, 1), datetime.date(2024, 1, 1)))
+
+        rows = list(ranking(self.company, 'vehicle', start, end, min_distance=100))
+        self.assertEqual([row['vehicle_id'] for row in rows], [self.vehicle.pk, self.other_vehicle.pk, third_vehicle.pk])  # km당 유류비가 높은 순
+        self.assertEqual([(row['total_distance'], row['trips']) for row in rows], [(300, 3), (600, 3), (400, 1)])
+        self.assertEqual([round(row['cost_per_km'], 4) for row in rows], [0.2, 0.2, 0.05])
+        self.assertEqual([row['percentile'] for row in rows], [0.5, 0.5, 0.0])
+        self.assertEqual([row['type_percentile'] for row in rows], [0.0, 0.0, 0.0])  # K5 두 대는 같은 km당 유류비
+        self.assertEqual([row['vehicle_id'] for row in ranking(self.company, 'vehicle', start, end, min_distance=500)], [self.other_vehicle.pk])
+        self.assertEqual([row['vehicle_id'] for row in ranking(self.company, 'vehicle', start, end, min_distance=100, min_percentile=0.5)], [self.vehicle.pk, self.other_vehicle.pk])
+
+        by_type = list(ranking(self.company, 'vehicle_type', start, end, min_distance=100))
+        self.assertEqual([(row['vehicle_type'], row['total_distance']) for row in by_type], [('K5', 900), ('아이오닉5', 400)])
+
+        series = trends(self.company, 'vehicle', [self.vehicle.pk, self.other_vehicle.pk, third_vehicle.pk], start, end)
+        self.assertEqual(series[self.vehicle.pk]['monthly'], [
+            {"month": '2024-03', "cost_per_km": 0.1}, {"month": '2024-04', "cost_per_km": 0.2}, {"month": '2024-05', "cost_per_km": 0.3},
+        ])
+        self.assertEqual(series[self.vehicle.pk]['trend'], 0.1)
+        self.assertEqual(series[self.other_vehicle.pk]['trend'], 0.0)
+        self.assertIsNone(series[third_vehicle.pk]['trend'])  # 한 달만 운행
+        self.assertEqual(trends(self.company, 'vehicle_category', ['내연기관'], start, end)['내연기관']['trend'], 0.033)  # K5 두 대 합계: 0.1667 → 0.2 → 0.2333
+
+        self.assertIsNone(slope([(0, 1.0)]))
+        self.assertEqual(slope([(0, 1.0), (1, 3.0), (2, 5.0)]), 2.0)
@@ -0,0 +1,180 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+
+
+
+# 로그인 시도 제한 기본 설정 (settings.LOGIN_THROTTLE 로 덮어쓸 수 있음)
+DEFAULT_LOGIN_THROTTLE = {
+    'BACKEND': 'car_app.throttling.LocMemBucketBackend',  # 단일 프로세스용 메모리 백엔드
+    'OPTIONS': {},  # 백엔드 생성 인자
+    'IP': {'capacity': 20, 'refill_per_minute': 10},  # IP별 최대 연속 시도 수 및 분당 회복량
+    'IDENTIFIER': {'capacity': 10, 'refill_per_minute': 5},  # 이메일/전화번호별 최대 연속 시도 수 및 분당 회복량
+}
+
+
+def get_throttle_settings():
+    return {**DEFAULT_LOGIN_THROTTLE, **getattr(settings, 'LOGIN_THROTTLE', {})}
+
+
+def refill(tokens, updated, now, capacity, rate):
+    """
+    마지막 갱신 이후 지난 시간만큼 토큰을 채운 값을 반환합니다.
+    """
+    return min(capacity, tokens + (now - updated) * rate)
+
+
+
+# 단일 프로세스용 토큰 버킷 백엔드
+class LocMemBucketBackend:
+    """
+    프로세스 메모리에 버킷을 저장합니다. runserver 또는 워커가 하나인 경우에 사용합니다.
+    오래 사용되지 않은 버킷부터 지워 최대 max_entries 개까지만 보관합니다.
+    """
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self._buckets = OrderedDict()  # key -> (tokens, updated)
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, rate):
+        """
+        버킷에서 토큰 하나를 사용합니다. (허용 여부, 다음 토큰까지 대기 시간(초))를 반환합니다.
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = refill(tokens, updated, now, capacity, rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)  # 가장 오래 사용되지 않은 버킷 제거
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+    def incr(self, name):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + 1
+
+    def get_counters(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+            self._counters.clear()
+
+
+
+# 여러 워커 프로세스가 공유하는 SQLite 파일 기반 토큰 버킷 백엔드
+class SQLiteBucketBackend:
+    """
+    로컬 SQLite 파일에 버킷을 저장합니다. gunicorn/uvicorn 워커가 여러 개인 경우에 사용합니다.
+    버킷 갱신은 BEGIN IMMEDIATE 트랜잭션으로 처리되어 워커 간에도 원자적으로 동작합니다.
+    """
+    PRUNE_INTERVAL = 1000  # 이 횟수만큼 호출될 때마다 가득 찬 버킷을 정리
+
+    def __init__(self, path=None, timeout=5):
+        self.path = str(path or settings.BASE_DIR / 'login_throttle.sqlite3')
+        self.timeout = timeout
+        self._local = threading.local()
+        self._calls = 0
+        with self._connect() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, full_at REAL NOT NULL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS buckets_full_at ON buckets (full_at)")
+            connection.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def consume(self, key, capacity, rate):
+        now = time.time()  # 프로세스 간에 공유되므로 벽시계 시간 사용
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens = refill(row[0], row[1], now, capacity, rate) if row else capacity
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            connection.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, updated, full_at) VALUES (?, ?, ?, ?)",
+                (key, tokens, now, now + (capacity - tokens) / rate),
+            )
+            self._calls += 1
+            if self._calls % self.PRUNE_INTERVAL == 0:
+                connection.execute("DELETE FROM buckets WHERE full_at < ?", (now,))  # 이미 가득 찬 버킷은 없는 것과 같음
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+    def incr(self, name):
+        self._connect().execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+
+    def get_counters(self):
+        return dict(self._connect().execute("SELECT name, value FROM counters").fetchall())
+
+    def reset(self):
+        connection = self._connect()
+        connection.execute("DELETE FROM buckets")
+        connection.execute("DELETE FROM counters")
+
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    """
+    settings.LOGIN_THROTTLE['BACKEND'] 에 지정된 백엔드 인스턴스를 반환합니다. (프로세스당 하나)
+    """
+    config = get_throttle_settings()
+    return import_string(config['BACKEND'])(**config['OPTIONS'])
+
+
+
+# 로그인 시도 제한 Throttle
+class LoginRateThrottle(BaseThrottle):
+    """
+    IP별, 로그인 식별자(이메일/전화번호)별 토큰 버킷으로 로그인 시도를 제한합니다.
+    DRF가 View 실행 전에 호출하므로 제한된 요청은 사용자 조회나 비밀번호 해싱 없이 429로 거절됩니다.
+    """
+    def allow_request(self, request, view):
+        config = get_throttle_settings()
+        backend = get_backend()
+        self.wait_seconds = None
+
+        buckets = [('ip', self.get_ident(request), config['IP'])]  # 클라이언트 IP (REST_FRAMEWORK['NUM_PROXIES'] 기준)
+        identifier = request.data.get('email_or_phone') if hasattr(request.data, 'get') else None
+        if isinstance(identifier, str) and identifier.strip():
+            buckets.append(('identifier', identifier.strip().lower(), config['IDENTIFIER']))
+
+        for kind, value, rate in buckets:
+            allowed, wait = backend.consume(
+                f'login:{kind}:{value}', rate['capacity'], rate['refill_per_minute'] / 60
+            )
+            if not allowed:
+                backend.incr(f'rejected_{kind}')  # 거절 횟수 집계
+                self.wait_seconds = wait
+                return False
+        backend.incr('allowed')
+        return True
+
+    def wait(self):
+        return self.wait_seconds
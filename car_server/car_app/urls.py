@@ -1,7 +1,8 @@
 from django.conf import settings
 from django.conf.urls.static import static
 from django.urls import path
-from .views import RegisterAdminView, AdminLoginView, RegisterUserView, UserListView, UserDetailView, LoginView, LogoutView, NoticeListCreateView, NoticeListView, NoticeDetailView, VehicleCreateView, VehicleListView, VehicleDetailView, DrivingRecordListCreateView, DrivingRecordListView, DrivingRecordDetailView, MaintenanceListCreateView, MaintenanceListView, MaintenanceDetailView, ExpenseListCreateView,ExpenseListView, ExpenseDetailView, CurrentUserView
+from .async_views import AsyncVehicleListView, AsyncVehicleDetailView, AsyncNoticeListView, AsyncNoticeDetailView, AsyncCurrentUserView, AsyncDrivingRecordDetailView
+from .views import RegisterAdminView, AdminLoginView, RegisterUserView, BulkUserImportView, UserListView, UserDetailView, LoginView, LogoutView, NoticeListCreateView, NoticeListView, NoticeSearchView, NoticeUnreadCountView, NoticeReadAllView, NoticeDetailView, VehicleCreateView, VehicleListView, VehicleDetailView, DrivingRecordListCreateView, DrivingRecordListView, DrivingRecordDetailView, DrivingRecordSegmentsView, MaintenanceListCreateView, MaintenanceListView, MaintenanceDetailView, ExpenseListCreateView,ExpenseListView, ExpenseDetailView, LocationAutocompleteView, SyncView, CurrentUserView, DrivingLeaderboardView, UserDrivingStatsView, LoginThrottleStatsView, TaskStatusView, OdometerAnomalyListView, FuelEfficiencyView, EventStreamView
 
 # 회원가입 및 로그인 관련 URL 경로 설정
 urlpatterns = [
@@ -10,6 +11,11 @@ urlpatterns = [
     path('admin/register/', RegisterAdminView.as_view(), name='admin-register'),  # 관리자 회원가입
     path('admin/login/', AdminLoginView.as_view(), name='admin-login'),  # 관리자 전용 로그인 경로
     path('admin/register-user/', RegisterUserView.as_view(), name='register-user'),  # 일반 사용자 회원가입 경로
+    path('admin/import-users/', BulkUserImportView.as_view(), name='import-users'),  # CSV 파일로 일반 사용자 일괄 등록
+    path('admin/login-throttle/', LoginThrottleStatsView.as_view(), name='login-throttle-stats'),  # 로그인 시도 제한 현황 조회
+    path('admin/tasks/', TaskStatusView.as_view(), name='task-status'),  # 백그라운드 작업 처리 현황 조회
+    path('admin/odometer-anomalies/', OdometerAnomalyListView.as_view(), name='odometer-anomalies'),  # 주행거리 이상(누락, 역행, 시간 겹침) 목록 조회
+    path('admin/fuel-efficiency/', FuelEfficiencyView.as_view(), name='fuel-efficiency'),  # 차량/차종/차량 카테고리별 km당 유류비 순위와 추세
     
     # 일반 사용자 관련
     path('users/', UserListView.as_view(), name='user-list'), # 전체 회원 정보 조회
@@ -17,10 +23,15 @@ urlpatterns = [
     path('login/', LoginView.as_view(), name='login'),  # 로그인 경로
     path('logout/', LogoutView.as_view(), name='logout'),  # 로그아웃 URL 설정
     path('users/me/', CurrentUserView.as_view(), name='current-user'),  # 현재 로그인된 회원 정보 조회, 수정
+    path('users/leaderboard/', DrivingLeaderboardView.as_view(), name='driving-leaderboard'),  # 회사 내 운행 순위 조회
+    path('users/<int:pk>/stats/', UserDrivingStatsView.as_view(), name='user-driving-stats'),  # 특정 회원의 운행 통계 조회
     
     # 공지사항 관련
     path('notices/create/', NoticeListCreateView.as_view(), name='notice-list-create'),  # 회사별 공지사항 생성
     path('notices/all/', NoticeListView.as_view(), name='notice-list'),  # 전체 공지사항 목록 조회 (로그인한 사용자의 회사에 한정)
+    path('notices/search/', NoticeSearchView.as_view(), name='notice-search'),  # 공지사항 전문 검색 (관련도 순)
+    path('notices/unread-count/', NoticeUnreadCountView.as_view(), name='notice-unread-count'),  # 안 읽은 공지사항 수 조회
+    path('notices/read-all/', NoticeReadAllView.as_view(), name='notice-read-all'),  # 공지사항 모두 읽음 처리
     path('notices/<int:pk>/', NoticeDetailView.as_view(), name='notice-detail'),  # 공지사항 상세 조회, 수정, 삭제
     
     # 차량 관련
@@ -43,6 +54,22 @@ urlpatterns = [
     path('driving-records/create/', DrivingRecordListCreateView.as_view(), name='driving-record-list-create'),  # 운행 기록 생성
     path('driving-records/', DrivingRecordListView.as_view(), name='driving-record-list'),  # 전체 운행 기록 조회
     path('driving-records/<int:pk>/', DrivingRecordDetailView.as_view(), name='driving-record-detail'),  # 특정 운행 기록 조회, 수정, 삭제
+    path('driving-records/<int:pk>/segments/', DrivingRecordSegmentsView.as_view(), name='driving-record-segments'),  # 정차 지점으로 나눈 운행 기록 제안 조회
+    path('locations/autocomplete/', LocationAutocompleteView.as_view(), name='location-autocomplete'),  # 출발지/도착지 자동 완성 (?q=)
+
+    # 동기화 관련
+    path('sync/', SyncView.as_view(), name='sync'),  # 모바일 앱 변경분 동기화 (?since=<토큰>)
+
+    # 비동기 조회 API (ASGI 서버에서 사용, 응답은 동기 API와 동일)
+    path('async/users/me/', AsyncCurrentUserView.as_view(), name='async-current-user'),  # 현재 로그인된 회원 정보 조회
+    path('async/notices/all/', AsyncNoticeListView.as_view(), name='async-notice-list'),  # 전체 공지사항 목록 조회
+    path('async/notices/<int:pk>/', AsyncNoticeDetailView.as_view(), name='async-notice-detail'),  # 공지사항 상세 조회
+    path('async/vehicles/', AsyncVehicleListView.as_view(), name='async-vehicle-list'),  # 차량 전체 목록 조회
+    path('async/vehicles/<int:vehicle_id>/', AsyncVehicleDetailView.as_view(), name='async-vehicle-detail'),  # 특정 차량 조회
+    path('async/driving-records/<int:pk>/', AsyncDrivingRecordDetailView.as_view(), name='async-driving-record-detail'),  # 특정 운행 기록 조회
+
+    # 실시간 이벤트 관련
+    path('events/', EventStreamView.as_view(), name='event-stream'),  # 회사별 실시간 이벤트 스트림 (SSE)
 ]
 
 # DEBUG 모드에서만 미디어 파일을 서빙하도록 설정
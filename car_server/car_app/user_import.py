@@ -0,0 +1,181 @@
+import csv
+import io
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q
+from .models import CustomUser
+
+
+
+# CSV 파일에서 읽어들이는 컬럼 목록
+REQUIRED_COLUMNS = ['email', 'phone_number', 'name', 'password']  # 필수 컬럼
+OPTIONAL_COLUMNS = ['department', 'position']  # 선택 컬럼
+
+# 이 개수 미만이면 프로세스 풀을 띄우는 비용이 더 크므로 현재 프로세스에서 해싱
+PARALLEL_HASH_THRESHOLD = 16
+
+
+
+def _init_hash_worker():
+    """
+    프로세스 풀의 워커에서 Django 설정을 불러옵니다. (spawn 방식으로 시작된 경우 대비)
+    """
+    from django.conf import settings
+    if not settings.configured:
+        import django
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'car_server.settings')
+        django.setup()
+
+
+def _hash_password(password):
+    return make_password(password)  # 기본 PASSWORD_HASHERS 설정에 따라 해싱
+
+
+def hash_passwords(passwords, workers=1):
+    """
+    비밀번호 목록을 해싱합니다. workers가 2 이상이면 프로세스 풀에 나누어 해싱합니다.
+    프로세스 풀(fork)은 import_users 명령에서만 사용합니다. 여러 스레드가 실행 중인 웹 서버 프로세스를 fork하면
+    다른 스레드가 잡고 있던 잠금이 자식 프로세스에 복사되어 멈출 수 있으므로 API 요청에서는 현재 프로세스에서 해싱합니다.
+    입력 순서와 같은 순서로 해시 목록을 반환합니다.
+    """
+    passwords = list(passwords)
+    workers = workers or 1
+    if workers <= 1 or len(passwords) < PARALLEL_HASH_THRESHOLD:
+        return [_hash_password(password) for password in passwords]
+
+    workers = min(workers, len(passwords))
+    chunksize = max(1, len(passwords) // (workers * 4))  # 워커 간 작업량이 고르게 나뉘도록 설정
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_hash_worker) as executor:
+        return list(executor.map(_hash_password, passwords, chunksize=chunksize))
+
+
+def read_user_csv(file):
+    """
+    업로드된 CSV 파일(바이트 또는 문자열 스트림)을 읽어 행 목록으로 반환합니다.
+    엑셀에서 저장한 UTF-8(BOM 포함) 및 CP949 인코딩을 모두 지원합니다.
+    """
+    raw = file.read()
+    if isinstance(raw, bytes):
+        try:
+            raw = raw.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raw = raw.decode('cp949')
+
+    reader = csv.DictReader(io.StringIO(raw))
+    columns = [column.strip() for column in (reader.fieldnames or [])]
+    missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+    if missing:
+        raise ValidationError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+
+    rows = []
+    for row in reader:
+        row = {(key or '').strip(): (value or '').strip() for key, value in row.items()}
+        if not any(row.values()):
+            continue  # 빈 행은 건너뜀
+        rows.append({column: row.get(column, '') for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS})
+    return rows
+
+
+def validate_user_rows(rows):
+    """
+    각 행을 검증하여 (유효한 행 목록, 행별 오류 목록)을 반환합니다.
+    기존 사용자와의 이메일/전화번호 중복은 한 번의 쿼리로 확인합니다.
+    행 번호는 헤더를 1행으로 하는 CSV 기준 번호입니다.
+    """
+    emails = {row['email'] for row in rows if row['email']}
+    phone_numbers = {row['phone_number'] for row in rows if row['phone_number']}
+
+    existing_emails, existing_phone_numbers = set(), set()
+    if emails or phone_numbers:
+        for email, phone_number in CustomUser.objects.filter(
+            Q(email__in=emails) | Q(phone_number__in=phone_numbers)
+        ).values_list('email', 'phone_number'):
+            existing_emails.add(email)
+            existing_phone_numbers.add(phone_number)
+
+    seen_emails, seen_phone_numbers = set(), set()
+    valid_rows, errors = [], []
+
+    for line, row in enumerate(rows, start=2):
+        row_errors = {}
+
+        for column in REQUIRED_COLUMNS:
+            if not row[column]:
+                row_errors[column] = ["필수 항목입니다."]
+
+        if row['email'] and 'email' not in row_errors:
+            try:
+                validate_email(row['email'])
+            except ValidationError:
+                row_errors['email'] = ["올바른 이메일 형식이 아닙니다."]
+        if row['email'] in existing_emails:
+            row_errors['email'] = ["이미 존재하는 이메일입니다."]
+        elif row['email'] in seen_emails:
+            row_errors['email'] = ["파일 안에서 중복된 이메일입니다."]
+
+        if row['phone_number'] in existing_phone_numbers:
+            row_errors['phone_number'] = ["이미 존재하는 전화번호입니다."]
+        elif row['phone_number'] in seen_phone_numbers:
+            row_errors['phone_number'] = ["파일 안에서 중복된 전화번호입니다."]
+
+        if row['password']:
+            try:
+                validate_password(row['password'])  # Django 기본 비밀번호 유효성 검사
+            except ValidationError as e:
+                row_errors['password'] = e.messages
+
+        for column, max_length in (('phone_number', 30), ('name', 30), ('department', 30), ('position', 30)):
+            if len(row[column]) > max_length:
+                row_errors.setdefault(column, []).append(f"{max_length}자 이하로 입력해야 합니다.")
+
+        if row['email']:
+            seen_emails.add(row['email'])
+        if row['phone_number']:
+            seen_phone_numbers.add(row['phone_number'])
+
+        if row_errors:
+            errors.append({"row": line, "email": row['email'], "errors": row_errors})
+        else:
+            valid_rows.append(row)
+
+    return valid_rows, errors
+
+
+def import_users(company, rows, workers=1, dry_run=False):
+    """
+    검증을 통과한 행만 일반 사용자로 일괄 등록합니다.
+    비밀번호 해싱은 workers가 2 이상이면 프로세스 풀에서 병렬로 처리하고(명령 전용), 저장은 하나의 트랜잭션에서 bulk_create로 처리합니다.
+    반환값: {"created": 생성된 사용자 목록, "errors": 행별 오류 목록}
+    """
+    valid_rows, errors = validate_user_rows(rows)
+    if dry_run or not valid_rows:
+        return {"created": [], "errors": errors}
+
+    hashed_passwords = hash_passwords([row['password'] for row in valid_rows], workers=workers)
+
+    users = [
+        CustomUser(
+            username=str(uuid.uuid4())[:8],  # bulk_create는 save()를 호출하지 않으므로 직접 생성
+            email=row['email'],
+            phone_number=row['phone_number'],
+            name=row['name'],
+            department=row['department'],
+            position=row['position'],
+            password=hashed_password,
+            company=company,
+            is_admin=False,
+            is_banned=False,
+        )
+        for row, hashed_password in zip(valid_rows, hashed_passwords)
+    ]
+
+    with transaction.atomic():
+        created = CustomUser.objects.bulk_create(users, batch_size=500)
+
+    return {"created": created, "errors": errors}
@@ -1,17 +1,45 @@
 import os
+import asyncio
 from django.conf import settings
+from django.http import StreamingHttpResponse, JsonResponse
+from django.views import View
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.exceptions import NotFound
 from django.shortcuts import get_object_or_404
-from .serializers import RegisterAdminSerializer, RegisterUserSerializer, CustomUserSerializer, LoginSerializer, NoticeSerializer, VehicleSerializer, DrivingRecordSerializer, MaintenanceSerializer, ExpenseSerializer
-from .models import Company, CustomUser, Notice, Vehicle, DrivingRecord, Maintenance, Expense
+from django.db import transaction, router
+from django.db.models import Q, F, Count, Window
+from django.db.models.functions import Rank
+from django.utils import timezone
+from datetime import datetime
+from .serializers import RegisterAdminSerializer, RegisterUserSerializer, CustomUserSerializer, LoginSerializer, NoticeSerializer, VehicleSerializer, DrivingRecordSerializer, MaintenanceSerializer, ExpenseSerializer, UserDrivingStatSerializer
+from .models import Company, CustomUser, Notice, NoticeReadState, Vehicle, DrivingRecord, Maintenance, Expense, UserDrivingStat, Task, OdometerAnomaly, OdometerCheckRun, VehicleFuelStat, Location
 from django.db.utils import IntegrityError
+from django.core.exceptions import ValidationError
+from .user_import import read_user_csv, import_users
+from .pagination import StandardPagination
+from .search import NoticeSearchResults
+from .events import get_broker
+from .async_views import AsyncJWTAuthentication
+from .throttling import LoginRateThrottle, get_backend as get_login_throttle_backend
+from .routers import ReplicaReadMixin
+from .archive import rehydrate, load_coordinates
+from .projections import project
+from .idempotency import idempotent
+from .segmentation import suggest as suggest_segments
+from .locations import autocomplete as autocomplete_locations, get_config as get_location_config
+from .sync import changes_since, InvalidToken, ExpiredToken, get_config as get_sync_config
+from .fuel import GROUPS as FUEL_GROUPS, ranking as fuel_ranking, trends as fuel_trends, month_range as fuel_month_range, get_config as get_fuel_config
+from .compression import compress_exempt
 
 
 # 관리자 회원가입을 처리하는 View
+@compress_exempt  # JWT 등 계정 정보를 담는 응답은 압축하지 않음 (BREACH)
 class RegisterAdminView(APIView):
     """
     관리자 회원가입 View
@@ -47,12 +75,14 @@ class RegisterAdminView(APIView):
 
 
 # 관리자 전용 로그인 View
+@compress_exempt  # JWT 등 계정 정보를 담는 응답은 압축하지 않음 (BREACH)
 class AdminLoginView(APIView):
     """
     관리자 전용 로그인 View
     이메일 또는 전화번호와 비밀번호를 받아 관리자 여부를 확인하고 JWT 토큰을 발급한다.
     """
     permission_classes = [AllowAny]  # 모든 사용자에게 접근 허용
+    throttle_classes = [LoginRateThrottle]  # IP/계정별 로그인 시도 제한 (사용자 조회 전에 거절)
     def post(self, request):
         serializer = LoginSerializer(data=request.data)  # 클라이언트로부터 받은 데이터를 시리얼라이저로 전달
         if serializer.is_valid(raise_exception=True):  # 데이터 검증
@@ -125,27 +155,103 @@ class RegisterUserView(APIView):
 
 
 
+# CSV 파일로 일반 사용자를 일괄 등록하는 View (관리자 전용)
+class BulkUserImportView(APIView):
+    """
+    일반 사용자 일괄 등록 View
+    관리자가 업로드한 CSV 파일(email, phone_number, name, password, department, position)을 검증한 후
+    유효한 행의 사용자를 한 번에 등록하고, 실패한 행은 행 번호와 함께 오류를 반환한다.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        admin = request.user  # 현재 로그인한 관리자
+        if not admin.is_admin:  # 관리자인지 확인
+            return Response({
+                "message": "관리자만 사용자를 등록할 수 있습니다."
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response({
+                "message": "사용자 일괄 등록에 실패했습니다.",
+                "error": "CSV 파일이 제공되지 않았습니다."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true')  # 검증만 수행할지 여부
+        try:
+            rows = read_user_csv(upload)
+            result = import_users(admin.company, rows, dry_run=dry_run)  # 요청 스레드에서는 프로세스 풀 없이 해싱 (웹 서버 프로세스 fork 방지)
+        except ValidationError as e:
+            return Response({
+                "message": "사용자 일괄 등록에 실패했습니다.",
+                "error": e.messages
+            }, status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError:  # 검증 이후 다른 요청에서 같은 이메일/전화번호가 등록된 경우
+            return Response({
+                "message": "사용자 일괄 등록에 실패했습니다.",
+                "error": "이미 사용 중인 이메일 또는 전화번호가 포함되어 있습니다. 다시 시도해 주세요."
+            }, status=status.HTTP_409_CONFLICT)
+
+        return Response({
+            "message": "사용자 일괄 등록이 완료되었습니다." if not dry_run else "사용자 일괄 등록 검증이 완료되었습니다.",
+            "total": len(rows),  # 전체 행 수
+            "created_count": len(result['created']),  # 등록된 사용자 수
+            "error_count": len(result['errors']),  # 실패한 행 수
+            "users": CustomUserSerializer(result['created'], many=True).data,
+            "errors": result['errors']  # 행별 오류 목록
+        }, status=status.HTTP_201_CREATED if result['created'] else status.HTTP_200_OK)
+
+
+
 # 회원 정보 전체 조회
-class UserListView(APIView):
+class UserListView(ReplicaReadMixin, APIView):
     """
-    GET: 전체 회원 정보 조회
+    GET: 전체 회원 정보 조회 (페이지네이션)
+    검색: ?search= 이름/이메일/전화번호 앞부분 일치 (대소문자 구분)
+    필터: ?department=, ?position=, ?is_banned=true|false
+    페이지: ?page=, ?page_size=
     """
     permission_classes = [IsAuthenticated]
     def get(self, request):
         try:
             # 로그인한 관리자의 회사 정보 기준으로 같은 회사의 사용자들만 가져오기
             company = request.user.company  # 로그인한 사용자의 회사 정보 가져오기
-            users = CustomUser.objects.filter(company=company)  # 같은 회사의 사용자들만 필터링
-            if users.exists():  # 사용자가 있는 경우
-                serializer = CustomUserSerializer(users, many=True)  # 시리얼라이저로 데이터 직렬화
+            users = CustomUser.objects.filter(company=company).select_related('company')  # 회사 정보는 한 번의 조인으로 함께 조회
+
+            search = request.query_params.get('search', '').strip()
+            if search:
+                # 앞부분 일치를 범위 조건으로 검색 (SQLite의 startswith는 대소문자 무시 LIKE로 변환되어 인덱스를 사용하지 못함)
+                # 이름은 (company, name) 인덱스, 이메일/전화번호는 고유 인덱스를 사용
+                end = search + '\U0010ffff'
+                users = users.filter(
+                    Q(name__gte=search, name__lt=end) | Q(email__gte=search, email__lt=end) | Q(phone_number__gte=search, phone_number__lt=end)
+                )
+            for field in ('department', 'position'):
+                value = request.query_params.get(field)
+                if value:
+                    users = users.filter(**{field: value})
+            is_banned = request.query_params.get('is_banned')
+            if is_banned is not None:
+                users = users.filter(is_banned=is_banned.lower() in ('1', 'true'))
+
+            users = CustomUserSerializer.prune(users.order_by('name', 'id'), request)  # (company, name) 인덱스 순서로 정렬, ?fields= 에 필요한 컬럼만 조회
+            paginator = StandardPagination()
+            page = paginator.paginate_queryset(users, request, view=self)
+            if page or request.query_params.keys() & {'search', 'department', 'position', 'is_banned'}:  # 검색 결과가 없는 경우는 빈 목록 반환
+                serializer = CustomUserSerializer(page, many=True, context={'request': request})  # 시리얼라이저로 데이터 직렬화
                 return Response({
                     "message": "회원 목록 조회가 성공적으로 완료되었습니다.",
+                    **paginator.get_page_info(),  # 전체 개수 및 이전/다음 페이지 정보
                     "users": serializer.data  # 회원 목록 반환
                 }, status=status.HTTP_200_OK)
             else:
                 return Response({
                     "message": "등록된 회원이 없습니다."
                 }, status=status.HTTP_404_NOT_FOUND)
+        except NotFound:  # 존재하지 않는 페이지 번호
+            raise
         except Exception as e:
             return Response({
                 "message": "회원 목록 조회에 실패했습니다.",
@@ -170,8 +276,8 @@ class UserDetailView(APIView):
                 "message": "관리자만 회원 정보를 조회할 수 있습니다."
             }, status=status.HTTP_403_FORBIDDEN)
         try:
-            user = get_object_or_404(CustomUser, pk=pk)  # 회원 정보 조회
-            serializer = CustomUserSerializer(user)  # 회원 정보 직렬화
+            user = get_object_or_404(CustomUserSerializer.prune(CustomUser.objects.all(), request), pk=pk)  # 회원 정보 조회
+            serializer = CustomUserSerializer(user, context={'request': request})  # 회원 정보 직렬화
             return Response({
                 "message": "회원 정보 조회가 성공적으로 완료되었습니다.",
                 "user": serializer.data  # 회원 정보 반환
@@ -216,7 +322,11 @@ class UserDetailView(APIView):
             }, status=status.HTTP_403_FORBIDDEN)
         try:
             user = get_object_or_404(CustomUser, pk=pk)  # 회원 정보 조회
-            user.delete()  # 회원 삭제
+            with transaction.atomic():
+                UserDrivingStat.remove_records(DrivingRecord.objects.filter(user=user))  # 함께 삭제되는 운행 기록을 통계에서 차감
+                Location.release_records(DrivingRecord.objects.filter(user=user))  # 장소 자동 완성 사용 횟수 차감
+                VehicleFuelStat.remove_records(DrivingRecord.objects.filter(user=user))  # 차량 유류비 통계에서 차감
+                user.delete()  # 회원 삭제
             return Response({
                 "message": "회원이 성공적으로 삭제되었습니다."
             }, status=status.HTTP_204_NO_CONTENT)
@@ -228,6 +338,107 @@ class UserDetailView(APIView):
 
 
 
+# 회사 내 운행 순위 조회
+class DrivingLeaderboardView(ReplicaReadMixin, APIView):
+    """
+    GET: 같은 회사 사용자들의 운행 순위 조회
+    ?month=YYYY-MM 을 지정하면 월간 통계, 지정하지 않으면 누적 통계 기준
+    ?order_by=distance|trips|cost (기본값: distance), ?limit= (기본값: 20, 최대 100)
+    원본 운행 기록을 집계하지 않고 운행 기록 저장 시 누적된 통계만 조회한다.
+    """
+    permission_classes = [IsAuthenticated]
+
+    ORDER_FIELDS = {
+        'distance': ('usage_distance', 'driving_distance'),  # (누적 통계 필드, 월간 통계 필드)
+        'trips': ('trip_count', 'trip_count'),
+        'cost': ('total_driving_cost', 'total_cost'),
+    }
+
+    def get(self, request):
+        company = request.user.company  # 로그인한 사용자의 회사 정보 가져오기
+        if not company:
+            return Response({
+                "message": "회사가 등록되지 않은 사용자입니다."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        order_by = request.query_params.get('order_by', 'distance')
+        if order_by not in self.ORDER_FIELDS:
+            return Response({
+                "message": "운행 순위 조회에 실패했습니다.",
+                "error": "order_by는 distance, trips, cost 중 하나여야 합니다."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+            month = request.query_params.get('month')
+            month = datetime.strptime(month, '%Y-%m').date() if month else None
+        except ValueError:
+            return Response({
+                "message": "운행 순위 조회에 실패했습니다.",
+                "error": "limit은 숫자, month는 YYYY-MM 형식이어야 합니다."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        total_field, monthly_field = self.ORDER_FIELDS[order_by]
+        if month:
+            # 월간 통계 기준 순위
+            rows = UserDrivingStat.objects.filter(user__company=company, month=month, trip_count__gt=0).annotate(
+                rank=Window(expression=Rank(), order_by=F(monthly_field).desc()),
+                user_name=F('user__name'), department=F('user__department'), position=F('user__position'),
+            ).order_by('rank', 'user_id').values(
+                'rank', 'user_id', 'user_name', 'department', 'position', 'driving_distance', 'trip_count', 'total_cost'
+            )[:limit]
+        else:
+            # 누적 통계 기준 순위
+            rows = CustomUser.objects.filter(company=company).annotate(
+                rank=Window(expression=Rank(), order_by=F(total_field).desc()),
+                user_id=F('id'), user_name=F('name'),
+                driving_distance=F('usage_distance'), total_cost=F('total_driving_cost'),
+            ).order_by('rank', 'id').values(
+                'rank', 'user_id', 'user_name', 'department', 'position', 'driving_distance', 'trip_count', 'total_cost'
+            )[:limit]
+
+        return Response({
+            "message": "운행 순위 조회가 성공적으로 완료되었습니다.",
+            "month": month.strftime('%Y-%m') if month else None,
+            "order_by": order_by,
+            "leaderboard": list(rows)  # 순위, 사용자 정보, 운행 거리/횟수/비용
+        }, status=status.HTTP_200_OK)
+
+
+
+# 특정 회원의 운행 통계 조회
+class UserDrivingStatsView(ReplicaReadMixin, APIView):
+    """
+    GET: 특정 회원의 누적 운행 통계와 월별 운행 통계 조회 (관리자 또는 본인만 가능)
+    ?year=YYYY 를 지정하면 해당 연도의 월별 통계만 반환
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        if not request.user.is_admin and request.user.pk != pk:  # 관리자가 아니고 본인이 아닌 경우
+            return Response({
+                "message": "관리자 또는 본인만 운행 통계를 조회할 수 있습니다."
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        user = get_object_or_404(CustomUser, pk=pk, company=request.user.company)
+        monthly = user.driving_stats.filter(trip_count__gt=0).order_by('-month')  # 운행 기록이 모두 삭제된 월은 제외
+        year = request.query_params.get('year')
+        if year and year.isdigit():
+            monthly = monthly.filter(month__year=int(year))
+
+        return Response({
+            "message": "운행 통계 조회가 성공적으로 완료되었습니다.",
+            "stats": {
+                "user_id": user.id,
+                "name": user.name,
+                "usage_distance": user.usage_distance,  # 누적 운행 거리
+                "trip_count": user.trip_count,  # 누적 운행 횟수
+                "total_driving_cost": user.total_driving_cost,  # 누적 운행 비용
+                "monthly": UserDrivingStatSerializer(monthly, many=True).data  # 월별 통계
+            }
+        }, status=status.HTTP_200_OK)
+
+
+
 # 현재 로그인한 사용자 정보 조회 및 수정
 class CurrentUserView(APIView):
     """
@@ -240,7 +451,7 @@ class CurrentUserView(APIView):
         GET: 현재 로그인한 사용자의 정보 조회
         """
         user = request.user
-        serializer = CustomUserSerializer(user)
+        serializer = CustomUserSerializer(user, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def patch(self, request):
@@ -263,11 +474,13 @@ class CurrentUserView(APIView):
 
 
 # 로그인 요청을 처리하는 View (일반 사용자 전용)
+@compress_exempt  # JWT 등 계정 정보를 담는 응답은 압축하지 않음 (BREACH)
 class LoginView(APIView):
     """
     로그인 View
     이메일 또는 전화번호와 비밀번호를 받아 JWT 토큰을 발급한다.
     """
+    throttle_classes = [LoginRateThrottle]  # IP/계정별 로그인 시도 제한 (사용자 조회 전에 거절)
     def post(self, request):
         serializer = LoginSerializer(data=request.data)  # 클라이언트로부터 받은 데이터를 시리얼라이저로 전달
         if serializer.is_valid(raise_exception=True):  # 데이터 검증
@@ -298,6 +511,162 @@ class LoginView(APIView):
 
 
 
+# 로그인 시도 제한 현황 조회 (관리자 전용)
+class LoginThrottleStatsView(APIView):
+    """
+    GET: 로그인 시도 제한으로 거절된 횟수와 허용된 횟수 조회
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not request.user.is_admin:  # 관리자인지 확인
+            return Response({
+                "message": "관리자만 로그인 시도 제한 현황을 조회할 수 있습니다."
+            }, status=status.HTTP_403_FORBIDDEN)
+        counters = get_login_throttle_backend().get_counters()
+        return Response({
+            "message": "로그인 시도 제한 현황 조회가 성공적으로 완료되었습니다.",
+            "allowed": counters.get('allowed', 0),  # 허용된 로그인 시도
+            "rejected_ip": counters.get('rejected_ip', 0),  # IP 기준으로 거절된 시도
+            "rejected_identifier": counters.get('rejected_identifier', 0)  # 이메일/전화번호 기준으로 거절된 시도
+        }, status=status.HTTP_200_OK)
+
+
+
+class TaskStatusView(APIView):
+    """
+    GET: 회사의 백그라운드 작업(지출 내역 자동 생성 등) 처리 현황 조회
+    작업 이름별 상태 건수, 가장 오래 대기 중인 작업의 대기 시간, 최근 실패한 작업 목록을 반환한다.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not request.user.is_admin:  # 관리자인지 확인
+            return Response({
+                "message": "관리자만 작업 처리 현황을 조회할 수 있습니다."
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        tasks = Task.objects.filter(company=request.user.company)
+        counts = {}
+        for row in tasks.values('name', 'status').annotate(count=Count('id')).order_by('name'):
+            counts.setdefault(row['name'], {})[row['status']] = row['count']
+        oldest_pending = tasks.filter(status=Task.PENDING).order_by('created_at').values_list('created_at', flat=True).first()
+        failures = tasks.filter(status=Task.FAILED).order_by('-finished_at').values(
+            'id', 'name', 'kwargs', 'attempts', 'last_error', 'created_at', 'finished_at'
+        )[:20]
+        return Response({
+            "message": "작업 처리 현황 조회가 성공적으로 완료되었습니다.",
+            "counts": counts,  # 작업 이름별 상태 건수
+            "oldest_pending_seconds": (timezone.now() - oldest_pending).total_seconds() if oldest_pending else 0,  # 가장 오래 대기 중인 작업의 대기 시간
+            "failures": [{**row, "last_error": row['last_error'].strip().splitlines()[-1:]} for row in failures]  # 최근 실패한 작업 (마지막 오류 줄)
+        }, status=status.HTTP_200_OK)
+
+
+
+class OdometerAnomalyListView(APIView):
+    """
+    GET: 회사 차량의 주행거리 이상(누락, 역행, 운행 시간 겹침) 목록 조회 (페이지네이션)
+    ?kind= 이상 유형(gap, rollback, overlap), ?vehicle= 차량 ID, ?page=, ?page_size=
+    이상 목록은 check_odometer 명령으로 갱신되며, 마지막 점검 완료 일시를 함께 반환한다.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not request.user.is_admin:  # 관리자인지 확인
+            return Response({
+                "message": "관리자만 주행거리 이상 목록을 조회할 수 있습니다."
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        anomalies = OdometerAnomaly.objects.filter(company=request.user.company)
+        kind = request.query_params.get('kind')
+        if kind:
+            if kind not in dict(OdometerAnomaly.KIND_CHOICES):
+                return Response({
+                    "message": "주행거리 이상 목록 조회에 실패했습니다.",
+                    "error": f"kind는 {', '.join(dict(OdometerAnomaly.KIND_CHOICES))} 중 하나여야 합니다."
+                }, status=status.HTTP_400_BAD_REQUEST)
+            anomalies = anomalies.filter(kind=kind)
+        vehicle_id = request.query_params.get('vehicle')
+        if vehicle_id:
+            if not vehicle_id.isdigit():
+                return Response({
+                    "message": "주행거리 이상 목록 조회에 실패했습니다.",
+                    "error": "vehicle은 차량 ID여야 합니다."
+                }, status=status.HTTP_400_BAD_REQUEST)
+            anomalies = anomalies.filter(vehicle_id=vehicle_id)
+        anomalies = anomalies.order_by('vehicle_id', 'departure_time', 'id').values(
+            'id', 'kind', 'vehicle_id', 'record_id', 'previous_record_id', 'previous_arrival_mileage', 'departure_mileage',
+            'previous_arrival_time', 'departure_time', 'detected_at', license_plate_number=F('vehicle__license_plate_number')
+        )
+
+        paginator = StandardPagination()
+        page = paginator.paginate_queryset(anomalies, request, view=self)
+        last_checked_at = OdometerCheckRun.objects.filter(finished_at__isnull=False).order_by('-started_at').values_list('finished_at', flat=True).first()
+        return Response({
+            "message": "주행거리 이상 목록 조회가 성공적으로 완료되었습니다.",
+            "last_checked_at": last_checked_at,  # 마지막 점검 완료 일시 (점검한 적이 없으면 null)
+            **paginator.get_page_info(),  # 전체 개수 및 이전/다음 페이지 정보
+            "anomalies": [{**row, "mileage_difference": row['departure_mileage'] - row['previous_arrival_mileage']} for row in page]  # 출발 주행거리 - 직전 도착 주행거리
+        }, status=status.HTTP_200_OK)
+
+
+
+class FuelEfficiencyView(APIView):
+    """
+    GET: 회사의 차량/차종/차량 카테고리별 km당 유류비, 백분위 순위와 월별 추세 조회 (km당 유류비가 높은 순, 페이지네이션)
+    ?group= vehicle(기본), vehicle_type, vehicle_category
+    ?months= 이번 달을 포함한 분석 개월 수, ?min_percentile= 이 백분위(0 ~ 1) 이상만 조회 (예: 0.9는 유류비 상위 10%), ?page=, ?page_size=
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not request.user.is_admin:  # 관리자인지 확인
+            return Response({
+                "message": "관리자만 연비 분석을 조회할 수 있습니다."
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        config = get_fuel_config()
+        group = request.query_params.get('group', 'vehicle')
+        if group not in FUEL_GROUPS:
+            return Response({
+                "message": "연비 분석 조회에 실패했습니다.",
+                "error": f"group은 {', '.join(FUEL_GROUPS)} 중 하나여야 합니다."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            months = int(request.query_params.get('months', config['MONTHS']))
+            min_percentile = request.query_params.get('min_percentile')
+            min_percentile = float(min_percentile) if min_percentile else None
+            if not 1 <= months <= config['MAX_MONTHS'] or (min_percentile is not None and not 0 <= min_percentile <= 1):
+                raise ValueError
+        except ValueError:
+            return Response({
+                "message": "연비 분석 조회에 실패했습니다.",
+                "error": f"months는 1 ~ {config['MAX_MONTHS']}, min_percentile은 0 ~ 1 사이의 숫자여야 합니다."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        start, end = fuel_month_range(months)
+        rows = fuel_ranking(request.user.company, group, start, end, min_percentile=min_percentile)
+        paginator = StandardPagination()
+        page = paginator.paginate_queryset(rows, request, view=self)
+        key = FUEL_GROUPS[group][0]
+        series = fuel_trends(request.user.company, group, [row[key] for row in page], start, end)
+        return Response({
+            "message": "연비 분석 조회가 성공적으로 완료되었습니다.",
+            "group": group,
+            "start_month": start.strftime('%Y-%m'),
+            "end_month": end.strftime('%Y-%m'),
+            **paginator.get_page_info(),  # 전체 개수 및 이전/다음 페이지 정보
+            "results": [{
+                **row,
+                "cost_per_km": round(row['cost_per_km'], 2),  # km당 유류비
+                "percentile": round(row['percentile'], 4),  # 회사 안 백분위 (1에 가까울수록 km당 유류비가 높음)
+                **({"type_percentile": round(row['type_percentile'], 4)} if 'type_percentile' in row else {}),  # 같은 차종 안 백분위
+                **series[row[key]],  # 월별 km당 유류비와 추세 (원/km per 월)
+            } for row in page]
+        }, status=status.HTTP_200_OK)
+
+
+
 class LogoutView(APIView):
     """
     POST: 로그아웃 기능 (Refresh Token을 무효화하여 로그아웃 처리)
@@ -361,10 +730,71 @@ class NoticeListView(APIView):
         # 로그인한 사용자가 속한 회사의 공지사항 전체 조회
         company = request.user.company  # 로그인한 사용자의 회사 정보 가져오기
         notices = Notice.objects.filter(company=company)  # 해당 회사의 공지사항 필터링
-        data = notices.values('id', 'title', 'created_at', 'created_by__name')  # 제목, 생성일, 작성자 이름만 가져오기
+        data = list(notices.values('id', 'title', 'created_at', 'created_by__name'))  # 제목, 생성일, 작성자 이름만 가져오기
+        read_state = NoticeReadState.for_user(request.user, create=False)  # 사용자 읽음 상태 (한 행, 없으면 안 읽은 수를 처음 계산할 때 생성)
+        for notice in data:
+            notice['is_read'] = read_state.is_read(notice['id'])  # 읽음 여부
         return Response({
             "message": "공지사항 목록 조회가 성공적으로 완료되었습니다.",  # 성공 메시지 반환
-            "notices": list(data)  # 공지사항 목록 반환 (제목, 작성일, 작성자)
+            "unread_count": read_state.get_unread_count(),  # 안 읽은 공지사항 수
+            "notices": data  # 공지사항 목록 반환 (제목, 작성일, 작성자, 읽음 여부)
+        }, status=status.HTTP_200_OK)
+
+
+
+# 안 읽은 공지사항 수 조회 뷰
+class NoticeUnreadCountView(APIView):
+    """
+    GET: 로그인한 사용자의 안 읽은 공지사항 수 조회 (배지 표시용)
+    """
+    permission_classes = [IsAuthenticated]  # 인증된 사용자만 접근 가능
+
+    def get(self, request):
+        read_state = NoticeReadState.for_user(request.user, create=False)
+        return Response({
+            "unread_count": read_state.get_unread_count()  # 안 읽은 공지사항 수
+        }, status=status.HTTP_200_OK)
+
+
+
+# 공지사항 모두 읽음 처리 뷰
+class NoticeReadAllView(APIView):
+    """
+    POST: 로그인한 사용자 회사의 공지사항을 모두 읽음 처리
+    """
+    permission_classes = [IsAuthenticated]  # 인증된 사용자만 접근 가능
+
+    def post(self, request):
+        NoticeReadState.for_user(request.user).mark_all_read()
+        return Response({
+            "message": "모든 공지사항을 읽음 처리했습니다.",
+            "unread_count": 0
+        }, status=status.HTTP_200_OK)
+
+# 공지사항 검색 뷰
+class NoticeSearchView(ReplicaReadMixin, APIView):
+    """
+    GET: 로그인한 사용자 회사의 공지사항을 제목/내용으로 검색 (관련도 순, 페이지네이션)
+    ?q= 검색어, ?page=, ?page_size=
+    검색 결과에는 검색어가 <mark> 태그로 강조된 제목과 본문 요약이 포함된다.
+    """
+    permission_classes = [IsAuthenticated]  # 인증된 사용자만 접근 가능
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({
+                "message": "공지사항 검색에 실패했습니다.",
+                "error": "검색어(q)를 입력하세요."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        results = NoticeSearchResults(request.user.company, query, using=router.db_for_read(Notice))  # 해당 회사의 공지사항만 검색 (복제본 사용 시 복제본에서 검색)
+        paginator = StandardPagination()
+        page = paginator.paginate_queryset(results, request, view=self)
+        return Response({
+            "message": "공지사항 검색이 성공적으로 완료되었습니다.",
+            **paginator.get_page_info(),  # 전체 개수 및 이전/다음 페이지 정보
+            "notices": page  # 검색 결과 (제목, 작성일, 작성자, 강조된 제목, 본문 요약)
         }, status=status.HTTP_200_OK)
 
 # 공지사항 상세 조회, 수정 및 삭제 뷰
@@ -385,7 +815,8 @@ class NoticeDetailView(APIView):
             return Response({
                 "message": "공지사항을 찾을 수 없습니다."  # 공지사항이 없을 경우 오류 메시지 반환
             }, status=status.HTTP_404_NOT_FOUND)
-        serializer = NoticeSerializer(notice)  # 공지사항 직렬화
+        serializer = NoticeSerializer(notice, context={'request': request})  # 공지사항 직렬화
+        NoticeReadState.for_user(request.user).mark_read(notice)  # 상세 조회 시 읽음 처리
         return Response({
             "notice": serializer.data  # 공지사항 데이터 반환
         }, status=status.HTTP_200_OK)
@@ -471,7 +902,7 @@ class VehicleCreateView(APIView):
 
 
 # 차량 목록 전체 조회
-class VehicleListView(APIView):
+class VehicleListView(ReplicaReadMixin, APIView):
     """
     GET: 전체 차량 목록 조회
     """
@@ -481,7 +912,8 @@ class VehicleListView(APIView):
         try:
             vehicles = Vehicle.objects.filter(company=request.user.company)  # 로그인한 사용자의 회사에 소속된 차량만 가져오기
             if vehicles.exists():  # 차량이 있는 경우에만 처리
-                serializer = VehicleSerializer(vehicles, many=True)  # 시리얼라이저로 데이터 직렬화
+                vehicles = VehicleSerializer.prune(vehicles, request)  # ?fields= 에 필요한 컬럼과 조인만 조회
+                serializer = VehicleSerializer(vehicles, many=True, context={'request': request})  # 시리얼라이저로 데이터 직렬화
                 return Response({
                     "message": "차량 목록 조회가 성공적으로 완료되었습니다.",
                     "vehicles": serializer.data  # 차량 목록 반환
@@ -509,8 +941,8 @@ class VehicleDetailView(APIView):
     def get(self, request, vehicle_id):
         try:
             # 차량 ID로 차량 조회
-            vehicle = get_object_or_404(Vehicle, id=vehicle_id, company=request.user.company)
-            serializer = VehicleSerializer(vehicle)
+            vehicle = get_object_or_404(VehicleSerializer.prune(Vehicle.objects.all(), request), id=vehicle_id, company=request.user.company)
+            serializer = VehicleSerializer(vehicle, context={'request': request})
             return Response({
                 "vehicle": serializer.data
             }, status=status.HTTP_200_OK)
@@ -553,7 +985,10 @@ class VehicleDetailView(APIView):
         try:
             # 차량 ID로 차량 조회 후 삭제
             vehicle = get_object_or_404(Vehicle, id=vehicle_id, company=request.user.company)
-            vehicle.delete()  # 차량 삭제
+            with transaction.atomic():
+                UserDrivingStat.remove_records(DrivingRecord.objects.filter(vehicle=vehicle))  # 함께 삭제되는 운행 기록을 사용자 통계에서 차감
+                Location.release_records(DrivingRecord.objects.filter(vehicle=vehicle))  # 장소 자동 완성 사용 횟수 차감
+                vehicle.delete()  # 차량 삭제
             return Response({
                 "message": "차량이 성공적으로 삭제되었습니다."
             }, status=status.HTTP_204_NO_CONTENT)
@@ -573,6 +1008,7 @@ class DrivingRecordListCreateView(APIView):
     
     permission_classes = [IsAuthenticated]  # 인증된 사용자만 접근 가능
     
+    @idempotent  # Idempotency-Key 헤더로 재시도 시 중복 생성 방지
     def post(self, request):
         # context에 request를 추가하여 serializer에서 현재 사용자 정보에 접근 가능하도록 설정
         serializer = DrivingRecordSerializer(data=request.data, context={'request': request})
@@ -589,7 +1025,7 @@ class DrivingRecordListCreateView(APIView):
 
 
 
-class DrivingRecordListView(APIView):
+class DrivingRecordListView(ReplicaReadMixin, APIView):
     """
     GET: 로그인한 사용자의 회사와 일치하는 전체 운행 기록 목록 조회
     """
@@ -603,11 +1039,11 @@ class DrivingRecordListView(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         # 로그인한 사용자의 회사에 해당하는 차량의 운행 기록만 가져오기
-        records = DrivingRecord.objects.filter(vehicle__company=user_company)
-        serializer = DrivingRecordSerializer(records, many=True)  # 여러 개의 운행 기록 직렬화
+        records = DrivingRecordSerializer.prune(DrivingRecord.objects.filter(company=user_company), request)  # ?fields= 에 필요한 컬럼과 조인만 조회
+        serializer = DrivingRecordSerializer(records, many=True, context={'request': request})  # 여러 개의 운행 기록 직렬화
         return Response({
             "message": "운행 기록 목록 조회가 성공적으로 완료되었습니다.",
-            "records": serializer.data  # 운행 기록 목록 반환
+            "records": project(serializer)  # 운행 기록 목록 반환 (.values() 조회로 생성)
         }, status=status.HTTP_200_OK)
 
 class DrivingRecordDetailView(APIView):
@@ -627,8 +1063,8 @@ class DrivingRecordDetailView(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
 
             # 로그인한 사용자의 회사에 해당하는 차량의 운행 기록만 조회 가능하도록 필터링
-            record = get_object_or_404(DrivingRecord, pk=pk, vehicle__company=user_company)
-            serializer = DrivingRecordSerializer(record)
+            record = get_object_or_404(DrivingRecordSerializer.prune(DrivingRecord.objects.all(), request), pk=pk, company=user_company)
+            serializer = DrivingRecordSerializer(rehydrate(record), context={'request': request})  # 보관된 좌표는 보관 파일에서 읽음
             return Response({
                 "message": "운행 기록 조회가 성공적으로 완료되었습니다.",
                 "record": serializer.data
@@ -647,7 +1083,7 @@ class DrivingRecordDetailView(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
 
         # 로그인한 사용자의 회사에 해당하는 차량의 운행 기록만 수정 가능하도록 필터링
-        record = get_object_or_404(DrivingRecord, pk=pk, vehicle__company=user_company)
+        record = get_object_or_404(DrivingRecord, pk=pk, company=user_company)
         serializer = DrivingRecordSerializer(record, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()  # 수정된 내용을 데이터베이스에 저장
@@ -668,18 +1104,63 @@ class DrivingRecordDetailView(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
 
         # 로그인한 사용자의 회사에 해당하는 차량의 운행 기록만 삭제 가능하도록 필터링
-        record = get_object_or_404(DrivingRecord, pk=pk, vehicle__company=user_company)
-        record.delete()  # 운행 기록 삭제
+        record = get_object_or_404(DrivingRecord, pk=pk, company=user_company)
+        with transaction.atomic():
+            UserDrivingStat.remove_record(record)  # 사용자 운행 통계에서 차감
+            VehicleFuelStat.remove_record(record)  # 차량 유류비 통계에서 차감
+            for place_id in (record.departure_place_id, record.arrival_place_id):
+                if place_id is not None:
+                    Location.release(record.company_id, place_id)  # 장소 자동 완성 사용 횟수 차감
+            record.delete()  # 운행 기록 삭제
         return Response({
             "message": "운행 기록이 성공적으로 삭제되었습니다."
         }, status=status.HTTP_204_NO_CONTENT)
 
 
 
+class DrivingRecordSegmentsView(APIView):
+    """
+    GET: 특정 운행 기록을 GPS 좌표의 정차 지점으로 나눈 운행 기록 제안 조회 (저장하지 않음)
+    - ?radius=<미터>, ?dwell=<초>, ?min_trip=<미터>: 정차 판단 기준 (기본값은 settings.TRIP_SEGMENTATION)
+    제안을 실제로 적용하려면 python manage.py segment_trips --record <ID> --apply 를 사용합니다.
+    """
+    permission_classes = [IsAuthenticated]  # 인증된 사용자만 접근 가능
+
+    def get(self, request, pk):
+        user_company = request.user.company  # 로그인한 사용자의 회사 정보 가져오기
+        if not user_company:
+            return Response({
+                "message": "회사가 등록되지 않은 사용자입니다."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            thresholds = {name: float(request.query_params[name]) for name in ('radius', 'dwell', 'min_trip') if name in request.query_params}
+        except ValueError:
+            return Response({
+                "message": "radius, dwell, min_trip은 숫자여야 합니다."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        record = get_object_or_404(DrivingRecord, pk=pk, company=user_company)
+        try:
+            segments = suggest_segments(record, load_coordinates(record), **thresholds)
+        except (ValueError, TypeError, IndexError) as e:
+            return Response({
+                "message": "운행 기록의 좌표를 읽을 수 없습니다.",
+                "error": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            "message": "운행 기록 분할 제안 조회가 성공적으로 완료되었습니다.",
+            "record_id": record.id,
+            "split": len(segments) > 1,  # 두 개 이상의 운행으로 나눌 수 있는지 여부
+            "segments": segments  # 제안된 운행 기록 (출발/도착 시간, 보간한 주행거리, 좌표 범위)
+        }, status=status.HTTP_200_OK)
+
+
 # 정비 기록 목록 및 생성 처리
 class MaintenanceListCreateView(APIView):
     permission_classes = [IsAuthenticated]  # 인증된 사용자만 접근 가능
 
+    @idempotent  # Idempotency-Key 헤더로 재시도 시 중복 생성 방지
     def post(self, request):
         serializer = MaintenanceSerializer(data=request.data)
         if serializer.is_valid():
@@ -695,15 +1176,16 @@ class MaintenanceListCreateView(APIView):
 
 
 # 정비 기록 전체 조회
-class MaintenanceListView(APIView):
+class MaintenanceListView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]  # 인증된 사용자만 접근 가능
 
     def get(self, request):
-        maintenances = Maintenance.objects.filter(vehicle__company=request.user.company)  # 로그인한 사용자의 회사에 소속된 차량의 정비 기록 가져오기
-        serializer = MaintenanceSerializer(maintenances, many=True)
+        maintenances = Maintenance.objects.filter(company=request.user.company)  # 로그인한 사용자의 회사에 소속된 차량의 정비 기록 가져오기
+        maintenances = MaintenanceSerializer.prune(maintenances, request)  # ?fields= 에 필요한 컬럼과 조인만 조회
+        serializer = MaintenanceSerializer(maintenances, many=True, context={'request': request})
         return Response({
             "message": "정비 기록 목록 조회가 성공적으로 완료되었습니다.",
-            "records": serializer.data
+            "records": project(serializer)  # .values() 조회로 생성
         }, status=status.HTTP_200_OK)
 
 
@@ -712,15 +1194,15 @@ class MaintenanceDetailView(APIView):
     permission_classes = [IsAuthenticated]  # 인증된 사용자만 접근 가능
 
     def get(self, request, pk):
-        maintenance = get_object_or_404(Maintenance, pk=pk, vehicle__company=request.user.company)
-        serializer = MaintenanceSerializer(maintenance)
+        maintenance = get_object_or_404(MaintenanceSerializer.prune(Maintenance.objects.all(), request), pk=pk, company=request.user.company)
+        serializer = MaintenanceSerializer(maintenance, context={'request': request})
         return Response({
             "message": "정비 기록 조회가 성공적으로 완료되었습니다.",
             "record": serializer.data
         }, status=status.HTTP_200_OK)
 
     def put(self, request, pk):
-        maintenance = get_object_or_404(Maintenance, pk=pk, vehicle__company=request.user.company)
+        maintenance = get_object_or_404(Maintenance, pk=pk, company=request.user.company)
         serializer = MaintenanceSerializer(maintenance, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
@@ -734,7 +1216,7 @@ class MaintenanceDetailView(APIView):
         }, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, pk):
-        maintenance = get_object_or_404(Maintenance, pk=pk, vehicle__company=request.user.company)
+        maintenance = get_object_or_404(Maintenance, pk=pk, company=request.user.company)
         maintenance.delete()
         return Response({
             "message": "정비 기록이 성공적으로 삭제되었습니다."
@@ -761,7 +1243,7 @@ class ExpenseListCreateView(APIView):
 
 
 # 지출 관리 목록 전체 조회
-class ExpenseListView(APIView):
+class ExpenseListView(ReplicaReadMixin, APIView):
     """
     GET: 로그인한 사용자의 회사와 일치하는 전체 지출 내역 조회
     """
@@ -775,11 +1257,11 @@ class ExpenseListView(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
 
         # 로그인한 사용자의 회사와 일치하는 지출 내역만 가져오기
-        expenses = Expense.objects.filter(vehicle__company=user_company)
-        serializer = ExpenseSerializer(expenses, many=True)
+        expenses = ExpenseSerializer.prune(Expense.objects.filter(company=user_company), request)  # ?fields= 에 필요한 컬럼과 조인만 조회
+        serializer = ExpenseSerializer(expenses, many=True, context={'request': request})
         return Response({
             "message": "지출 내역 목록 조회가 성공적으로 완료되었습니다.",
-            "expenses": serializer.data
+            "expenses": project(serializer)  # .values() 조회로 생성
         }, status=status.HTTP_200_OK)
 
 
@@ -794,7 +1276,7 @@ class ExpenseDetailView(APIView):
 
     def get_object(self, pk, user_company):
         # 로그인한 사용자의 회사와 일치하는 지출 내역만 가져올 수 있도록 필터링
-        return get_object_or_404(Expense, pk=pk, vehicle__company=user_company)
+        return get_object_or_404(Expense, pk=pk, company=user_company)
 
     def get(self, request, pk):
         user_company = request.user.company  # 로그인한 사용자의 회사 정보 가져오기
@@ -803,8 +1285,8 @@ class ExpenseDetailView(APIView):
                 "message": "회사가 등록되지 않은 사용자입니다."
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        expense = self.get_object(pk, user_company)
-        serializer = ExpenseSerializer(expense)
+        expense = get_object_or_404(ExpenseSerializer.prune(Expense.objects.all(), request), pk=pk, company=user_company)
+        serializer = ExpenseSerializer(expense, context={'request': request})
         return Response({
             "message": "지출 내역 조회가 성공적으로 완료되었습니다.",
             "expense": serializer.data
@@ -846,4 +1328,141 @@ class ExpenseDetailView(APIView):
         expense.delete()
         return Response({
             "message": "지출 내역이 성공적으로 삭제되었습니다."
-        }, status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        }, status=status.HTTP_204_NO_CONTENT)
+
+
+
+# 출발지/도착지 자동 완성
+class LocationAutocompleteView(APIView):
+    """
+    GET: 로그인한 사용자 회사의 장소 사전에서 이름이 ?q= 로 시작하는 장소를 사용 횟수가 많은 순으로 조회
+    - ?q=<입력한 글자>: 공백과 대소문자는 구분하지 않음 (비어 있으면 가장 많이 사용된 장소)
+    - ?limit=<건수>
+    장소 사전은 프로세스 메모리의 접두어 색인으로 검색하므로 DB를 조회하지 않습니다. (car_app.locations 참고)
+    """
+    permission_classes = [IsAuthenticated]  # 인증된 사용자만 접근 가능
+
+    def get(self, request):
+        user_company = request.user.company  # 로그인한 사용자의 회사 정보 가져오기
+        if not user_company:
+            return Response({
+                "message": "회사가 등록되지 않은 사용자입니다."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        config = get_location_config()
+        try:
+            limit = min(max(int(request.query_params.get('limit', config['LIMIT'])), 1), config['MAX_LIMIT'])
+        except ValueError:
+            return Response({
+                "message": "limit은 숫자여야 합니다."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            "message": "장소 자동 완성 조회가 성공적으로 완료되었습니다.",
+            "locations": autocomplete_locations(user_company.id, request.query_params.get('q', ''), limit)  # 장소 ID, 이름, 사용 횟수
+        }, status=status.HTTP_200_OK)
+
+
+# 모바일 앱 변경분 동기화
+class SyncView(APIView):
+    """
+    GET: 로그인한 사용자 회사의 회원, 공지사항, 차량, 운행/정비 기록, 지출 내역 중 토큰 이후 변경된 행과 삭제된 행의 ID 조회
+    - ?since=<토큰>: 이전 응답의 token (없으면 전체 목록)
+    - ?limit=<건수>: 종류별 최대 행 수, has_more가 true이면 받은 token으로 이어서 요청
+    - ?fields= / ?omit=: 목록 API와 같이 응답 필드 선택
+    클라이언트는 changes를 ID 기준으로 덮어쓴 뒤 deleted의 행을 삭제합니다. (같은 행이 다시 포함될 수 있음)
+    토큰이 삭제 기록 보관 기간보다 오래되면 410을 반환하며, 토큰 없이 전체 목록을 다시 받아야 합니다.
+    """
+    permission_classes = [IsAuthenticated]  # 인증된 사용자만 접근 가능
+
+    def get(self, request):
+        user_company = request.user.company  # 로그인한 사용자의 회사 정보 가져오기
+        if not user_company:
+            return Response({
+                "message": "회사가 등록되지 않은 사용자입니다."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        config = get_sync_config()
+        try:
+            limit = min(max(int(request.query_params.get('limit', config['LIMIT'])), 1), config['MAX_LIMIT'])
+        except ValueError:
+            return Response({
+                "message": "limit은 숫자여야 합니다."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            changes, deleted, token, has_more = changes_since(user_company, request.query_params.get('since'), limit, request)
+        except InvalidToken:
+            return Response({
+                "message": "동기화 토큰이 올바르지 않습니다."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        except ExpiredToken:
+            return Response({
+                "message": "동기화 토큰이 만료되었습니다. 토큰 없이 전체 목록을 다시 받아 주세요."
+            }, status=status.HTTP_410_GONE)
+        return Response({
+            "message": "변경 내역 동기화가 성공적으로 완료되었습니다.",
+            "changes": changes,  # 종류별 변경(생성/수정)된 행
+            "deleted": deleted,  # 종류별 삭제된 행의 ID
+            "token": token,  # 다음 요청의 ?since= 값
+            "has_more": has_more  # 남은 변경 내역이 있는지 여부
+        }, status=status.HTTP_200_OK)
+
+
+
+# 실시간 이벤트 스트림 (Server-Sent Events)
+class EventStreamView(View):
+    """
+    GET: 로그인한 사용자 회사의 실시간 이벤트를 text/event-stream 으로 전송
+    - notice.created: 새 공지사항 등록
+    - vehicle.status_changed: 차량 현재 상황 변경
+    - expense.status_changed: 지출 내역 상태 변경 (승인/반려 등)
+    인증: Authorization: Bearer <access> 헤더 또는 ?token=<access> (브라우저 EventSource용)
+    재접속 시 Last-Event-ID 헤더를 보내면 놓친 이벤트를 먼저 전송한다.
+    연결마다 스레드를 점유하지 않도록 ASGI 서버에서 실행해야 한다. (예: uvicorn car_server.asgi:application)
+    """
+    heartbeat_interval = 15  # 프록시가 연결을 끊지 않도록 주기적으로 보내는 주석 (초)
+
+    async def get(self, request):
+        try:
+            user = await AsyncJWTAuthentication().aauthenticate(request, allow_query_token=True)
+        except AuthenticationFailed as e:
+            return JsonResponse({
+                "message": "이벤트 구독에 실패했습니다.",
+                "error": str(e.detail)
+            }, status=401)
+        if user is None:
+            return JsonResponse({
+                "message": "인증 정보가 제공되지 않았습니다."
+            }, status=401)
+        if not user.company_id:
+            return JsonResponse({
+                "message": "회사가 등록되지 않은 사용자입니다."
+            }, status=400)
+
+        last_event_id = request.headers.get('Last-Event-ID', '')
+        last_event_id = int(last_event_id) if last_event_id.isdigit() else None
+        response = StreamingHttpResponse(self.stream(user.company_id, last_event_id), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # nginx 버퍼링 해제
+        return response
+
+    async def stream(self, company_id, last_event_id):
+        broker = get_broker()
+        queue = broker.subscribe(company_id)  # 재전송 중 발행된 이벤트도 놓치지 않도록 먼저 구독
+        try:
+            yield 'retry: 5000\n\n'  # 연결이 끊기면 5초 후 재접속
+            if last_event_id is not None:
+                for event in await broker.replay(company_id, last_event_id):
+                    last_event_id = event.id
+                    yield event.encode()
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=self.heartbeat_interval)
+                except asyncio.TimeoutError:
+                    yield ': keep-alive\n\n'
+                    continue
+                if last_event_id is not None and event.id <= last_event_id:
+                    continue  # 재전송으로 이미 보낸 이벤트
+                yield event.encode()
+        finally:
+            broker.unsubscribe(company_id, queue)  # 클라이언트 연결 종료
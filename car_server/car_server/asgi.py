@@ -12,5 +12,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'car_server.settings')
+os.environ.setdefault('DJANGO_SERVER_INTERFACE', 'asgi')  # settings에서 ASGI 실행 여부 판단 (DB 지속 연결 기본값)
 
 application = get_asgi_application()
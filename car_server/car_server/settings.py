@@ -56,6 +56,123 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',  # JWT 인증 클래스 사용
     ),
+    # orjson이 설치되어 있으면 JSON 응답/요청을 orjson으로 처리 (pip install orjson, 없으면 DRF 기본 JSON 처리)
+    'DEFAULT_RENDERER_CLASSES': (
+        'car_app.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'car_app.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # 앞단 프록시(nginx, 로드 밸런서 등) 수. 0이면 X-Forwarded-For를 무시하고 REMOTE_ADDR로 클라이언트 IP를 판단
+    # (None이면 클라이언트가 보낸 X-Forwarded-For를 그대로 믿으므로 값을 바꿔 가며 IP별 로그인 시도 제한을 우회할 수 있음)
+    'NUM_PROXIES': int(os.environ.get('DRF_NUM_PROXIES', 0)),
+}
+
+# 로그인 시도 제한 설정 (토큰 버킷)
+# 워커 프로세스가 여러 개인 경우 BACKEND를 'car_app.throttling.SQLiteBucketBackend'로 변경
+LOGIN_THROTTLE = {
+    'BACKEND': 'car_app.throttling.LocMemBucketBackend',
+    'OPTIONS': {},
+    'IP': {'capacity': 20, 'refill_per_minute': 10},  # IP별 최대 연속 시도 수 및 분당 회복량
+    'IDENTIFIER': {'capacity': 10, 'refill_per_minute': 5},  # 이메일/전화번호별 최대 연속 시도 수 및 분당 회복량
+}
+
+# 실시간 이벤트(SSE) 브로커 설정
+# ASGI 워커 프로세스가 여러 개인 경우 BACKEND를 'car_app.events.SQLiteBroker'로 변경
+EVENT_BROKER = {
+    'BACKEND': 'car_app.events.LocalBroker',
+    'OPTIONS': {},
+}
+
+# 요청별 쿼리 계측 (Server-Timing 헤더, 느린 요청/중복 쿼리 로그)
+# 꺼져 있으면 미들웨어가 제외되어 비용이 없음. 운영 환경에서는 SAMPLE_RATE로 일부 요청만 계측 가능
+QUERY_INSTRUMENTATION = {
+    'ENABLED': os.environ.get('QUERY_INSTRUMENTATION', 'false').lower() == 'true',
+    'SAMPLE_RATE': float(os.environ.get('QUERY_INSTRUMENTATION_SAMPLE_RATE', 1.0)),
+    'SLOW_REQUEST_MS': 500,  # 이 시간보다 오래 걸린 요청 로그 기록
+    'SLOW_QUERY_MS': 100,  # 이 시간보다 오래 걸린 쿼리가 있는 요청 로그 기록
+    'MAX_QUERIES': 50,  # 쿼리 수가 이보다 많은 요청 로그 기록
+    'DUPLICATE_QUERIES': 5,  # 같은 SQL이 이 횟수 이상 실행된 요청 로그 기록 (N+1 의심)
+}
+
+# 응답 압축 설정 (Accept-Encoding에 따라 brotli 또는 gzip)
+# brotli는 패키지가 설치된 경우에만 사용 (pip install brotli)
+RESPONSE_COMPRESSION = {
+    'ENABLED': os.environ.get('RESPONSE_COMPRESSION', 'true').lower() == 'true',
+    'MIN_SIZE': 1024,  # 이 크기(바이트)보다 작은 응답은 압축하지 않음
+    'GZIP_LEVEL': int(os.environ.get('RESPONSE_GZIP_LEVEL', 6)),  # 1(빠름) ~ 9(작음)
+    'BROTLI_QUALITY': int(os.environ.get('RESPONSE_BROTLI_QUALITY', 5)),  # 0(빠름) ~ 11(작음)
+}
+
+# 백그라운드 작업 큐 설정 (운행/정비 기록 저장 시 지출 내역 생성 등 부가 작업)
+# 작업은 큐에 저장되고 python manage.py run_tasks 워커가 처리 (API 서버와 함께 실행)
+# 개발/테스트에서 워커 없이 실행하려면 TASK_QUEUE_EAGER=true (커밋 직후 요청 스레드에서 실행, 실패한 작업은 큐에 남아 워커가 재시도)
+TASK_QUEUE = {
+    'ALWAYS_EAGER': os.environ.get('TASK_QUEUE_EAGER', 'false').lower() == 'true',
+    'MAX_ATTEMPTS': 5,  # 실패 시 최대 실행 횟수
+    'RETRY_DELAY': 10,  # 첫 재시도까지 대기 시간(초), 재시도마다 두 배
+    'LEASE_SECONDS': 300,  # 이 시간 안에 끝나지 않은 작업은 다른 워커가 다시 실행
+    'POLL_INTERVAL': float(os.environ.get('TASK_QUEUE_POLL_INTERVAL', 1.0)),
+    'BATCH_SIZE': 20,
+    'RETENTION_DAYS': 7,  # 완료된 작업 보관 기간
+}
+
+# 오래된 운행 기록 좌표 보관 설정 (python manage.py archive_coordinates)
+# 좌표를 회사/월별 zip 파일로 옮기고 DB에는 파일 이름만 남김. STORAGE를 바꾸면 S3 등 다른 저장소 사용 가능
+COORDINATE_ARCHIVE = {
+    'STORAGE': 'django.core.files.storage.FileSystemStorage',
+    'OPTIONS': {'location': os.environ.get('COORDINATE_ARCHIVE_DIR', str(BASE_DIR / 'archive'))},
+    'RETENTION_DAYS': int(os.environ.get('COORDINATE_ARCHIVE_RETENTION_DAYS', 180)),  # 출발 시간이 이 기간보다 오래된 좌표를 보관
+    'CACHE_SECONDS': 3600,  # 보관 파일에서 읽은 좌표를 캐시에 두는 시간
+}
+
+# 모바일 앱 변경분 동기화 설정 (GET /api/sync/?since=<토큰>)
+# 삭제 기록은 TOMBSTONE_RETENTION_DAYS 동안 보관 (python manage.py purge_tombstones로 정리), 이보다 오래된 토큰은 전체 동기화 필요
+SYNC = {
+    'LIMIT': 500,  # 종류별 한 번에 응답할 최대 행 수
+    'MAX_LIMIT': 2000,
+    'OVERLAP_SECONDS': 5,  # 다음 토큰을 응답 시각보다 앞당기는 시간 (늦게 커밋된 변경을 놓치지 않도록)
+    'TOMBSTONE_RETENTION_DAYS': int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', 90)),
+}
+
+# 생성 API의 Idempotency-Key 설정 (운행 기록, 정비 기록 생성)
+# 같은 키로 재시도한 요청은 다시 처리하지 않고 첫 응답을 그대로 반환. 만료된 키는 python manage.py purge_idempotency_keys로 정리
+IDEMPOTENCY = {
+    'TTL_SECONDS': int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', 86400)),  # 첫 응답을 저장해 두는 시간
+    'LOCK_SECONDS': 60,  # 처리 중인 키를 다른 요청이 이어받기까지의 시간
+}
+
+# 출발지/도착지 자동 완성 설정 (회사별 장소 사전을 프로세스 메모리에 색인)
+# 기존 운행 기록의 장소 사전은 python manage.py rebuild_locations로 생성
+LOCATION_AUTOCOMPLETE = {
+    'LIMIT': 10,
+    'MAX_LIMIT': 50,
+    'REFRESH_SECONDS': 5,  # 다른 프로세스에서 새로 등록된 장소를 가져오는 주기
+    'REBUILD_SECONDS': 600,  # 사용 횟수까지 다시 읽어 색인을 새로 만드는 주기
+}
+
+# GPS 좌표로 운행 기록 나누기 설정 (GET /api/driving-records/<id>/segments/, python manage.py segment_trips)
+TRIP_SEGMENTATION = {
+    'STOP_RADIUS_METERS': 150,  # 이 반경 안에 머무르면 정차로 판단
+    'DWELL_SECONDS': 600,  # 반경 안에 이 시간 이상 머무르면 운행 종료로 판단
+    'MIN_TRIP_METERS': 300,  # 이보다 짧은 이동은 운행으로 나누지 않음
+}
+
+# 주행거리 점검 설정 (운행 기록 사이의 주행거리 누락/역행, 운행 시간 겹침)
+# python manage.py check_odometer로 지난 점검 이후 운행 기록이 바뀐 차량만 다시 점검 (--full은 전체 점검)
+ODOMETER_CHECK = {
+    'BATCH_SIZE': int(os.environ.get('ODOMETER_CHECK_BATCH_SIZE', 1000)),  # 이상 저장 및 차량 ID 조건을 나누는 단위
+    'OVERLAP_SECONDS': 60,  # 이전 점검 시작 시각보다 이만큼 앞의 변경부터 다시 점검
+}
+
+# 연비 분석 설정 (GET /api/admin/fuel-efficiency/, 차량별 월간 유류비 통계는 python manage.py rebuild_fuel_stats로 다시 계산)
+FUEL_EFFICIENCY = {
+    'MONTHS': 6,  # 기본 분석 기간 (이번 달 포함 최근 개월 수)
+    'MAX_MONTHS': 36,
+    'MIN_DISTANCE': 100,  # 기간 내 운행 거리가 이보다 짧은 대상은 순위에서 제외
 }
 
 # JWT 관련 설정
@@ -70,6 +187,8 @@ SIMPLE_JWT = {
 
 
 MIDDLEWARE = [
+    'car_app.instrumentation.QueryInstrumentationMiddleware',  # 요청별 쿼리 계측 (QUERY_INSTRUMENTATION 참고)
+    'car_app.compression.CompressionMiddleware',  # 응답 압축 (RESPONSE_COMPRESSION 참고)
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -78,6 +197,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'car_app.routers.ReplicaRoutingMiddleware',  # 읽기 전용 복제본 라우팅 (요청 단위)
 ]
 
 CORS_ALLOW_ALL_ORIGINS = True
@@ -107,11 +227,45 @@ WSGI_APPLICATION = 'car_server.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# 환경 변수로 운영 환경 설정을 덮어쓸 수 있음 (예: DB_CONN_MAX_AGE=0 이면 요청마다 새 연결)
+# ASGI(car_server/asgi.py)로 실행하면 비동기 뷰의 연결이 스레드마다 따로 남으므로 Django 권장대로 기본값 0 (지속 연결 사용 안 함)
+SERVING_ASGI = os.environ.get('DJANGO_SERVER_INTERFACE') == 'asgi'
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 0 if SERVING_ASGI else 600)),  # 연결 재사용 시간 (초), 0이면 요청마다 새 연결
+        'CONN_HEALTH_CHECKS': os.environ.get('DB_CONN_HEALTH_CHECKS', 'true').lower() == 'true',  # 재사용 전 연결 상태 확인
+        'OPTIONS': {
+            'timeout': int(os.environ.get('DB_TIMEOUT', 20)),  # 잠금 대기 시간 (초)
+            'transaction_mode': os.environ.get('DB_TRANSACTION_MODE', 'IMMEDIATE'),  # 쓰기 트랜잭션 시작 시 바로 잠금 획득 (잠금 승격 중 "database is locked" 방지)
+        },
+    }
+}
+
+# 읽기 전용 복제본 (목록/통계 조회용). DB_REPLICA_NAME 을 지정하면 'replica' 연결이 추가됨
+# 로컬에서는 두 번째 SQLite 파일을 지정하고 `python manage.py sync_replica` 로 원본 DB를 복사해서 사용
+if os.environ.get('DB_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['DB_REPLICA_NAME'],
+        'TEST': {'MIRROR': 'default'},  # 테스트에서는 원본 DB를 그대로 사용
     }
+
+DATABASE_ROUTERS = ['car_app.routers.PrimaryReplicaRouter']
+
+# 쓰기 요청 이후 해당 사용자의 조회를 원본 DB로 보내는 시간 (초, 복제 지연보다 길게 설정)
+# 워커 프로세스가 여러 개인 경우 프로세스 간에 공유되는 CACHES 설정 필요
+REPLICA_PIN_SECONDS = int(os.environ.get('DB_REPLICA_PIN_SECONDS', 10))
+
+# SQLite 연결 생성 시 적용할 PRAGMA (car_app.db.configure_sqlite 참고)
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),  # 읽기와 쓰기가 서로 막지 않도록 WAL 사용
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),  # WAL에서는 NORMAL로도 손상 없이 안전
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 20000)),  # 잠금 대기 시간 (밀리초)
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),  # 메모리 맵 읽기 크기 (바이트)
+    'temp_store': os.environ.get('SQLITE_TEMP_STORE', 'MEMORY'),  # 임시 테이블/정렬을 메모리에서 처리
 }
 
 